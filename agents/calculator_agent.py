@@ -4,13 +4,14 @@ Agent spécialisé dans les calculs financiers.
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from utils.calculator_tools import calculator_tools
+from utils.llm_cache import llm_cache
 
 
 class CalculatorAgent:
     """Agent spécialisé dans les calculs financiers."""
     
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, cache=llm_cache)
         self.llm_with_tools = self.llm.bind_tools(calculator_tools)
         
         self.system_prompt = """Tu es un expert en calculs financiers.
@@ -19,6 +20,12 @@ Tes responsabilités :
 - Calculer les retours sur investissement (ROI)
 - Calculer les profits et pertes
 - Calculer les variations en pourcentage
+- Calculer en un seul appel les résultats de toutes les positions d'un portefeuille
+- Calculer prix de revient et plus-values d'un historique de transactions (FIFO, LIFO, coût moyen)
+- Calculer VAN, TRI/XIRR, échéanciers de prêt, intérêts composés et valorisations DCF
+- Évaluer des chaînes d'options (prix, grecques, volatilité implicite)
+- Analyser le risque d'un portefeuille (VaR/CVaR, Sharpe, drawdown)
+- Projeter la valeur future d'un investissement (simulation Monte Carlo)
 - Effectuer des analyses quantitatives
 
 Sois précis dans tes calculs et explique tes résultats clairement."""
@@ -11,5 +11,6 @@ class AgentState(TypedDict):
     """
     messages: Annotated[list, add_messages]
     query: str
+    symbols: list
     agent_used: str
     final_answer: str
\ No newline at end of file
@@ -1,32 +1,151 @@
 """
 Système multi-agents utilisant LangGraph.
 """
+import asyncio
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.runnables import RunnableLambda
 from dotenv import load_dotenv
 
 from agents.graph_state import AgentState
 from utils.finance_tools import finance_tools
 from utils.calculator_tools import calculator_tools
 from utils.research_tools import research_tools
+from utils.symbols import symbol_resolver
+from utils.batch_fetch import prefetch
+from utils.query_router import query_router
+from utils.llm_cache import llm_cache
+from utils.answer_cache import answer_cache
+from utils.async_tools import run_blocking
+from utils.http_pool import close_async_client, rate_limits as provider_rate_limits
+from utils import quick_calc
 
 load_dotenv()
 
+# Modes du graphe : superviseur + agents spécialisés, ou agent unique
+MODES = ("routed", "single")
+
+# Tours d'appels de tools au plus pour l'agent unique
+MAX_TOOL_ROUNDS = 3
+
+# Requêtes traitées simultanément par process_many
+DEFAULT_CONCURRENCY = 8
+
+# Fournisseurs dont le débit peut être limité (requêtes par seconde)
+PROVIDERS = ("openai", "market_data", "search")
+
+# Noms affichés des agents
+AGENT_NAMES = {
+    "market_analyst": "Market Analyst",
+    "calculator": "Calculator",
+    "researcher": "Researcher",
+    "single_agent": "Agent unifié"
+}
+
+
+class _ToolEvents(BaseCallbackHandler):
+    """Publie le début et la fin de chaque appel de tool dans une file."""
+    
+    def __init__(self, events: queue.Queue):
+        self.events = events
+        self.names = {}
+    
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name", "tool")
+        self.names[run_id] = name
+        self.events.put({"type": "tool_start", "tool": name, "input": input_str})
+    
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        content = getattr(output, "content", output)
+        self.events.put({"type": "tool_end", "tool": self.names.pop(run_id, "tool"), "output": str(content)})
+    
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self.events.put({"type": "tool_end", "tool": self.names.pop(run_id, "tool"), "output": f"❌ Erreur: {error}"})
+
 
 class LangGraphFinancialAgent:
     """Système d'agents financiers utilisant LangGraph."""
     
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    def __init__(
+        self,
+        prefetch: bool = True,
+        fast_path: bool = True,
+        local_routing: bool = True,
+        mode: str = "routed",
+        cache_answers: bool = True,
+        rate_limits: Optional[Dict[str, float]] = None
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Mode inconnu: {mode} (attendus: {', '.join(MODES)})")
+        unknown = set(rate_limits or {}) - set(PROVIDERS)
+        if unknown:
+            raise ValueError(f"Fournisseur inconnu: {', '.join(sorted(unknown))} (attendus: {', '.join(PROVIDERS)})")
+        
+        # Débit maximal par fournisseur (requêtes/s), partagé par toutes les requêtes en cours
+        # de cet agent : chaque requête HTTP vers les données de marché ou la recherche
+        # consomme un jeton, pendant ses appels seulement (les autres agents n'en héritent pas)
+        limiters = {
+            provider: InMemoryRateLimiter(requests_per_second=rate, max_bucket_size=max(rate, 1))
+            for provider, rate in (rate_limits or {}).items()
+        }
+        self.rate_limiter = limiters.pop("openai", None)
+        self.provider_limiters = limiters
+        
+        # stream_usage : la consommation de tokens reste comptée en streaming
+        self.llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0,
+            cache=llm_cache,
+            stream_usage=True,
+            rate_limiter=self.rate_limiter
+        )
+        
+        # "routed" : superviseur puis agent spécialisé ; "single" : un seul agent avec tous les tools
+        self.mode = mode
+        
+        # Préchargement des données de marché pendant le routage
+        self.prefetch = prefetch
+        # Calculs simples traités localement, sans appel LLM
+        self.fast_path = fast_path
+        # Routage local (règles + classifieur) ; le LLM ne tranche que les requêtes ambiguës
+        self.router = query_router if local_routing else None
+        # Réponses réutilisées pour les requêtes équivalentes tant que le marché n'a pas bougé
+        self.answer_cache = answer_cache if cache_answers else None
         
         # Tous les tools disponibles
         self.all_tools = finance_tools + calculator_tools + research_tools
+        # Agent spécialisé correspondant à chaque tool (affichage en mode agent unique)
+        self.tool_agents = {
+            **{t.name: "market_analyst" for t in finance_tools},
+            **{t.name: "calculator" for t in calculator_tools},
+            **{t.name: "researcher" for t in research_tools},
+        }
         
         # Créer le graphe
         self.graph = self._create_graph()
     
+    @staticmethod
+    def _with_symbols(state: AgentState) -> str:
+        """Requête complétée par les symboles repérés localement (évite un aller-retour LLM)."""
+        query = state["query"]
+        mentions = state.get("symbols") or []
+        if not mentions:
+            return query
+        resolved = ", ".join(
+            symbol if matched.lstrip('$') == symbol else f"{matched} → {symbol}"
+            for symbol, matched in mentions
+        )
+        return f"{query}\n\n(Symboles identifiés : {resolved})"
+    
     def _create_supervisor_node(self):
         """Crée le nœud superviseur qui décide quel agent utiliser."""
         
@@ -37,26 +156,15 @@ Analyse la requête de l'utilisateur et détermine quel type d'agent doit la tra
 1. **market_analyst** : Pour les questions sur les prix d'actions, comparaisons, historiques, informations sur les entreprises
    Exemples : "Prix de AAPL ?", "Compare TSLA et NVDA", "Historique de Microsoft"
 
-2. **calculator** : Pour les calculs financiers (ROI, profits/pertes, pourcentages)
-   Exemples : "Calcule mon ROI", "Mon profit si...", "Variation entre X et Y"
+2. **calculator** : Pour les calculs financiers (ROI, profits/pertes, pourcentages, VAN/TRI, prêts, intérêts composés, DCF, options)
+   Exemples : "Calcule mon ROI", "Mon profit si...", "Variation entre X et Y", "Mensualité d'un prêt de 200000 à 3,5%"
 
 3. **researcher** : Pour les actualités, sentiment du marché, recherches générales
    Exemples : "Actualités sur Tesla", "Sentiment du marché", "Recherche sur..."
 
 Réponds UNIQUEMENT avec un de ces mots : market_analyst, calculator, ou researcher"""
         
-        def supervisor_node(state: AgentState):
-            """Nœud qui décide quel agent utiliser."""
-            query = state["query"]
-            
-            messages = [
-                SystemMessage(content=supervisor_prompt),
-                HumanMessage(content=f"Requête: {query}")
-            ]
-            
-            response = self.llm.invoke(messages)
-            agent_choice = response.content.strip().lower()
-            
+        def choose(query: str, agent_choice: str) -> str:
             # Déterminer le prochain nœud
             if "market" in agent_choice:
                 next_agent = "market_analyst"
@@ -65,59 +173,124 @@ Réponds UNIQUEMENT avec un de ces mots : market_analyst, calculator, ou researc
             elif "research" in agent_choice:
                 next_agent = "researcher"
             else:
+                next_agent = None
+            
+            if next_agent is None:
                 next_agent = "calculator"  # Par défaut
+            elif self.router is not None:
+                # La décision du LLM sert d'exemple au routeur local
+                self.router.record(query, next_agent)
+            return next_agent
+        
+        def local_choice(state: AgentState):
+            # Requête non ambiguë : routage local, sans appel LLM
+            if self.router is None:
+                return None
+            return self.router.local_route(state["query"], state.get("symbols") or [])
+        
+        def llm_messages(state: AgentState):
+            return [
+                SystemMessage(content=supervisor_prompt),
+                HumanMessage(content=f"Requête: {state['query']}")
+            ]
+        
+        def supervisor_node(state: AgentState):
+            """Nœud qui décide quel agent utiliser."""
+            next_agent = local_choice(state)
+            if next_agent is None:
+                response = self.llm.invoke(llm_messages(state))
+                next_agent = choose(state["query"], response.content.strip().lower())
             
             return {
                 "agent_used": next_agent,
                 "messages": state["messages"]
             }
         
-        return supervisor_node
-    
-    def _create_market_analyst_node(self):
-        """Crée le nœud Market Analyst."""
+        async def asupervisor_node(state: AgentState):
+            """Variante asynchrone (ainvoke du graphe)."""
+            next_agent = local_choice(state)
+            if next_agent is None:
+                response = await self.llm.ainvoke(llm_messages(state))
+                next_agent = choose(state["query"], response.content.strip().lower())
+            
+            return {
+                "agent_used": next_agent,
+                "messages": state["messages"]
+            }
         
-        system_prompt = """Tu es un analyste de marché financier expert.
-
-Utilise les tools à ta disposition pour obtenir des données en temps réel sur les actions.
-Sois précis, factuel et professionnel dans tes analyses."""
+        return RunnableLambda(supervisor_node, afunc=asupervisor_node, name="supervisor")
+    
+    def _create_tool_agent_node(self, name: str, system_prompt: str, tools: list):
+        """
+        Nœud d'agent spécialisé : choix des tools, exécution, puis réponse.
         
-        llm_with_tools = self.llm.bind_tools(finance_tools)
+        Le nœud a une variante synchrone (invoke/stream) et une variante
+        asynchrone (ainvoke), qui appelle le LLM et les tools sans bloquer
+        la boucle d'événements.
+        """
+        llm_with_tools = self.llm.bind_tools(tools)
+        tool_node = ToolNode(tools)
         
-        def market_analyst_node(state: AgentState):
-            """Nœud qui analyse les marchés."""
-            query = state["query"]
-            
-            messages = [
+        def prompt(state: AgentState):
+            return [
                 SystemMessage(content=system_prompt),
-                HumanMessage(content=query)
+                HumanMessage(content=self._with_symbols(state))
             ]
+        
+        def result(state: AgentState, response, answer: str):
+            return {
+                "final_answer": answer,
+                "messages": state["messages"] + [HumanMessage(content=state["query"]), response]
+            }
+        
+        def node(state: AgentState):
+            messages = prompt(state)
             
             # Premier appel : décider quels tools utiliser
             response = llm_with_tools.invoke(messages)
             
             # Si tool calls, les exécuter
             if hasattr(response, 'tool_calls') and response.tool_calls:
-                tool_node = ToolNode(finance_tools)
                 tool_results = tool_node.invoke({"messages": [response]})
                 
                 # Ajouter les résultats
                 messages.append(response)
-                for tool_msg in tool_results["messages"]:
-                    messages.append(tool_msg)
+                messages.extend(tool_results["messages"])
                 
                 # Génération finale
-                final_response = self.llm.invoke(messages)
-                answer = final_response.content
+                answer = self.llm.invoke(messages).content
             else:
                 answer = response.content
             
-            return {
-                "final_answer": answer,
-                "messages": state["messages"] + [HumanMessage(content=query), response]
-            }
+            return result(state, response, answer)
+        
+        async def anode(state: AgentState):
+            messages = prompt(state)
+            response = await llm_with_tools.ainvoke(messages)
+            
+            if hasattr(response, 'tool_calls') and response.tool_calls:
+                # Les appels d'un même tour s'exécutent en parallèle
+                tool_results = await tool_node.ainvoke({"messages": [response]})
+                messages.append(response)
+                messages.extend(tool_results["messages"])
+                answer = (await self.llm.ainvoke(messages)).content
+            else:
+                answer = response.content
+            
+            return result(state, response, answer)
+        
+        return RunnableLambda(node, afunc=anode, name=name)
+    
+    def _create_market_analyst_node(self):
+        """Crée le nœud Market Analyst."""
+        
+        system_prompt = """Tu es un analyste de marché financier expert.
+
+Utilise les tools à ta disposition pour obtenir des données en temps réel sur les actions.
+Pour l'analyse technique, demande tous les indicateurs et symboles utiles en un seul appel.
+Sois précis, factuel et professionnel dans tes analyses."""
         
-        return market_analyst_node
+        return self._create_tool_agent_node("market_analyst", system_prompt, finance_tools)
     
     def _create_calculator_node(self):
         """Crée le nœud Calculator."""
@@ -125,40 +298,13 @@ Sois précis, factuel et professionnel dans tes analyses."""
         system_prompt = """Tu es un expert en calculs financiers.
 
 Utilise les tools à ta disposition pour effectuer des calculs précis.
+Pour plusieurs positions ou investissements, utilise un seul appel groupé (calculate_portfolio_pnl, calculate_batch_roi).
+Pour un historique d'achats et de ventes, passe tout le relevé à calculate_cost_basis au lieu d'appeler calculate_profit_loss transaction par transaction.
+Pour comparer plusieurs taux ou scénarios (VAN/TRI, prêt, intérêts composés, DCF), passe-les tous dans le même appel.
+Pour des options, évalue toute la chaîne (tous les strikes et échéances) en un seul appel price_options.
 Explique tes résultats clairement."""
         
-        llm_with_tools = self.llm.bind_tools(calculator_tools)
-        
-        def calculator_node(state: AgentState):
-            """Nœud qui effectue les calculs."""
-            query = state["query"]
-            
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=query)
-            ]
-            
-            response = llm_with_tools.invoke(messages)
-            
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                tool_node = ToolNode(calculator_tools)
-                tool_results = tool_node.invoke({"messages": [response]})
-                
-                messages.append(response)
-                for tool_msg in tool_results["messages"]:
-                    messages.append(tool_msg)
-                
-                final_response = self.llm.invoke(messages)
-                answer = final_response.content
-            else:
-                answer = response.content
-            
-            return {
-                "final_answer": answer,
-                "messages": state["messages"] + [HumanMessage(content=query), response]
-            }
-        
-        return calculator_node
+        return self._create_tool_agent_node("calculator", system_prompt, calculator_tools)
     
     def _create_researcher_node(self):
         """Crée le nœud Researcher."""
@@ -168,38 +314,74 @@ Explique tes résultats clairement."""
 Utilise les tools à ta disposition pour rechercher des informations pertinentes.
 Cite tes sources et reste objectif."""
         
-        llm_with_tools = self.llm.bind_tools(research_tools)
+        return self._create_tool_agent_node("researcher", system_prompt, research_tools)
+    
+    def _create_single_agent_node(self):
+        """Crée le nœud de l'agent unique, qui dispose de tous les tools."""
         
-        def researcher_node(state: AgentState):
-            """Nœud qui effectue les recherches."""
-            query = state["query"]
-            
-            messages = [
+        system_prompt = """Tu es un assistant financier expert : analyse de marché, calculs financiers et recherche d'actualités.
+
+Utilise les tools à ta disposition pour obtenir des données en temps réel et effectuer des calculs précis.
+Regroupe les demandes : tous les symboles, indicateurs, positions ou scénarios utiles dans un seul appel de tool.
+Pour un historique d'achats et de ventes, passe tout le relevé à calculate_cost_basis.
+Cite tes sources pour les actualités, reste factuel et explique tes résultats clairement."""
+        
+        llm_with_tools = self.llm.bind_tools(self.all_tools)
+        tool_node = ToolNode(self.all_tools)
+        
+        def prompt(state: AgentState):
+            return [
                 SystemMessage(content=system_prompt),
-                HumanMessage(content=query)
+                HumanMessage(content=self._with_symbols(state))
             ]
+        
+        def result(state: AgentState, agent_used: str, response):
+            return {
+                "agent_used": agent_used,
+                "final_answer": response.content,
+                "messages": state["messages"] + [HumanMessage(content=state["query"]), response]
+            }
+        
+        def single_agent_node(state: AgentState):
+            """Nœud qui choisit et exécute les tools puis rédige la réponse."""
+            messages = prompt(state)
             
+            # Les résultats d'un tour peuvent appeler d'autres tools (ex: cours puis calcul)
             response = llm_with_tools.invoke(messages)
-            
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                tool_node = ToolNode(research_tools)
+            agent_used = "single_agent"
+            rounds = 0
+            while getattr(response, 'tool_calls', None) and rounds < MAX_TOOL_ROUNDS:
+                if rounds == 0:
+                    agent_used = self.tool_agents.get(response.tool_calls[0]["name"], agent_used)
                 tool_results = tool_node.invoke({"messages": [response]})
-                
                 messages.append(response)
-                for tool_msg in tool_results["messages"]:
-                    messages.append(tool_msg)
-                
-                final_response = self.llm.invoke(messages)
-                answer = final_response.content
-            else:
-                answer = response.content
+                messages.extend(tool_results["messages"])
+                rounds += 1
+                # Dernier tour : réponse sans nouvel appel de tool
+                llm = llm_with_tools if rounds < MAX_TOOL_ROUNDS else self.llm
+                response = llm.invoke(messages)
             
-            return {
-                "final_answer": answer,
-                "messages": state["messages"] + [HumanMessage(content=query), response]
-            }
+            return result(state, agent_used, response)
+        
+        async def asingle_agent_node(state: AgentState):
+            """Variante asynchrone (ainvoke du graphe)."""
+            messages = prompt(state)
+            response = await llm_with_tools.ainvoke(messages)
+            agent_used = "single_agent"
+            rounds = 0
+            while getattr(response, 'tool_calls', None) and rounds < MAX_TOOL_ROUNDS:
+                if rounds == 0:
+                    agent_used = self.tool_agents.get(response.tool_calls[0]["name"], agent_used)
+                tool_results = await tool_node.ainvoke({"messages": [response]})
+                messages.append(response)
+                messages.extend(tool_results["messages"])
+                rounds += 1
+                llm = llm_with_tools if rounds < MAX_TOOL_ROUNDS else self.llm
+                response = await llm.ainvoke(messages)
+            
+            return result(state, agent_used, response)
         
-        return researcher_node
+        return RunnableLambda(single_agent_node, afunc=asingle_agent_node, name="agent")
     
     def _route_after_supervisor(self, state: AgentState) -> str:
         """Détermine le prochain nœud après le superviseur."""
@@ -211,6 +393,13 @@ Cite tes sources et reste objectif."""
         # Créer le graphe
         workflow = StateGraph(AgentState)
         
+        if self.mode == "single":
+            # Agent unique : pas de superviseur
+            workflow.add_node("agent", self._create_single_agent_node())
+            workflow.set_entry_point("agent")
+            workflow.add_edge("agent", END)
+            return workflow.compile()
+        
         # Ajouter les nœuds
         workflow.add_node("supervisor", self._create_supervisor_node())
         workflow.add_node("market_analyst", self._create_market_analyst_node())
@@ -239,42 +428,238 @@ Cite tes sources et reste objectif."""
         # Compiler le graphe
         return workflow.compile()
     
-    def process(self, query: str) -> dict:
+    def _prepare(self, query: str):
         """
-        Traite une requête utilisateur.
-        
-        Args:
-            query: Question de l'utilisateur
+        Traitements avant le graphe : calcul direct, cache des réponses, préchargement.
         
         Returns:
-            dict avec query, agent_used, et result
+            (réponse immédiate, None) ou (None, état initial du graphe)
         """
+        mentions = symbol_resolver.find_mentions(query)
+        
+        # Calcul simple reconnu avec certitude : réponse directe
+        quick = quick_calc.answer(query, mentions=mentions) if self.fast_path else None
+        if quick is not None:
+            return {
+                "query": query,
+                "agent_used": "Calculator",
+                "result": quick
+            }, None
+        
+        # Requête équivalente déjà traitée, données encore fraîches
+        cached = self.answer_cache.lookup(query, mentions) if self.answer_cache is not None else None
+        if cached is not None:
+            return {
+                "query": query,
+                "agent_used": cached.agent_used,
+                "result": cached.result,
+                "cached": True
+            }, None
+        
+        if self.prefetch and mentions:
+            # Spéculatif : les cotations et historiques se chargent pendant que
+            # le superviseur choisit l'agent, et sont en cache quand les tools s'exécutent
+            prefetch([symbol for symbol, _ in mentions])
+        
         # Préparer l'état initial
-        initial_state = {
+        return None, {
             "messages": [],
             "query": query,
+            "symbols": mentions,
             "agent_used": "",
             "final_answer": ""
         }
+    
+    def _finish(self, state: dict, agent_used: str, answer: str) -> dict:
+        """Met en forme la réponse du graphe et l'enregistre dans le cache des réponses."""
+        agent_display = AGENT_NAMES.get(agent_used, agent_used)
         
-        # Exécuter le graphe
-        result = self.graph.invoke(initial_state)
-        
-        # Formater le nom de l'agent
-        agent_name_map = {
-            "market_analyst": "Market Analyst",
-            "calculator": "Calculator",
-            "researcher": "Researcher"
-        }
-        
-        agent_display = agent_name_map.get(result["agent_used"], result["agent_used"])
+        if self.answer_cache is not None and answer:
+            self.answer_cache.store(state["query"], state["symbols"], agent_display, answer)
         
         return {
-            "query": query,
+            "query": state["query"],
             "agent_used": agent_display,
-            "result": result["final_answer"]
+            "result": answer
         }
     
+    def process(self, query: str) -> dict:
+        """
+        Traite une requête utilisateur.
+        
+        Args:
+            query: Question de l'utilisateur
+        
+        Returns:
+            dict avec query, agent_used, et result (cached=True si la réponse vient du cache)
+        """
+        with provider_rate_limits(self.provider_limiters):
+            response, initial_state = self._prepare(query)
+            if response is not None:
+                return response
+            
+            # Exécuter le graphe
+            result = self.graph.invoke(initial_state)
+            return self._finish(initial_state, result["agent_used"], result["final_answer"])
+    
+    def stream(self, query: str) -> Iterator[dict]:
+        """
+        Traite une requête en publiant les étapes au fil de l'eau.
+        
+        Le graphe s'exécute dans un thread ; les événements sont produits dès
+        qu'ils surviennent, dans l'ordre :
+        - {"type": "route", "agent": nom affiché} : agent choisi par le superviseur
+        - {"type": "tool_start", "tool": nom, "input": arguments}
+        - {"type": "tool_end", "tool": nom, "output": résultat}
+        - {"type": "token", "content": texte} : fragment de la réponse
+        - {"type": "done", "response": dict identique à celui de process()}
+        
+        Les réponses servies sans LLM (calcul direct, cache des réponses) ne
+        produisent que l'événement "done". Une réponse LLM servie par le cache
+        LLM n'est pas générée token par token : elle est publiée en un seul
+        événement "token".
+        
+        Args:
+            query: Question de l'utilisateur
+        
+        Yields:
+            Événements (dict)
+        """
+        with provider_rate_limits(self.provider_limiters):
+            yield from self._stream(query)
+    
+    def _stream(self, query: str) -> Iterator[dict]:
+        """Corps de `stream` (limites de débit déjà appliquées)."""
+        response, initial_state = self._prepare(query)
+        if response is not None:
+            yield {"type": "done", "response": response}
+            return
+        
+        events = queue.Queue()
+        final = {"agent_used": "single_agent" if self.mode == "single" else "", "final_answer": ""}
+        streamed = []
+        
+        def run():
+            try:
+                for mode, chunk in self.graph.stream(
+                    initial_state,
+                    {"callbacks": [_ToolEvents(events)]},
+                    stream_mode=["updates", "messages"],
+                ):
+                    if mode == "messages":
+                        message, metadata = chunk
+                        # Le superviseur ne produit que le nom de l'agent
+                        if (isinstance(message, AIMessageChunk) and message.content
+                                and metadata.get("langgraph_node") != "supervisor"):
+                            streamed.append(message.content)
+                            events.put({"type": "token", "content": message.content})
+                        continue
+                    for node, update in chunk.items():
+                        update = update or {}
+                        final.update({k: v for k, v in update.items() if k in final and v})
+                        if node == "supervisor" and update.get("agent_used"):
+                            agent = update["agent_used"]
+                            events.put({"type": "route", "agent": AGENT_NAMES.get(agent, agent)})
+                # Réponse finale issue du cache LLM : aucun token n'a été émis pour elle
+                answer = final["final_answer"]
+                if answer and not "".join(streamed).strip().endswith(answer.strip()):
+                    events.put({"type": "token", "content": answer})
+            except Exception as e:
+                events.put(e)
+            events.put(None)
+        
+        if self.mode == "single":
+            yield {"type": "route", "agent": AGENT_NAMES["single_agent"]}
+        threading.Thread(target=run, name="graph-stream", daemon=True).start()
+        
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            if isinstance(event, Exception):
+                raise event
+            yield event
+        
+        yield {"type": "done", "response": self._finish(initial_state, final["agent_used"], final["final_answer"])}
+    
+    async def aprocess(self, query: str) -> dict:
+        """
+        Variante asynchrone de `process` : les appels LLM et les tools
+        (`ainvoke`) ne bloquent pas la boucle d'événements.
+        
+        Args:
+            query: Question de l'utilisateur
+        
+        Returns:
+            dict avec query, agent_used, et result (cached=True si la réponse vient du cache)
+        """
+        with provider_rate_limits(self.provider_limiters):
+            # Étapes bloquantes (cotations, cache) sur le pool partagé
+            response, initial_state = await run_blocking(self._prepare, query)
+            if response is not None:
+                return response
+            
+            result = await self.graph.ainvoke(initial_state)
+            return await run_blocking(self._finish, initial_state, result["agent_used"], result["final_answer"])
+    
+    async def aprocess_many(self, queries: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY) -> List[dict]:
+        """
+        Traite un lot de requêtes en parallèle.
+        
+        Au plus `concurrency` requêtes sont en cours à la fois ; les limites de
+        débit par fournisseur (`rate_limits`) s'appliquent à l'ensemble du lot,
+        et sont retirées à la fin de l'appel.
+        Une requête en erreur n'interrompt pas les autres. Le client HTTP
+        asynchrone reste ouvert sur la boucle de l'appelant : le fermer avec
+        `utils.http_pool.close_async_client()` avant d'arrêter la boucle.
+        
+        Args:
+            queries: Questions des utilisateurs
+            concurrency: Nombre maximal de requêtes simultanées
+        
+        Returns:
+            Réponses dans l'ordre des requêtes ; chacune porte sa latence
+            (`latency`, secondes) et, en cas d'échec, `error`
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency doit être au moins 1")
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(query: str) -> dict:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = dict(await self.aprocess(query))
+                except Exception as e:
+                    response = {
+                        "query": query,
+                        "agent_used": "-",
+                        "result": f"❌ Erreur: {str(e)}",
+                        "error": str(e)
+                    }
+                response["latency"] = time.perf_counter() - start
+                return response
+        
+        # gather conserve l'ordre des requêtes
+        with provider_rate_limits(self.provider_limiters):
+            return await asyncio.gather(*(run(query) for query in queries))
+    
+    def process_many(self, queries: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY) -> List[dict]:
+        """
+        Point d'entrée synchrone de `aprocess_many` (scripts, traitements de nuit).
+        
+        Ne pas appeler depuis une boucle d'événements active : utiliser
+        `await aprocess_many(...)`.
+        """
+        async def run() -> List[dict]:
+            try:
+                return await self.aprocess_many(queries, concurrency)
+            finally:
+                # La boucle s'arrête avec asyncio.run : son client HTTP aussi
+                await close_async_client()
+        
+        return asyncio.run(run())
+    
     def visualize(self):
         """Affiche la structure du graphe."""
         try:
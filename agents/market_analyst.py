@@ -5,13 +5,14 @@ from typing import Annotated
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from utils.finance_tools import finance_tools
+from utils.llm_cache import llm_cache
 
 
 class MarketAnalystAgent:
     """Agent spécialisé dans l'analyse de marchés financiers."""
     
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, cache=llm_cache)
         self.llm_with_tools = self.llm.bind_tools(finance_tools)
         
         self.system_prompt = """Tu es un analyste de marché financier expert.
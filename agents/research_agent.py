@@ -4,13 +4,14 @@ Agent spécialisé dans la recherche d'informations.
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from utils.research_tools import research_tools
+from utils.llm_cache import llm_cache
 
 
 class ResearchAgent:
     """Agent spécialisé dans la recherche web et l'analyse d'actualités."""
     
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, cache=llm_cache)
         self.llm_with_tools = self.llm.bind_tools(research_tools)
         
         self.system_prompt = """Tu es un chercheur financier expert.
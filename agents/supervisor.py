@@ -6,13 +6,23 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from agents.market_analyst import MarketAnalystAgent
 from agents.calculator_agent import CalculatorAgent
 from agents.research_agent import ResearchAgent
+from utils.query_router import query_router
+from utils.llm_cache import llm_cache
 
 
 class SupervisorAgent:
     """Agent superviseur qui route les requêtes vers les agents spécialisés."""
     
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+    # Noms des agents du routeur local -> noms attendus par process()
+    ROUTER_NAMES = {
+        'market_analyst': 'MarketAnalyst',
+        'calculator': 'Calculator',
+        'researcher': 'Researcher',
+    }
+    
+    def __init__(self, local_routing: bool = True):
+        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, cache=llm_cache)
+        self.router = query_router if local_routing else None
         
         # Initialiser les agents spécialisés
         self.market_analyst = MarketAnalystAgent()
@@ -26,7 +36,7 @@ Ton rôle est d'analyser les requêtes des utilisateurs et de déterminer quel a
 1. **MarketAnalyst** : Pour les questions sur les prix d'actions, comparaisons, informations sur les entreprises
    Exemples : "Quel est le prix de AAPL ?", "Compare TSLA et NVDA"
 
-2. **Calculator** : Pour les calculs financiers (ROI, profits/pertes, pourcentages)
+2. **Calculator** : Pour les calculs financiers (ROI, profits/pertes, pourcentages, VAN/TRI, prêts, DCF, options)
    Exemples : "Calcule mon ROI", "Quel est mon profit si...", "Variation entre X et Y"
 
 3. **Researcher** : Pour les actualités, sentiment du marché, recherches générales
@@ -37,6 +47,12 @@ Si la requête nécessite plusieurs agents, commence par le plus pertinent."""
     
     def route(self, query: str) -> str:
         """Détermine quel agent doit traiter la requête."""
+        # Requête non ambiguë : routage local, sans appel LLM
+        if self.router is not None:
+            local_agent = self.router.local_route(query)
+            if local_agent is not None:
+                return self.ROUTER_NAMES[local_agent]
+        
         messages = [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=f"Quelle agent doit traiter cette requête ?\n\nRequête: {query}")
@@ -45,6 +61,13 @@ Si la requête nécessite plusieurs agents, commence par le plus pertinent."""
         response = self.llm.invoke(messages)
         agent_name = response.content.strip()
         
+        if self.router is not None:
+            for route, name in self.ROUTER_NAMES.items():
+                if name in agent_name:
+                    # La décision du LLM sert d'exemple au routeur local
+                    self.router.record(query, route)
+                    break
+        
         return agent_name
     
     def process(self, query: str) -> dict:
@@ -210,6 +210,27 @@ def tab_home():
         st.warning("**Temps Réel**\n\nDonnées de marché et actualités actualisées")
 
 
+def stream_response(query: str, status, answer_box) -> dict:
+    """Exécute la requête en affichant l'agent, les tools et la réponse au fil de l'eau."""
+    status.info("🔄 L'agent réfléchit...")
+    text = ""
+    for event in st.session_state.supervisor.stream(query):
+        if event["type"] == "route":
+            status.info(f"🤖 **{event['agent']}** traite la demande...")
+        elif event["type"] == "tool_start":
+            status.info(f"🔧 Appel de **{event['tool']}**...")
+        elif event["type"] == "tool_end":
+            status.info(f"✅ **{event['tool']}** terminé, rédaction de la réponse...")
+        elif event["type"] == "token":
+            text += event["content"]
+            answer_box.markdown(text + "▌")
+        elif event["type"] == "done":
+            response = event["response"]
+    status.empty()
+    answer_box.empty()
+    return response
+
+
 def tab_analyze():
     """Onglet Analyse."""
     st.markdown("### 🎯 Analyser")
@@ -237,39 +258,42 @@ def tab_analyze():
     
     # Traiter la requête
     if submit and query:
-        with st.spinner("🔄 L'agent réfléchit..."):
-            try:
-                # Exécuter
-                response = st.session_state.supervisor.process(query)
-                
-                # Mettre à jour les stats
-                agent_used = response['agent_used']
-                if agent_used in st.session_state.agent_stats:
-                    st.session_state.agent_stats[agent_used] += 1
-                
-                # Ajouter à l'historique
-                st.session_state.history.append({
-                    "query": query,
-                    "agent": agent_used,
-                    "response": response['result'],
-                    "timestamp": datetime.now().strftime("%H:%M:%S")
-                })
-                
-                # Afficher le résultat
-                st.markdown("---")
-                st.markdown(get_agent_badge(agent_used), unsafe_allow_html=True)
-                
-                st.markdown('<div class="success-box">', unsafe_allow_html=True)
-                st.markdown("### 💡 Réponse")
-                st.markdown(response['result'])
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                # Réinitialiser
-                if 'example_query' in st.session_state:
-                    del st.session_state.example_query
-                
-            except Exception as e:
-                st.error(f"❌ Erreur : {str(e)}")
+        status = st.empty()
+        answer_box = st.empty()
+        try:
+            # Exécuter (réponse affichée au fil de l'eau)
+            response = stream_response(query, status, answer_box)
+            
+            # Mettre à jour les stats
+            agent_used = response['agent_used']
+            if agent_used in st.session_state.agent_stats:
+                st.session_state.agent_stats[agent_used] += 1
+            
+            # Ajouter à l'historique
+            st.session_state.history.append({
+                "query": query,
+                "agent": agent_used,
+                "response": response['result'],
+                "timestamp": datetime.now().strftime("%H:%M:%S")
+            })
+            
+            # Afficher le résultat
+            st.markdown("---")
+            st.markdown(get_agent_badge(agent_used), unsafe_allow_html=True)
+            
+            st.markdown('<div class="success-box">', unsafe_allow_html=True)
+            st.markdown("### 💡 Réponse")
+            st.markdown(response['result'])
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            # Réinitialiser
+            if 'example_query' in st.session_state:
+                del st.session_state.example_query
+            
+        except Exception as e:
+            status.empty()
+            answer_box.empty()
+            st.error(f"❌ Erreur : {str(e)}")
 
 
 def tab_history():
@@ -12,7 +12,8 @@ import plotly.express as px
 from utils.export_utils import export_to_pdf, export_to_csv
 import time
 import json
-import yfinance as yf
+from utils.market_cache import get_ticker_info, quote_cache, QUOTE_FIELDS
+from utils.history_store import get_history
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -483,8 +484,7 @@ def load_agent_stats():
 def get_stock_mini_chart(symbol):
     """Récupère un mini graphique pour une action."""
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period="7d")
+        hist = get_history(symbol, "7d")
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(
@@ -536,8 +536,7 @@ def display_premium_sidebar():
         
         for symbol in st.session_state.watchlist:
             try:
-                stock = yf.Ticker(symbol)
-                info = stock.info
+                info = get_ticker_info(symbol, QUOTE_FIELDS)
                 price = info.get('currentPrice', info.get('regularMarketPrice', 0))
                 prev_close = info.get('previousClose', price)
                 change = ((price - prev_close) / prev_close * 100) if prev_close else 0
@@ -559,6 +558,12 @@ def display_premium_sidebar():
             except:
                 pass
         
+        cache_stats = quote_cache.stats()
+        st.caption(
+            f"⚡ Cache cotations : {cache_stats['hit_rate']*100:.0f}% hits "
+            f"({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']})"
+        )
+        
         # Quick Actions
         st.markdown("### ⚡ Actions Rapides")
         
@@ -727,6 +732,34 @@ def tab_home_ultimate():
                         st.session_state.active_tab = 1
 
 
+def stream_response(query: str, progress_bar, status, answer_box) -> dict:
+    """Exécute la requête ; la progression suit les étapes réelles du graphe et la réponse s'affiche au fil de l'eau."""
+    status.markdown("🤖 **Supervisor** analyse la requête...")
+    progress_bar.progress(10)
+    text = ""
+    for event in st.session_state.supervisor.stream(query):
+        if event["type"] == "route":
+            status.markdown(f"⚙️ **{event['agent']}** traite la demande...")
+            progress_bar.progress(35)
+        elif event["type"] == "tool_start":
+            status.markdown(f"🔧 Appel de **{event['tool']}**...")
+            progress_bar.progress(55)
+        elif event["type"] == "tool_end":
+            status.markdown(f"✅ **{event['tool']}** terminé")
+            progress_bar.progress(75)
+        elif event["type"] == "token":
+            if not text:
+                status.markdown("✨ **Génération** de la réponse...")
+                progress_bar.progress(90)
+            text += event["content"]
+            answer_box.markdown(text + "▌")
+        elif event["type"] == "done":
+            response = event["response"]
+    progress_bar.progress(100)
+    answer_box.empty()
+    return response
+
+
 def tab_analyze_ultimate():
     """Onglet d'analyse ultra premium avec features avancées."""
     
@@ -782,25 +815,11 @@ def tab_analyze_ultimate():
         with progress_container:
             progress_bar = st.progress(0)
             status = st.empty()
+            answer_box = st.empty()
             
             try:
-                # Étape 1
-                status.markdown("🤖 **Supervisor** analyse la requête...")
-                progress_bar.progress(25)
-                time.sleep(0.3)
-                
-                # Exécution
-                response = st.session_state.supervisor.process(query)
-                
-                # Étape 2
-                status.markdown(f"⚙️ **{response['agent_used']}** traite la demande...")
-                progress_bar.progress(75)
-                time.sleep(0.3)
-                
-                # Étape 3
-                status.markdown("✨ **Génération** de la réponse...")
-                progress_bar.progress(100)
-                time.sleep(0.2)
+                # Exécution : routage, tools et réponse affichés au fil de l'eau
+                response = stream_response(query, progress_bar, status, answer_box)
                 
                 # Nettoyer
                 progress_bar.empty()
@@ -857,6 +876,7 @@ def tab_analyze_ultimate():
             except Exception as e:
                 progress_bar.empty()
                 status.empty()
+                answer_box.empty()
                 st.error(f"❌ Erreur: {str(e)}")
 
 
@@ -0,0 +1,131 @@
+"""
+Benchmark des modes du graphe : superviseur + agents spécialisés ou agent unique.
+
+Mesure, pour chaque mode, la latence de bout en bout et la consommation de
+tokens (donc le coût) sur une même liste de requêtes. Nécessite une clé
+OpenAI ; les données de marché peuvent être rejouées (MARKET_DATA_PROVIDER=replay).
+Les appels servis par le cache LLM ne consomment aucun token : lancer avec
+LLM_CACHE=0 pour mesurer des appels réels.
+
+    python3 benchmark_modes.py
+    python3 benchmark_modes.py --modes routed,single --runs 3 --queries requetes.txt
+    python3 benchmark_modes.py --no-local-routing --no-fast-path
+"""
+import argparse
+import statistics
+import time
+
+from langchain_core.callbacks import get_usage_metadata_callback
+
+from agents.langgraph_system import LangGraphFinancialAgent, MODES
+from utils.llm_cache import llm_cache
+
+
+# Prix gpt-4o-mini en $ par million de tokens (entrée, sortie)
+PRICE_PER_MILLION = (0.15, 0.60)
+
+DEFAULT_QUERIES = [
+    "Quel est le prix actuel de Apple ?",
+    "Compare Microsoft et Google",
+    "Donne-moi l'historique de Tesla sur 30 jours",
+    "Calcule mon ROI si j'ai investi 10000 et j'ai maintenant 15000",
+    "Mensualité d'un prêt de 200000 sur 20 ans à 3,5%",
+    "Quelles sont les actualités sur Nvidia ?",
+    "Analyse le sentiment du marché crypto",
+    "Quel serait mon gain si j'avais acheté 10 actions Apple à 150$ ?",
+]
+
+
+def load_queries(path):
+    if not path:
+        return DEFAULT_QUERIES
+    with open(path, encoding="utf-8") as handle:
+        return [line.strip() for line in handle if line.strip()]
+
+
+def run_mode(mode, queries, runs, **options):
+    """Exécute toutes les requêtes dans un mode ; une mesure par requête et par passage."""
+    agent = LangGraphFinancialAgent(mode=mode, **options)
+    samples = []
+    for _ in range(runs):
+        for query in queries:
+            with get_usage_metadata_callback() as usage:
+                start = time.perf_counter()
+                try:
+                    response = agent.process(query)
+                    error = None
+                except Exception as e:
+                    response, error = {"agent_used": "-"}, str(e)
+                elapsed = time.perf_counter() - start
+            tokens_in = sum(u.get("input_tokens", 0) for u in usage.usage_metadata.values())
+            tokens_out = sum(u.get("output_tokens", 0) for u in usage.usage_metadata.values())
+            samples.append({
+                "query": query,
+                "agent": response["agent_used"],
+                "latency": elapsed,
+                "tokens_in": tokens_in,
+                "tokens_out": tokens_out,
+                "cost": (tokens_in * PRICE_PER_MILLION[0] + tokens_out * PRICE_PER_MILLION[1]) / 1e6,
+                "error": error,
+            })
+    return samples
+
+
+def summarize(mode, samples):
+    latencies = sorted(s["latency"] for s in samples)
+    n = len(samples)
+    return {
+        "mode": mode,
+        "median": statistics.median(latencies),
+        "p95": latencies[max(int(n * 0.95) - 1, 0)],
+        "tokens_in": sum(s["tokens_in"] for s in samples) / n,
+        "tokens_out": sum(s["tokens_out"] for s in samples) / n,
+        "cost": sum(s["cost"] for s in samples) / n,
+        "errors": sum(1 for s in samples if s["error"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des modes du graphe (latence et tokens)")
+    parser.add_argument("--modes", default=",".join(MODES), help="Modes comparés, séparés par des virgules")
+    parser.add_argument("--queries", default="", help="Fichier de requêtes (une par ligne)")
+    parser.add_argument("--runs", type=int, default=1, help="Passages sur la liste de requêtes")
+    parser.add_argument("--no-fast-path", action="store_true", help="Désactive les calculs simples sans LLM")
+    parser.add_argument("--no-local-routing", action="store_true", help="Routage par le LLM uniquement")
+    parser.add_argument("--details", action="store_true", help="Affiche chaque requête")
+    args = parser.parse_args()
+
+    queries = load_queries(args.queries)
+    # Cache des réponses désactivé : chaque passage exécute réellement le graphe
+    options = {"fast_path": not args.no_fast_path, "local_routing": not args.no_local_routing, "cache_answers": False}
+    summaries = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        print(f"⏳ Mode {mode} : {len(queries) * args.runs} requêtes...")
+        samples = run_mode(mode, queries, args.runs, **options)
+        summaries.append(summarize(mode, samples))
+        if args.details:
+            for s in samples:
+                status = f"❌ {s['error']}" if s["error"] else s["agent"]
+                print(f"   {s['latency']:6.2f} s | {s['tokens_in'] + s['tokens_out']:>6} tokens | {status} | {s['query'][:50]}")
+
+    print("\n" + "="*78)
+    print(f"📊 {len(queries)} requêtes × {args.runs} passage(s) | fast path: {options['fast_path']} | "
+          f"routage local: {options['local_routing']}")
+    print("="*78)
+    print(f"{'Mode':<10}{'Médiane':>10}{'p95':>10}{'Tokens in':>12}{'Tokens out':>12}{'$/requête':>12}{'Erreurs':>9}")
+    for s in summaries:
+        print(f"{s['mode']:<10}{s['median']:>9.2f}s{s['p95']:>9.2f}s{s['tokens_in']:>12.0f}"
+              f"{s['tokens_out']:>12.0f}{s['cost']:>12.5f}{s['errors']:>9}")
+    if len(summaries) > 1:
+        base, other = summaries[0], summaries[1]
+        print("━"*78)
+        print(f"⚡ {other['mode']} vs {base['mode']}: latence médiane {(other['median'] / base['median'] - 1) * 100:+.1f}% | "
+              f"coût {(other['cost'] / base['cost'] - 1) * 100 if base['cost'] else 0:+.1f}%")
+    if llm_cache is not None:
+        stats = llm_cache.stats()
+        print(f"💾 Cache LLM: {stats['hits']} appels servis ({stats['hit_rate'] * 100:.0f}%) | "
+              f"{stats['saved_tokens']} tokens et ${stats['saved_cost']:.4f} économisés")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark hors-ligne des tools financiers.
+
+Enregistrer des données une fois (réseau requis) :
+    python3 benchmark_tools.py --record AAPL,MSFT,GOOGL,TSLA
+
+Rejouer ensuite sans réseau, de façon déterministe :
+    python3 benchmark_tools.py --requests 500 --threads 8 --latency 0.3
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.market_data import (
+    FIXTURES_DIR, ReplayProvider, RecordingProvider, YFinanceProvider, set_provider
+)
+from utils.market_cache import quote_cache
+from utils.singleflight import market_flight
+from utils import history_store as history_module
+from utils.finance_tools import get_stock_price, get_stock_history, compare_stocks
+
+
+def record(symbols, fixtures_dir):
+    """Enregistre cotations et historiques des symboles depuis Yahoo Finance."""
+    set_provider(RecordingProvider(YFinanceProvider(), fixtures_dir))
+    for symbol in symbols:
+        get_stock_price.invoke({"symbol": symbol})
+        get_stock_history.invoke({"symbol": symbol, "period": "max"})
+        print(f"💾 {symbol} enregistré dans {fixtures_dir}")
+
+
+def replay(symbols, fixtures_dir, requests, threads, latency):
+    """Rejoue un mélange de requêtes sur les données enregistrées."""
+    set_provider(ReplayProvider(fixtures_dir, latency=latency))
+    # Stockage d'historiques isolé pour que chaque run parte à froid
+    history_module.history_store.root = tempfile.mkdtemp(prefix="bench_market_data_")
+
+    calls = [
+        (get_stock_price, {"symbol": symbols[i % len(symbols)]}) if i % 3 == 0 else
+        (get_stock_history, {"symbol": symbols[i % len(symbols)], "period": "1y"}) if i % 3 == 1 else
+        (compare_stocks, {"symbols": ",".join(symbols)})
+        for i in range(requests)
+    ]
+
+    def timed(call):
+        tool, args = call
+        start = time.perf_counter()
+        tool.invoke(args)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(timed, calls))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print("\n" + "="*60)
+    print(f"📊 {requests} requêtes | {threads} threads | latence simulée {latency*1000:.0f} ms")
+    print("="*60)
+    print(f"⚡ Débit: {requests / elapsed:.1f} req/s ({elapsed:.2f} s)")
+    print(f"⏱️  Latence médiane: {statistics.median(latencies)*1000:.2f} ms")
+    print(f"⏱️  Latence p95: {latencies[int(len(latencies) * 0.95) - 1]*1000:.2f} ms")
+    print(f"💾 Cache cotations: {quote_cache.stats()}")
+    print(f"💾 Historiques: {history_module.history_store.stats()}")
+    print(f"🔀 Requêtes regroupées: {market_flight.stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne des tools financiers")
+    parser.add_argument("--record", metavar="SYMBOLS", help="Symboles à enregistrer (séparés par des virgules)")
+    parser.add_argument("--symbols", default="", help="Symboles à rejouer (par défaut : tous les fixtures)")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulée par appel (s)")
+    args = parser.parse_args()
+
+    if args.record:
+        record([s.strip().upper() for s in args.record.split(",")], args.fixtures)
+        return
+
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()]
+    if not symbols:
+        symbols = sorted(
+            name[:-len(".info.json")] for name in os.listdir(args.fixtures)
+            if name.endswith(".info.json")
+        )
+    if not symbols:
+        print(f"❌ Aucun fixture dans {args.fixtures}. Lancez d'abord --record.")
+        return
+
+    replay(symbols, args.fixtures, args.requests, args.threads, args.latency)
+
+
+if __name__ == "__main__":
+    main()
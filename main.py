@@ -17,14 +17,36 @@ def print_header():
     print("="*70)
 
 
-def print_result(response: dict):
-    """Affiche le résultat d'une requête."""
+def stream_result(agent_system: LangGraphFinancialAgent, query: str) -> dict:
+    """Affiche le routage, les appels de tools et la réponse au fil de l'eau."""
     print("\n" + "─"*70)
-    print(f"📝 REQUÊTE: {response['query']}")
-    print(f"🤖 AGENT UTILISÉ: {response['agent_used']}")
-    print("─"*70)
-    print(f"\n💡 RÉPONSE:\n{response['result']}")
-    print("\n" + "="*70)
+    print(f"📝 REQUÊTE: {query}")
+    routed = streamed = False
+    for event in agent_system.stream(query):
+        if event["type"] == "route":
+            print(f"🤖 AGENT UTILISÉ: {event['agent']}")
+            routed = True
+        elif event["type"] == "tool_start":
+            print(f"🔧 {event['tool']}({event['input']})")
+        elif event["type"] == "tool_end":
+            print(f"   ✅ {event['tool']} terminé")
+        elif event["type"] == "token":
+            if not streamed:
+                print("─"*70)
+                print("\n💡 RÉPONSE:")
+                streamed = True
+            print(event["content"], end="", flush=True)
+        elif event["type"] == "done":
+            response = event["response"]
+    
+    # Réponse directe (calcul simple ou cache) : ni routage ni fragments
+    if not routed:
+        print(f"🤖 AGENT UTILISÉ: {response['agent_used']}" + (" (♻️ réponse en cache)" if response.get('cached') else ""))
+    if not streamed:
+        print("─"*70)
+        print(f"\n💡 RÉPONSE:\n{response['result']}", end="")
+    print("\n\n" + "="*70)
+    return response
 
 
 def run_interactive_mode():
@@ -74,8 +96,7 @@ def run_interactive_mode():
         # Traiter la requête
         print("\n🔄 Analyse en cours...")
         try:
-            response = agent_system.process(query)
-            print_result(response)
+            stream_result(agent_system, query)
         except Exception as e:
             print(f"\n❌ Erreur: {str(e)}")
 
@@ -107,8 +128,7 @@ def run_demo_mode():
         print(f"{'='*70}")
         
         try:
-            response = agent_system.process(query)
-            print_result(response)
+            stream_result(agent_system, query)
             
             if i < len(demo_queries):
                 input("\n⏸️  Appuyez sur Entrée pour continuer...")
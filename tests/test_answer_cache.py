@@ -0,0 +1,59 @@
+"""Tests du cache sémantique des réponses (utils/answer_cache.py)."""
+import pytest
+
+from utils.answer_cache import AnswerCache, normalize_query
+
+
+@pytest.mark.parametrize("first, second", [
+    ("prix d'Apple", "Quel est le prix d'Apple (AAPL) ?"),
+    ("What's the price of Apple stock?", "Quel est le cours de l'action Apple ?"),
+    ("Calcule le ROI de 1000 à 1500", "calcule le roi de 1000 à 1500 !"),
+])
+def test_same_query(first, second):
+    a = normalize_query(first, [("AAPL", "Apple")] if "Apple" in first else [])
+    b = normalize_query(second, [("AAPL", "Apple")] if "Apple" in second else [])
+    assert a.key == b.key
+    assert a.text == b.text
+
+
+@pytest.mark.parametrize("first, second", [
+    # Signes des flux
+    ("VAN des flux -1000, 300, 400, 500 à 8%", "VAN des flux 1000, -300, -400, -500 à 8%"),
+    # Méthode de coût de revient
+    ("Coût de revient FIFO de mes achats", "Coût de revient LIFO de mes achats"),
+    # Indicateur
+    ("RSI sur 14 jours", "MACD sur 14 jours"),
+    # Type d'option
+    ("Prix d'un call strike 200", "Prix d'un put strike 200"),
+    # Sens de la transaction
+    ("Je veux acheter 10 actions à 50", "Je veux vendre 10 actions à 50"),
+    # Unité de durée
+    ("Historique sur 3 mois", "Historique sur 3 ans"),
+    # Comparaison, sens, secteur
+    ("actions avec un PER inférieur à 20", "actions avec un PER supérieur à 20"),
+    ("stocks with a P/E under 20", "stocks with a P/E over 20"),
+    ("actualités positives sur Tesla", "actualités négatives sur Tesla"),
+    ("meilleures actions du secteur santé", "meilleures actions du secteur énergie"),
+    ("actions en hausse aujourd'hui", "actions en baisse aujourd'hui"),
+])
+def test_different_key(first, second):
+    assert normalize_query(first).key != normalize_query(second).key
+
+
+def test_static_answer_is_served_for_equivalent_query():
+    cache = AnswerCache()
+    cache.store("Calcule le ROI de 1000 à 1500", [], "Calculator", "📈 ROI: +50.00%")
+    hit = cache.lookup("calcule le ROI de 1000 à 1500 ?")
+    assert hit is not None and hit.result == "📈 ROI: +50.00%"
+    assert cache.lookup("calcule le ROI de -1000 à 1500") is None
+    assert cache.stats()['hits'] == 1
+
+
+@pytest.mark.parametrize("query, word", [
+    ("variation entre 10 et 20", "entre"),
+    ("worth now", "now"),
+    ("valeur actuelle de 1000 sur 5 ans", "actuelle"),
+    ("meilleure action du CAC", "action"),
+])
+def test_content_words_are_kept(query, word):
+    assert word in normalize_query(query).text.split()
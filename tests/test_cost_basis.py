@@ -0,0 +1,86 @@
+"""Tests du registre des lots et de la lecture des relevés (utils/cost_basis.py)."""
+import pytest
+
+from utils import cost_basis
+from utils.cost_basis import LotBook, build_book
+
+TRADES = [
+    ('AAPL', 10, 100.0),
+    ('AAPL', 10, 120.0),
+    ('AAPL', -15, 150.0),
+]
+
+
+@pytest.mark.parametrize("method, realized, avg_cost", [
+    # 10 @ 100 puis 5 @ 120 vendus ; reste 5 @ 120
+    ('fifo', 15 * 150 - (10 * 100 + 5 * 120), 120.0),
+    # 10 @ 120 puis 5 @ 100 vendus ; reste 5 @ 100
+    ('lifo', 15 * 150 - (10 * 120 + 5 * 100), 100.0),
+    # 15 @ 110 vendus ; reste 5 @ 110
+    ('average', 15 * (150 - 110), 110.0),
+    ('peps', 15 * 150 - (10 * 100 + 5 * 120), 120.0),
+])
+def test_lot_matching(method, realized, avg_cost):
+    book = LotBook(method)
+    for symbol, quantity, price in TRADES:
+        book.apply(symbol, quantity, price)
+    row = book.positions({'AAPL': 130.0}).loc['AAPL']
+    assert row['quantity'] == pytest.approx(5)
+    assert row['realized'] == pytest.approx(realized)
+    assert row['avg_cost'] == pytest.approx(avg_cost)
+    assert row['unrealized'] == pytest.approx(5 * (130 - avg_cost))
+
+
+def test_fees_and_oversold():
+    book = LotBook('fifo')
+    book.buy('MSFT', 10, 100.0, fees=10.0)
+    pnl = book.sell('MSFT', 12, 110.0, fees=12.0)
+    # Frais d'achat dans le coût, frais de vente au prorata de la quantité clôturée
+    assert pnl == pytest.approx(10 * 110 - 10 - 1010)
+    row = book.positions().loc['MSFT']
+    assert row['quantity'] == 0 and row['oversold'] == pytest.approx(2)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        LotBook('hifo')
+
+
+CSV = "symbol,side,quantity,price\nAAPL,achat,10,100\nAAPL,vente,4,150\n"
+JSON_RECORDS = ('[{"symbol": "AAPL", "side": "buy", "quantity": 10, "price": 100},'
+                ' {"symbol": "AAPL", "side": "sell", "quantity": 4, "price": 150}]')
+JSON_COLUMNS = '{"symbol": ["AAPL", "AAPL"], "side": ["buy", "sell"], "quantity": [10, 4], "price": [100, 150]}'
+JSON_LINES = ('{"symbol": "AAPL", "side": "buy", "quantity": 10, "price": 100}\n'
+              '{"symbol": "AAPL", "side": "sell", "quantity": 4, "price": 150}')
+
+
+@pytest.mark.parametrize("source", [
+    CSV,
+    CSV.replace(',', ';'),
+    "symbol,quantity,price\nAAPL,10,100\nAAPL,-4,150\n",
+    JSON_RECORDS,
+    JSON_COLUMNS,
+    JSON_LINES,
+])
+def test_read_formats(source):
+    row = build_book(source).positions().loc['AAPL']
+    assert row['quantity'] == pytest.approx(6)
+    assert row['realized'] == pytest.approx(200)
+
+
+def test_unknown_side_is_rejected():
+    with pytest.raises(ValueError, match="dividend"):
+        build_book("symbol,side,quantity,price\nAAPL,buy,10,100\nAAPL,dividend,1,2\n")
+
+
+def test_files_only_from_statements_dir(tmp_path, monkeypatch):
+    statements = tmp_path / "statements"
+    statements.mkdir()
+    (statements / "trades.csv").write_text(CSV)
+    (tmp_path / "outside.csv").write_text(CSV)
+    monkeypatch.setattr(cost_basis, 'STATEMENTS_DIR', str(statements))
+
+    assert build_book("trades.csv").trades == 2
+    for path in ("../outside.csv", str(tmp_path / "outside.csv"), "~/outside.csv", "missing.csv"):
+        with pytest.raises(ValueError, match="Relevé introuvable"):
+            build_book(path)
@@ -0,0 +1,72 @@
+"""Tests de l'index des fondamentaux (utils/fundamentals.py)."""
+import pytest
+
+from utils.fundamentals import FundamentalsIndex
+from utils.market_data import MarketDataProvider
+
+UNIVERSE = ['AAPL', 'MSFT', 'XOM', 'JNJ']
+
+INFOS = {
+    'AAPL': {'sector': 'Technology', 'marketCap': 3e12, 'trailingPE': 30.0},
+    'MSFT': {'sector': 'Technology', 'marketCap': 3e12, 'trailingPE': 35.0},
+    'XOM': {'sector': 'Energy', 'marketCap': 4e11, 'trailingPE': 12.0},
+    'JNJ': {'sector': 'Healthcare', 'marketCap': 4e11, 'trailingPE': 15.0},
+}
+
+
+class _Provider(MarketDataProvider):
+    """Fournisseur en mémoire ; `down` contient les symboles en échec."""
+
+    name = "test"
+
+    def __init__(self):
+        self.down = set()
+
+    def get_info(self, symbol):
+        if symbol in self.down:
+            raise ConnectionError("réseau indisponible")
+        return dict(INFOS[symbol])
+
+    def get_history(self, symbol, start=None):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def provider():
+    return _Provider()
+
+
+@pytest.fixture
+def index(tmp_path, provider):
+    return FundamentalsIndex(root=str(tmp_path), universe=UNIVERSE, provider=provider)
+
+
+def test_screen(index):
+    assert [row['symbol'] for row in index.screen(sector='énergie')] == ['XOM']
+    assert {row['symbol'] for row in index.screen(max_pe=20)} == {'XOM', 'JNJ'}
+
+
+def test_failed_build_is_not_installed(index, provider):
+    provider.down = set(UNIVERSE)
+    with pytest.raises(RuntimeError, match="4 titres en erreur"):
+        index.table()
+    assert index.stats()['symbols'] == 0
+
+    # Le réseau revient : l'appel suivant reconstruit l'index
+    provider.down = set()
+    assert len(index.table()['symbol']) == 4
+
+
+@pytest.mark.parametrize("down, indexed", [
+    # Reconstruction trop partielle : l'index précédent est conservé
+    ({'AAPL', 'MSFT', 'XOM'}, 4),
+    # Assez de titres : l'index est remplacé, les erreurs sont signalées
+    ({'XOM'}, 3),
+])
+def test_refresh_keeps_previous_index(index, provider, down, indexed):
+    index.refresh()
+    provider.down = down
+    index.refresh()
+    stats = index.stats()
+    assert stats['symbols'] == indexed
+    assert set(stats['errors']) == down
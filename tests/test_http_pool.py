@@ -0,0 +1,44 @@
+"""Tests des limites de débit par fournisseur (utils/http_pool.py)."""
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from utils import http_pool
+from utils.http_pool import rate_limits, set_rate_limit
+
+
+def _limiter():
+    return InMemoryRateLimiter(requests_per_second=5, max_bucket_size=5)
+
+
+def test_scoped_limits_are_removed_on_exit():
+    first, second = _limiter(), _limiter()
+    with rate_limits({'market_data': first}):
+        assert http_pool._limiter('market_data') is first
+        with rate_limits({'market_data': second}):
+            assert http_pool._limiter('market_data') is second
+        assert http_pool._limiter('market_data') is first
+    assert http_pool._limiter('market_data') is None
+
+
+def test_overlapping_scopes_remove_their_own_limiter():
+    first, second = _limiter(), _limiter()
+    outer, inner = rate_limits({'search': first}), rate_limits({'search': second})
+    outer.__enter__()
+    inner.__enter__()
+    # Le premier bloc se termine avant le second (requêtes concurrentes)
+    outer.__exit__(None, None, None)
+    assert http_pool._limiter('search') is second
+    inner.__exit__(None, None, None)
+    assert http_pool._limiter('search') is None
+
+
+def test_process_limit_applies_outside_scopes():
+    try:
+        set_rate_limit('search', 10)
+        process_limiter = http_pool._limiter('search')
+        assert process_limiter is not None
+        scoped = _limiter()
+        with rate_limits({'search': scoped}):
+            assert http_pool._limiter('search') is scoped
+        assert http_pool._limiter('search') is process_limiter
+    finally:
+        set_rate_limit('search', None)
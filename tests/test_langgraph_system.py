@@ -0,0 +1,146 @@
+"""Tests du système d'agents (agents/langgraph_system.py) avec un LLM simulé, sans réseau."""
+import asyncio
+import json
+
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from agents.langgraph_system import LangGraphFinancialAgent
+
+ROI_CALL = AIMessage(content="", tool_calls=[{
+    "name": "calculate_roi", "args": {"initial_investment": 1000, "final_value": 1500}, "id": "call_roi",
+}])
+ANSWER = "Le ROI est de +50 %."
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Renvoie les réponses prévues dans l'ordre, mot par mot en streaming."""
+
+    responses: list
+    seen: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next(self, messages) -> AIMessage:
+        self.seen.append(list(messages))
+        return self.responses.pop(0)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._next(messages))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._next(messages)
+        if message.tool_calls:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ]))
+            return
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word + (" " if i < len(words) - 1 else "")))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    # Le client OpenAI exige une clé à la construction ; aucun appel n'est fait
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+
+    def make(responses=(), cache=None, **options):
+        options = {"prefetch": False, "fast_path": False, "cache_answers": False, **options}
+        agent = LangGraphFinancialAgent(**options)
+        agent.llm = ScriptedChatModel(responses=list(responses), seen=[], cache=cache)
+        agent.graph = agent._create_graph()
+        return agent
+
+    return make
+
+
+def test_single_mode_runs_tools_then_answers(make_agent):
+    agent = make_agent([ROI_CALL, AIMessage(content=ANSWER)], mode="single")
+    response = agent.process("Quel est mon ROI si j'ai investi 1000 et que j'ai 1500 ?")
+    assert response["agent_used"] == "Calculator"
+    assert response["result"] == ANSWER
+    # Le second appel du LLM voit le résultat du tool
+    tool_messages = [m for m in agent.llm.seen[1] if isinstance(m, ToolMessage)]
+    assert "ROI: +50.00%" in tool_messages[0].content
+
+
+def test_single_mode_stops_after_max_tool_rounds(make_agent):
+    from agents.langgraph_system import MAX_TOOL_ROUNDS
+    agent = make_agent([ROI_CALL] * MAX_TOOL_ROUNDS + [AIMessage(content=ANSWER)], mode="single")
+    assert agent.process("ROI en boucle")["result"] == ANSWER
+    assert len(agent.llm.seen) == MAX_TOOL_ROUNDS + 1
+
+
+def test_stream_event_sequence(make_agent):
+    agent = make_agent([ROI_CALL, AIMessage(content=ANSWER)], mode="single")
+    events = list(agent.stream("Quel est mon ROI si j'ai investi 1000 et que j'ai 1500 ?"))
+    types = [event["type"] for event in events]
+    assert types[:3] == ["route", "tool_start", "tool_end"]
+    assert set(types[3:-1]) == {"token"}
+    assert types[-1] == "done"
+    assert events[2]["tool"] == "calculate_roi" and "ROI: +50.00%" in events[2]["output"]
+    assert "".join(e["content"] for e in events if e["type"] == "token") == ANSWER
+    assert events[-1]["response"]["result"] == ANSWER
+
+
+def test_stream_publishes_llm_cached_answer_as_one_token(make_agent):
+    query = "Comment va le marché en général ?"
+    agent = make_agent([AIMessage(content=ANSWER)], cache=InMemoryCache(), mode="single")
+    first = [e for e in agent.stream(query) if e["type"] == "token"]
+    assert len(first) > 1
+    # Même appel : servi par le cache LLM, sans génération
+    second = [e for e in agent.stream(query) if e["type"] == "token"]
+    assert [e["content"] for e in second] == [ANSWER]
+
+
+class _StubGraph:
+    """Graphe simulé : les premières requêtes sont les plus lentes."""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.running = 0
+        self.max_running = 0
+
+    async def ainvoke(self, state):
+        query = state["query"]
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays[query])
+            if query == "boom":
+                raise RuntimeError("échec simulé")
+            return {"agent_used": "calculator", "final_answer": f"réponse à {query}"}
+        finally:
+            self.running -= 1
+
+
+def test_process_many_keeps_order_and_isolates_errors(make_agent):
+    agent = make_agent()
+    queries = [f"q{i}" for i in range(6)] + ["boom"]
+    agent.graph = _StubGraph({q: 0.06 - 0.01 * i for i, q in enumerate(queries)} | {"boom": 0.0})
+
+    responses = agent.process_many(queries, concurrency=3)
+
+    assert [r["query"] for r in responses] == queries
+    assert [r["result"] for r in responses[:-1]] == [f"réponse à {q}" for q in queries[:-1]]
+    assert responses[-1]["error"] == "échec simulé"
+    assert all(r["latency"] >= 0 for r in responses)
+    assert agent.graph.max_running == 3
+
+
+def test_process_many_rejects_invalid_concurrency(make_agent):
+    with pytest.raises(ValueError):
+        make_agent().process_many(["q"], concurrency=0)
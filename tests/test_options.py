@@ -0,0 +1,73 @@
+"""Tests de la valorisation des options européennes (utils/options.py)."""
+import math
+
+import numpy as np
+import pytest
+
+from utils.options import black_scholes, implied_volatility, norm_cdf
+
+# Valeurs de référence (Hull) : S=100, K=100, T=1, r=5 %, σ=20 %
+SPOT, STRIKE, EXPIRY, RATE, VOL = 100.0, 100.0, 1.0, 0.05, 0.20
+
+
+@pytest.mark.parametrize("kind, price, delta", [
+    ('call', 10.4506, 0.6368),
+    ('put', 5.5735, -0.3632),
+])
+def test_reference_values(kind, price, delta):
+    result = black_scholes(SPOT, STRIKE, EXPIRY, RATE, VOL, kind=kind)
+    assert float(result['price']) == pytest.approx(price, abs=1e-4)
+    assert float(result['delta']) == pytest.approx(delta, abs=1e-4)
+
+
+@pytest.mark.parametrize("strike, expiry, dividend", [
+    (80.0, 0.25, 0.0),
+    (100.0, 1.0, 0.02),
+    (130.0, 2.0, 0.04),
+])
+def test_put_call_parity(strike, expiry, dividend):
+    call = black_scholes(SPOT, strike, expiry, RATE, VOL, dividend, 'call')
+    put = black_scholes(SPOT, strike, expiry, RATE, VOL, dividend, 'put')
+    parity = SPOT * np.exp(-dividend * expiry) - strike * np.exp(-RATE * expiry)
+    assert float(call['price'] - put['price']) == pytest.approx(parity)
+    assert float(call['gamma']) == pytest.approx(float(put['gamma']))
+    assert float(call['vega']) == pytest.approx(float(put['vega']))
+
+
+def test_greeks_match_finite_differences():
+    h = 1e-4
+    base = black_scholes(SPOT, STRIKE, EXPIRY, RATE, VOL)
+    up = black_scholes(SPOT + h, STRIKE, EXPIRY, RATE, VOL)['price']
+    down = black_scholes(SPOT - h, STRIKE, EXPIRY, RATE, VOL)['price']
+    assert float(base['delta']) == pytest.approx(float((up - down) / (2 * h)), rel=1e-5)
+    vol_up = black_scholes(SPOT, STRIKE, EXPIRY, RATE, VOL + h)['price']
+    assert float(base['vega']) == pytest.approx(float((vol_up - base['price']) / h / 100), rel=1e-3)
+
+
+def test_grid_shape():
+    strikes = np.array([90.0, 100.0, 110.0])
+    expiries = np.array([0.5, 1.0])
+    result = black_scholes(SPOT, strikes[None, :], expiries[:, None], RATE, VOL)
+    assert result['price'].shape == (2, 3)
+    # Le call décroît avec le strike
+    assert np.all(np.diff(result['price'], axis=1) < 0)
+
+
+@pytest.mark.parametrize("kind", ['call', 'put'])
+def test_implied_volatility_round_trip(kind):
+    strikes = np.array([80.0, 100.0, 120.0])
+    vols = np.array([0.15, 0.25, 0.40])
+    prices = black_scholes(SPOT, strikes, EXPIRY, RATE, vols, kind=kind)['price']
+    assert implied_volatility(prices, SPOT, strikes, EXPIRY, RATE, kind=kind) == pytest.approx(vols, abs=1e-6)
+
+
+def test_implied_volatility_outside_arbitrage_bounds():
+    # Call sous sa valeur intrinsèque actualisée
+    assert np.isnan(implied_volatility([1.0], SPOT, [50.0], EXPIRY, RATE)[0])
+
+
+@pytest.mark.parametrize("x", [-40.0, -8.0, -3.2, -1.0, 0.0, 0.5, 2.0, 7.5, 40.0])
+def test_norm_cdf_matches_erfc(x):
+    expected = 0.5 * math.erfc(-x / math.sqrt(2.0))
+    assert norm_cdf(x) == pytest.approx(expected, abs=1e-15)
+    assert norm_cdf(np.array([x])).dtype == np.float64
@@ -0,0 +1,56 @@
+"""Tests du routage local des requêtes (utils/query_router.py)."""
+import json
+
+import pytest
+
+from utils.query_router import QueryRouter
+
+
+@pytest.fixture
+def router():
+    return QueryRouter(log_path=None)
+
+
+@pytest.mark.parametrize("query, symbols, agent", [
+    ("Quel est le prix de l'action Apple ?", ["AAPL"], 'market_analyst'),
+    ("Historique de Tesla sur 6 mois", ["TSLA"], 'market_analyst'),
+    ("Compare Apple et Microsoft", ["AAPL", "MSFT"], 'market_analyst'),
+    ("Calcule mon ROI : investi 10000, valeur 15000", [], 'calculator'),
+    ("Calcule la VAN de ces flux à 8%", [], 'calculator'),
+    ("Quelles sont les dernières actualités sur Nvidia ?", ["NVDA"], 'researcher'),
+    ("Quel est le sentiment du marché sur l'IA ?", [], 'researcher'),
+    ("Search the latest news about inflation", [], 'researcher'),
+])
+def test_local_route(router, query, symbols, agent):
+    assert router.local_route(query, symbols) == agent
+    assert router.stats()['local'] == 1
+
+
+@pytest.mark.parametrize("query", [
+    "bonjour",
+    "Que penses-tu ?",
+])
+def test_ambiguous_queries_go_to_the_llm(router, query):
+    route = router.route(query)
+    assert route.confidence < router.min_confidence
+    assert router.local_route(query) is None
+
+
+def test_symbols_favor_market_analysis(router):
+    query = "Que penses-tu ?"
+    assert router.route(query).agent != 'market_analyst'
+    assert router.route(query, ["AAPL"]).agent == 'market_analyst'
+
+
+def test_llm_decisions_are_logged_and_reloaded(tmp_path):
+    log = tmp_path / "router.jsonl"
+    router = QueryRouter(log_path=str(log))
+    router.record("Que penses-tu du dividende ?", 'calculator')
+    router.record("ignoré", 'unknown_agent')
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [(e['query'], e['agent']) for e in entries] == [("Que penses-tu du dividende ?", 'calculator')]
+    assert router.stats()['llm'] == 1
+
+    reloaded = QueryRouter(log_path=str(log))
+    assert reloaded.stats()['logged'] == 1
+    assert reloaded.stats()['examples'] == router.stats()['examples']
@@ -0,0 +1,80 @@
+"""Tests de l'analyse des calculs simples (utils/quick_calc.py)."""
+import pytest
+
+from utils.quick_calc import answer, match, parse_amounts
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("investi 10000, valeur 15000", [(10000, ''), (15000, '')]),
+    ("10 000 € puis 12 500 €", [(10000, '€'), (12500, '€')]),
+    ("$10,000, now worth $12,500", [(10000, '$'), (12500, '$')]),
+    ("1,000,000 to 1,200,000", [(1000000, ''), (1200000, '')]),
+    ("1,5 % et 2.75 $", [(1.5, '%'), (2.75, '$')]),
+    ("10k$ et 2 M€", [(10000, '$'), (2000000, '€')]),
+    ("entre -50 et 100", [(-50, ''), (100, '')]),
+    ("−20 € puis -$30 puis $-40", [(-20, '€'), (-30, '$'), (-40, '$')]),
+    ("S&P-500 entre 2023-2024", [(500, ''), (2023, 'date'), (2024, 'date')]),
+    ("de 2020 à 2024 : 2020 $ puis 2500 €", [(2020, 'date'), (2024, 'date'), (2020, '$'), (2500, '€')]),
+    ("50 actions sur 3 ans", [(50, 'qty'), (3, 'period')]),
+])
+def test_parse_amounts(text, expected):
+    assert [(a.value, a.unit) for a in parse_amounts(text)] == expected
+
+
+@pytest.mark.parametrize("text, ambiguous", [
+    ("investi 1,500", [True]),
+    ("investi $1,500", [False]),
+    ("investi 1,500.25", [False]),
+    ("investi 1,500,000", [False]),
+])
+def test_parse_amounts_ambiguous_comma(text, ambiguous):
+    assert [a.ambiguous for a in parse_amounts(text)] == ambiguous
+
+
+@pytest.mark.parametrize("query, intent, args", [
+    ("Calcule mon ROI : investi 10000, valeur 15000", 'roi',
+     {'initial_investment': 10000, 'final_value': 15000}),
+    ("ROI: invested $10,000, now worth $12,500", 'roi',
+     {'initial_investment': 10000, 'final_value': 12500}),
+    ("profit si j'achète 50 actions à 100$ et je vends à 150$", 'profit_loss',
+     {'buy_price': 100, 'sell_price': 150, 'quantity': 50}),
+    ("variation entre 1000 et 1200", 'percent_change', {'old_value': 1000, 'new_value': 1200}),
+])
+def test_match(query, intent, args):
+    calc = match(query)
+    assert calc.intent == intent
+    assert calc.args == args
+    assert calc.confidence >= 0.8
+
+
+@pytest.mark.parametrize("query", [
+    # Base négative : pas de pourcentage de variation mécanique
+    "Variation entre -50 et 100",
+    # Virgule ambiguë (1500 ou 1,5)
+    "Calcule mon ROI : investi 1,500 valeur 2,000",
+    # Demande d'explication
+    "Pourquoi mon ROI : investi 10000, valeur 15000 ?",
+    # Un seul montant
+    "Calcule mon ROI sur 10000",
+    # Années, pas des montants ; entreprise citée : données de marché
+    "Quelle est la variation d'Apple entre 2020 et 2024 ?",
+    "What was the percent change of NVDA from 2015 to 2025?",
+    "Calcule la variation entre 2023 et 2024 de mon portefeuille",
+    "Variation de Tesla entre 150 et 200",
+])
+def test_answer_declines(query):
+    assert answer(query) is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("ROI: invested $10,000, now worth $12,500", "ROI: +25.00% | Gain/Perte: $+2,500.00"),
+    ("ROI : investi 10 000 €, valeur 12 500 €", "ROI: +25.00% | Gain/Perte: +2,500.00 €"),
+    ("Perte si j'achète 10 actions à 50 € et vends à 40 €", "Résultat: -100.00 € (-20.00%)"),
+    ("variation entre 1000 et 1200", "Variation: +20.00%"),
+    ("ROI : investi 10000 en 2020, valeur 15000 en 2024", "ROI: +50.00%"),
+])
+def test_answer(query, expected):
+    result = answer(query)
+    assert expected in result
+    if '€' in query:
+        assert '$' not in result
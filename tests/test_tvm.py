@@ -0,0 +1,80 @@
+"""Tests des calculs de valeur temps de l'argent (utils/tvm.py)."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from utils import tvm
+
+
+@pytest.mark.parametrize("rate, cashflows, expected", [
+    (0.10, [-100, 110], 0.0),
+    (0.0, [-1000, 300, 400, 500], 200.0),
+    (0.08, [-1000, 300, 400, 500], -1000 + 300 / 1.08 + 400 / 1.08 ** 2 + 500 / 1.08 ** 3),
+    (0.08, [1000, -300, -400, -500], 1000 - 300 / 1.08 - 400 / 1.08 ** 2 - 500 / 1.08 ** 3),
+])
+def test_npv(rate, cashflows, expected):
+    assert tvm.npv(rate, cashflows)[0] == pytest.approx(expected)
+
+
+def test_npv_grid():
+    values = tvm.npv([0.0, 0.1], [[-100, 110], [-100, 121]])
+    assert values.shape == (2, 2)
+    assert values[0] == pytest.approx([10.0, 0.0])
+    assert values[1] == pytest.approx([21.0, 10.0])
+
+
+@pytest.mark.parametrize("cashflows, expected", [
+    ([-100, 110], 0.10),
+    ([-100, 0, 121], 0.10),
+    ([-1000, 300, 400, 500], None),
+])
+def test_irr(cashflows, expected):
+    rate = tvm.irr(cashflows)[0]
+    if expected is not None:
+        assert rate == pytest.approx(expected)
+    # Le TRI annule la VAN
+    assert tvm.npv(rate, cashflows)[0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_irr_without_sign_change_is_nan():
+    assert np.isnan(tvm.irr([100, 200, 300])[0])
+
+
+def test_xirr():
+    rate = tvm.xirr([-1000, 1100], [date(2023, 1, 1), date(2024, 1, 1)])[0]
+    assert rate == pytest.approx(0.10)
+
+
+@pytest.mark.parametrize("principal, rate, periods, expected", [
+    (1200, 0.0, 12, 100.0),
+    (100_000, 0.05 / 12, 360, 536.8216),
+    (10_000, 0.01, 12, 888.4879),
+])
+def test_payment(principal, rate, periods, expected):
+    assert float(tvm.payment(principal, rate, periods)) == pytest.approx(expected, rel=1e-6)
+
+
+@pytest.mark.parametrize("rate", [0.0, 0.004])
+def test_amortization(rate):
+    table = tvm.amortization(50_000, rate, 48)
+    assert table['principal'].sum() == pytest.approx(50_000)
+    assert table['balance'][-1] == 0.0
+    assert table['payment'] == pytest.approx(table['interest'] + table['principal'])
+
+
+@pytest.mark.parametrize("initial, rate, years, contribution, expected", [
+    (1000, 0.12, 1, 0.0, 1000 * 1.01 ** 12),
+    (1000, 0.0, 2, 50.0, 1000 + 50 * 24),
+    (0, 0.12, 1, 100.0, 100 * (1.01 ** 12 - 1) / 0.01),
+])
+def test_future_value(initial, rate, years, contribution, expected):
+    assert float(tvm.future_value(initial, rate, years, contribution)) == pytest.approx(expected)
+
+
+def test_dcf():
+    result = tvm.dcf(100.0, 0.0, [0.10, 0.02], [0.02], years=1)
+    # Un an de flux puis Gordon-Shapiro : 100/1.1 + 100 * 1.02 / 0.08 / 1.1
+    assert result['enterprise_value'][0, 0] == pytest.approx(100 / 1.1 + 100 * 1.02 / 0.08 / 1.1)
+    # Croissance terminale égale au taux d'actualisation : pas de valeur
+    assert np.isnan(result['enterprise_value'][1, 0])
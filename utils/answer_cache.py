@@ -0,0 +1,365 @@
+"""
+Cache sémantique des réponses de l'agent.
+
+Les requêtes sont normalisées avant comparaison : minuscules sans accents,
+entreprises remplacées par leurs symboles, vocabulaire anglais ramené au
+français, mots vides retirés et montants extraits. Deux requêtes ne peuvent
+partager une réponse que si elles portent sur les mêmes symboles, les
+mêmes montants (signés) et les mêmes termes discriminants (FIFO/LIFO,
+call/put, indicateur, achat/vente, unité de durée, comparaison, sens,
+secteur) ; le reste du texte est
+comparé par similarité cosinus de n-grammes ("prix d'Apple" et "Quel est
+le prix d'Apple (AAPL) ?" tombent sur la même entrée).
+
+Une réponse est servie tant qu'elle est dans sa fenêtre de fraîcheur et que
+les cours des symboles concernés n'ont pas bougé au-delà d'un seuil depuis
+qu'elle a été produite ; sinon elle est invalidée.
+"""
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.fundamentals import SECTOR_ALIASES
+from utils.market_cache import quote_cache, QUOTE_FIELDS
+from utils.quick_calc import parse_amounts
+from utils.symbols import normalize_text
+
+
+# Similarité minimale entre deux requêtes normalisées
+MIN_SIMILARITY = 0.85
+
+# Fenêtre de fraîcheur des réponses qui dépendent du marché (secondes)
+ANSWER_TTL = 10 * 60
+
+# Réponses indépendantes du marché (calculs sans symbole)
+STATIC_TTL = 24 * 60 * 60
+
+# Variation de cours (relative) au-delà de laquelle une réponse est invalidée
+MAX_PRICE_MOVE = 0.005
+
+MAX_ENTRIES = 1024
+
+# Agents dont les réponses sans symbole ne dépendent pas du marché
+STATIC_AGENTS = {'Calculator'}
+
+# Vocabulaire anglais (et variantes) ramené à un mot commun
+_SYNONYMS = {
+    'price': 'prix', 'cours': 'prix', 'quote': 'prix', 'cotation': 'prix', 'valeur': 'prix',
+    'stock': 'action', 'stocks': 'action', 'share': 'action', 'shares': 'action', 'actions': 'action',
+    'titre': 'action', 'titres': 'action',
+    'news': 'actualites', 'actualite': 'actualites', 'nouvelles': 'actualites', 'infos': 'actualites',
+    'history': 'historique', 'historical': 'historique', 'evolution': 'historique',
+    'compare': 'comparer', 'comparaison': 'comparer', 'comparison': 'comparer', 'versus': 'comparer', 'vs': 'comparer',
+    'calculate': 'calcule', 'calculer': 'calcule', 'compute': 'calcule',
+    'profit': 'gain', 'gains': 'gain', 'benefice': 'gain',
+    'loss': 'perte', 'pertes': 'perte',
+    'market': 'marche', 'marches': 'marche',
+    'days': 'jours', 'day': 'jours', 'jour': 'jours',
+    'weeks': 'semaines', 'week': 'semaines', 'semaine': 'semaines',
+    'months': 'mois', 'month': 'mois',
+    'years': 'ans', 'year': 'ans', 'annees': 'ans', 'annee': 'ans', 'an': 'ans',
+    'buy': 'acheter', 'bought': 'acheter', 'achat': 'acheter', 'achete': 'acheter', 'achetes': 'acheter',
+    'sell': 'vendre', 'sold': 'vendre', 'vente': 'vendre', 'vends': 'vendre', 'vendu': 'vendre', 'vendus': 'vendre',
+    'calls': 'call', 'puts': 'put', 'npv': 'van', 'irr': 'tri',
+    # Comparaisons et sens
+    'inferieure': 'inferieur', 'inferieurs': 'inferieur', 'inferieures': 'inferieur',
+    'under': 'inferieur', 'below': 'inferieur', 'sous': 'inferieur', 'lower': 'inferieur',
+    'superieure': 'superieur', 'superieurs': 'superieur', 'superieures': 'superieur',
+    'over': 'superieur', 'above': 'superieur', 'greater': 'superieur', 'higher': 'superieur',
+    'more': 'plus', 'less': 'moins', 'fewer': 'moins',
+    'hausses': 'hausse', 'haussier': 'hausse', 'haussiere': 'hausse', 'bullish': 'hausse', 'up': 'hausse',
+    'baisses': 'baisse', 'baissier': 'baisse', 'baissiere': 'baisse', 'bearish': 'baisse', 'down': 'baisse',
+    'positive': 'positif', 'positives': 'positif', 'positifs': 'positif',
+    'negative': 'negatif', 'negatives': 'negatif', 'negatifs': 'negatif',
+    'meilleure': 'meilleur', 'meilleures': 'meilleur', 'meilleurs': 'meilleur', 'best': 'meilleur', 'top': 'meilleur',
+    'pires': 'pire', 'worst': 'pire',
+    # Secteurs (anglais)
+    'health': 'healthcare', 'financials': 'financial', 'banks': 'financial', 'banques': 'financial',
+    'materials': 'basicmaterials',
+}
+
+# Secteurs en français (filtre d'actions) ramenés au libellé yfinance
+for _alias, _label in SECTOR_ALIASES.items():
+    if ' ' not in _alias:
+        _SYNONYMS.setdefault(_alias, _label.replace(' ', ''))
+_SECTORS = {label.replace(' ', '') for label in SECTOR_ALIASES.values()}
+
+# Termes qui changent la réponse à eux seuls : ils font partie de la clé exacte
+_KEY_TERMS = {
+    'fifo', 'lifo', 'cmp', 'call', 'put', 'acheter', 'vendre',
+    'rsi', 'macd', 'sma', 'ema', 'bollinger', 'stochastique', 'atr', 'vwap', 'obv',
+    'jours', 'semaines', 'mois', 'ans',
+    'van', 'tri', 'var', 'sharpe', 'beta', 'volatilite', 'correlation',
+    'inferieur', 'superieur', 'plus', 'moins', 'hausse', 'baisse', 'gain', 'perte',
+    'positif', 'negatif', 'meilleur', 'pire',
+} | _SECTORS
+
+_STOPWORDS = {
+    'le', 'la', 'les', 'de', 'des', 'du', 'un', 'une', 'et', 'ou', 'a', 'au', 'aux', 'en', 'pour',
+    'sur', 'mon', 'ma', 'mes', 'est', 'quel', 'quelle', 'quels', 'quelles', 'ce', 'cette', 'il',
+    'je', 'j', 'l', 'd', 'qu', 'que', 'moi', 'me', 'donne', 'donnez', 'dis', 'peux', 'tu', 'vous',
+    'montre', 'affiche', 'stp', 'svp', 'merci', 'hui', 'the', 'of', 'and', 'for', 'is', 'what',
+    'whats', 's', 'my', 'to', 'in', 'show', 'give', 'please', 'tell', 'about',
+}
+
+_WORD_RE = re.compile(r"[a-z&]+")
+
+# Dimension de l'espace des n-grammes hachés
+DIMS = 1 << 16
+
+
+class NormalizedQuery(NamedTuple):
+    symbols: Tuple[str, ...]       # symboles triés
+    amounts: Tuple[tuple, ...]     # (valeur signée, unité) dans l'ordre d'apparition
+    terms: Tuple[str, ...]         # termes discriminants triés (`_KEY_TERMS`)
+    text: str                      # mots restants, normalisés
+
+    @property
+    def key(self) -> tuple:
+        """Clé exacte : seules les requêtes de même clé sont comparées."""
+        return self.symbols, self.amounts, self.terms
+
+
+class CachedAnswer(NamedTuple):
+    agent_used: str
+    result: str
+    age: float                     # secondes depuis la production de la réponse
+    similarity: float
+
+
+class _Entry:
+    __slots__ = ('query', 'vector', 'agent_used', 'result', 'created', 'ttl', 'prices')
+
+    def __init__(self, query, vector, agent_used, result, created, ttl, prices):
+        self.query = query
+        self.vector = vector
+        self.agent_used = agent_used
+        self.result = result
+        self.created = created
+        self.ttl = ttl
+        self.prices = prices
+
+
+def normalize_query(query: str, mentions: Iterable[Tuple[str, str]] = ()) -> NormalizedQuery:
+    """
+    Forme canonique d'une requête.
+
+    Args:
+        query: Requête de l'utilisateur
+        mentions: (symbole, texte reconnu) des entreprises citées (`find_mentions`)
+
+    Returns:
+        Symboles, montants, termes discriminants et texte restant normalisé
+    """
+    symbols = set()
+    text = query
+    for symbol, matched in mentions:
+        symbols.add(symbol.upper())
+        # Le nom et le symbole peuvent figurer tous les deux : "Apple (AAPL)"
+        for form in (matched, symbol):
+            text = re.sub(rf"\$?(?<!\w){re.escape(form.lstrip('$'))}(?!\w)", " ", text, flags=re.I)
+
+    amounts = tuple((amount.value, amount.unit) for amount in parse_amounts(text))
+    text = re.sub(r"\d+", " ", text)
+
+    words = []
+    for word in _WORD_RE.findall(normalize_text(text)):
+        word = _SYNONYMS.get(word, word)
+        if word not in _STOPWORDS and word not in words:
+            words.append(word)
+    terms = tuple(sorted(set(words) & _KEY_TERMS))
+    return NormalizedQuery(tuple(sorted(symbols)), amounts, terms, " ".join(words))
+
+
+def _vector(text: str) -> Dict[int, float]:
+    """Vecteur normé des mots et 3-grammes de caractères (hachés)."""
+    grams = [f"w:{w}" for w in text.split()]
+    padded = f" {text} "
+    grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)] if text else []
+
+    counts: Dict[int, float] = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode()) % DIMS
+        counts[index] = counts.get(index, 0.0) + 1.0
+    norm = sum(v * v for v in counts.values()) ** 0.5
+    return {k: v / norm for k, v in counts.items()} if norm else {}
+
+
+def _similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if not a and not b:
+        return 1.0
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def _price(symbol: str) -> Optional[float]:
+    """Cours actuel (cache partagé des cotations), None s'il est indisponible."""
+    try:
+        info = quote_cache.get_info(symbol, QUOTE_FIELDS)
+    except Exception:
+        return None
+    price = info.get('currentPrice', info.get('regularMarketPrice'))
+    return float(price) if price else None
+
+
+class AnswerCache:
+    """
+    Cache des réponses, indexé par (symboles, montants, termes) puis par similarité du texte.
+
+    Args:
+        min_similarity: Similarité cosinus minimale entre textes normalisés
+        ttl: Fenêtre de fraîcheur des réponses liées au marché (secondes)
+        static_ttl: Fenêtre des réponses indépendantes du marché (secondes)
+        max_price_move: Variation relative d'un cours qui invalide la réponse
+        max_entries: Nombre de réponses conservées (éviction LRU)
+    """
+
+    def __init__(
+        self,
+        min_similarity: float = MIN_SIMILARITY,
+        ttl: float = ANSWER_TTL,
+        static_ttl: float = STATIC_TTL,
+        max_price_move: float = MAX_PRICE_MOVE,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.min_similarity = min_similarity
+        self.ttl = ttl
+        self.static_ttl = static_ttl
+        self.max_price_move = max_price_move
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (symboles, montants, termes) -> entrées candidates ; ordre LRU global à part
+        self._buckets: Dict[tuple, List[_Entry]] = {}
+        self._lru: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _find(self, key: tuple, vector: Dict[int, float]) -> Tuple[Optional[_Entry], float]:
+        best, best_score = None, 0.0
+        for entry in self._buckets.get(key, ()):
+            score = _similarity(vector, entry.vector)
+            if score > best_score:
+                best, best_score = entry, score
+        return best, best_score
+
+    def _remove(self, key: tuple, entry: _Entry):
+        bucket = self._buckets.get(key, [])
+        if entry in bucket:
+            bucket.remove(entry)
+        if not bucket:
+            self._buckets.pop(key, None)
+        self._lru.pop(id(entry), None)
+
+    def _moved(self, entry: _Entry) -> bool:
+        """Vrai si un cours a bougé au-delà du seuil (ou n'est plus disponible)."""
+        for symbol, then in entry.prices.items():
+            now = _price(symbol)
+            if now is None or abs(now - then) > self.max_price_move * abs(then):
+                return True
+        return False
+
+    def lookup(self, query: str, mentions: Iterable[Tuple[str, str]] = ()) -> Optional[CachedAnswer]:
+        """
+        Réponse encore valable pour une requête équivalente, ou None.
+
+        Args:
+            query: Requête de l'utilisateur
+            mentions: (symbole, texte reconnu) des entreprises citées
+
+        Returns:
+            Réponse en cache (agent, texte, âge, similarité) ou None
+        """
+        normalized = normalize_query(query, mentions)
+        key = normalized.key
+        vector = _vector(normalized.text)
+        now = time.time()
+
+        with self._lock:
+            entry, score = self._find(key, vector)
+            if entry is None or score < self.min_similarity:
+                self.misses += 1
+                return None
+            if now - entry.created > entry.ttl:
+                self._remove(key, entry)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+        # Cotations lues hors du verrou (appel réseau possible)
+        if self._moved(entry):
+            with self._lock:
+                self._remove(key, entry)
+                self.invalidations += 1
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if id(entry) in self._lru:
+                self._lru.move_to_end(id(entry))
+        return CachedAnswer(entry.agent_used, entry.result, now - entry.created, score)
+
+    def store(self, query: str, mentions: Iterable[Tuple[str, str]], agent_used: str, result: str):
+        """
+        Enregistre une réponse avec les cours de ses symboles au moment présent.
+
+        Args:
+            query: Requête de l'utilisateur
+            mentions: (symbole, texte reconnu) des entreprises citées
+            agent_used: Agent qui a produit la réponse (nom affiché)
+            result: Réponse
+        """
+        normalized = normalize_query(query, mentions)
+        prices = {}
+        for symbol in normalized.symbols:
+            price = _price(symbol)
+            if price is None:
+                # Impossible de vérifier la fraîcheur plus tard : pas de mise en cache
+                return
+            prices[symbol] = price
+
+        static = not normalized.symbols and agent_used in STATIC_AGENTS
+        key = normalized.key
+        vector = _vector(normalized.text)
+        entry = _Entry(
+            normalized.text, vector, agent_used, result, time.time(),
+            self.static_ttl if static else self.ttl, prices,
+        )
+
+        with self._lock:
+            # Une entrée équivalente est remplacée
+            previous, score = self._find(key, vector)
+            if previous is not None and score >= self.min_similarity:
+                self._remove(key, previous)
+            self._buckets.setdefault(key, []).append(entry)
+            self._lru[id(entry)] = (key, entry)
+            while len(self._lru) > self.max_entries:
+                _, (old_key, old_entry) = self._lru.popitem(last=False)
+                self._remove(old_key, old_entry)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._buckets.clear()
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        """Compteurs du cache (hits, misses, invalidations, taille)."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'invalidations': self.invalidations,
+                'size': len(self._lru),
+            }
+
+
+# Instance partagée par les agents
+answer_cache = AnswerCache()
@@ -0,0 +1,48 @@
+"""
+Variantes asynchrones des tools.
+
+Un tool LangChain exposant une coroutine est exécuté par `ainvoke` sans
+thread intermédiaire : plusieurs appels de tools d'un même tour LLM
+s'exécutent alors en parallèle sur la boucle d'événements. Les tools dont
+la source de données est bloquante (yfinance, calculs NumPy) sont déportés
+sur un pool de threads borné partagé par le processus.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain_core.tools import BaseTool
+
+
+MAX_WORKERS = 16
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="tool-io")
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Exécute une fonction bloquante sur le pool partagé sans bloquer la boucle."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(fn, *args, **kwargs))
+
+
+def add_async(tool: BaseTool, coroutine: Optional[Callable[..., Awaitable[str]]] = None) -> BaseTool:
+    """
+    Ajoute une implémentation asynchrone à un tool synchrone.
+
+    Args:
+        tool: Tool créé avec `@tool`
+        coroutine: Implémentation native ; à défaut, la fonction synchrone
+            du tool est exécutée sur le pool partagé
+
+    Returns:
+        Le même tool, utilisable avec `ainvoke`
+    """
+    if coroutine is None:
+        func = tool.func
+
+        async def coroutine(**kwargs):
+            return await run_blocking(func, **kwargs)
+
+    tool.coroutine = coroutine
+    return tool
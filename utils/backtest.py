@@ -0,0 +1,157 @@
+"""
+Backtests vectorisés de stratégies simples.
+
+Une stratégie produit une matrice de poids cibles (dates × titres) et un
+masque des dates de rééquilibrage. Entre deux rééquilibrages, les positions
+dérivent avec les prix ; à chaque rééquilibrage, les frais sont prélevés
+sur le volume échangé. Tout le calcul se fait par indexation de tableaux,
+sans boucle sur les dates : un backtest quotidien de 10 ans sur 100 titres
+prend quelques millisecondes.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from utils.indicators import sma
+
+
+TRADING_DAYS = 252
+
+STRATEGIES = ("ma_crossover", "momentum", "rebalance")
+
+
+def _eligible(closes: np.ndarray) -> np.ndarray:
+    """Titres ayant déjà un prix à chaque date."""
+    return ~np.isnan(closes)
+
+
+def _equal_weights(mask: np.ndarray) -> np.ndarray:
+    """Répartit le capital à parts égales entre les titres sélectionnés à chaque date."""
+    counts = mask.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mask, 1.0 / counts, 0.0)
+
+
+def ma_crossover(closes: np.ndarray, fast: int = 50, slow: int = 200) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Chaque titre dispose d'une poche de 1/N du capital : investie quand la
+    moyenne rapide est au-dessus de la lente, en cash sinon.
+    """
+    if fast >= slow:
+        raise ValueError("La moyenne rapide doit être plus courte que la lente")
+    n_symbols = closes.shape[1]
+    signal = (sma(closes, fast) > sma(closes, slow)) & _eligible(closes)
+    target = signal / n_symbols
+    # Rééquilibrage uniquement quand un signal change
+    rebalance = np.zeros(len(closes), dtype=bool)
+    rebalance[1:] = (signal[1:] != signal[:-1]).any(axis=1)
+    rebalance[0] = signal[0].any()
+    return target, rebalance
+
+
+def momentum(closes: np.ndarray, lookback: int = 126, top_n: int = 3, rebalance_days: int = 21) -> Tuple[np.ndarray, np.ndarray]:
+    """Détient à parts égales les `top_n` titres ayant le meilleur rendement sur `lookback` jours."""
+    past = np.full(closes.shape, np.nan)
+    past[lookback:] = closes[:-lookback]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trailing = closes / past - 1
+    trailing = np.where(np.isnan(trailing), -np.inf, trailing)
+
+    # Rang de chaque titre à chaque date (0 = meilleur)
+    ranks = np.argsort(np.argsort(-trailing, axis=1), axis=1)
+    selected = (ranks < top_n) & np.isfinite(trailing)
+    target = _equal_weights(selected)
+
+    rebalance = np.zeros(len(closes), dtype=bool)
+    rebalance[lookback::rebalance_days] = True
+    return target, rebalance
+
+
+def periodic_rebalance(closes: np.ndarray, weights: Optional[np.ndarray] = None, rebalance_days: int = 21) -> Tuple[np.ndarray, np.ndarray]:
+    """Ramène le portefeuille à des poids fixes (égaux par défaut) tous les `rebalance_days` jours."""
+    eligible = _eligible(closes)
+    if weights is None:
+        target = _equal_weights(eligible)
+    else:
+        target = np.where(eligible, weights, 0.0)
+    rebalance = np.zeros(len(closes), dtype=bool)
+    rebalance[::rebalance_days] = True
+    return target, rebalance
+
+
+def run_backtest(closes: np.ndarray, target: np.ndarray, rebalance: np.ndarray, cost_bps: float = 10.0) -> dict:
+    """
+    Simule un portefeuille à partir de poids cibles fixés à la clôture des dates de rééquilibrage.
+
+    Args:
+        closes: Prix de clôture (dates × titres), NaN avant la cotation
+        target: Poids cibles (dates × titres) ; la part non investie reste en cash
+        rebalance: Dates (booléen) où le portefeuille est ramené aux poids cibles
+        cost_bps: Frais de transaction en points de base du volume échangé
+
+    Returns:
+        Courbe de capital (base 1), rendements quotidiens nets, rotation et frais
+    """
+    n_dates = len(closes)
+    filled = np.nan_to_num(closes, nan=0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(filled[:-1] > 0, filled[1:] / filled[:-1] - 1, 0.0)
+    returns = np.nan_to_num(returns)
+    growth = np.vstack([np.ones((1, closes.shape[1])), np.cumprod(1 + returns, axis=0)])
+
+    rebalance_rows = np.flatnonzero(rebalance)
+    target = np.nan_to_num(target)
+
+    # Dernier rééquilibrage strictement antérieur à chaque date
+    days = np.arange(1, n_dates)
+    segment = np.searchsorted(rebalance_rows, days, side='left') - 1
+    invested = segment >= 0
+    start_rows = rebalance_rows[np.maximum(segment, 0)]
+    weights = np.where(invested[:, None], target[start_rows], 0.0)
+    cash = 1 - weights.sum(axis=1)
+    base = growth[start_rows]
+
+    value_now = (weights * growth[days] / base).sum(axis=1) + cash
+    value_before = (weights * growth[days - 1] / base).sum(axis=1) + cash
+    daily = value_now / value_before - 1
+
+    # Rotation à chaque rééquilibrage : écart entre poids cibles et poids dérivés
+    drifted = np.zeros((len(rebalance_rows), closes.shape[1]))
+    previous = np.arange(len(rebalance_rows)) - 1
+    has_previous = previous >= 0
+    if has_previous.any():
+        prev_rows = rebalance_rows[previous[has_previous]]
+        current_rows = rebalance_rows[has_previous]
+        held = target[prev_rows] * growth[current_rows] / growth[prev_rows]
+        total = held.sum(axis=1, keepdims=True) + (1 - target[prev_rows].sum(axis=1, keepdims=True))
+        drifted[has_previous] = held / total
+    turnover = np.abs(target[rebalance_rows] - drifted).sum(axis=1)
+    costs = np.zeros(n_dates)
+    costs[rebalance_rows] = turnover * cost_bps / 10_000
+
+    net = (1 + daily) * (1 - costs[1:]) - 1
+    equity = (1 - costs[0]) * np.concatenate([[1.0], np.cumprod(1 + net)])
+
+    return {
+        'equity': equity,
+        'returns': net,
+        'turnover': float(turnover.sum()),
+        'rebalances': int(len(rebalance_rows)),
+        'costs': float(costs.sum()),
+    }
+
+
+def summarize(equity: np.ndarray, returns: np.ndarray) -> dict:
+    """Statistiques de synthèse d'une courbe de capital quotidienne."""
+    # La courbe démarre à 1 (capital initial, avant frais)
+    years = len(returns) / TRADING_DAYS
+    total_return = equity[-1] - 1
+    volatility = returns.std(ddof=1) * np.sqrt(TRADING_DAYS) if len(returns) > 1 else np.nan
+    peaks = np.maximum.accumulate(equity)
+    return {
+        'total_return': total_return,
+        'cagr': equity[-1] ** (1 / years) - 1 if years > 0 and equity[-1] > 0 else np.nan,
+        'volatility': volatility,
+        'sharpe': returns.mean() * TRADING_DAYS / volatility if volatility and volatility > 0 else np.nan,
+        'max_drawdown': -(equity / peaks - 1).min(),
+    }
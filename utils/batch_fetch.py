@@ -0,0 +1,210 @@
+"""
+Récupération groupée des cotations et historiques pour plusieurs symboles.
+
+Les symboles sont récupérés en parallèle via un pool de threads borné
+partagé par le processus, à travers le cache des cotations et le stockage
+des historiques : seuls les symboles absents ou expirés déclenchent un
+appel réseau.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.market_cache import quote_cache, QUOTE_FIELDS, FUNDAMENTAL_FIELDS
+from utils.market_data import MarketDataProvider
+from utils.history_store import history_store
+from utils.symbols import resolve_symbol
+
+
+MAX_WORKERS = 8
+
+# Préchargement spéculatif : période d'historique chargée (couvre les périodes
+# plus courtes) et nombre maximal de symboles par requête
+PREFETCH_PERIOD = "1y"
+MAX_PREFETCH = 8
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="market-fetch")
+
+QUOTE_COLUMNS = ['price', 'previous_close', 'change_pct', 'market_cap', 'pe_ratio', 'error']
+
+
+def parse_symbols(symbols: str) -> List[str]:
+    """
+    Découpe une liste de symboles séparés par des virgules (sans doublons).
+    Les noms d'entreprises ("Apple, Microsoft") sont convertis en symboles.
+    """
+    seen = []
+    for symbol in symbols.split(','):
+        symbol = resolve_symbol(symbol) if symbol.strip() else ""
+        if symbol and symbol not in seen:
+            seen.append(symbol)
+    return seen
+
+
+def _fetch_one(symbol: str) -> dict:
+    """Récupère les infos d'un symbole et les ramène aux colonnes du tableau."""
+    try:
+        info = quote_cache.get_info(symbol, QUOTE_FIELDS + FUNDAMENTAL_FIELDS)
+    except Exception as e:
+        return {'error': str(e)}
+
+    price = info.get('currentPrice', info.get('regularMarketPrice')) or 0
+    previous = info.get('previousClose', price)
+    return {
+        'price': price,
+        'previous_close': previous,
+        'change_pct': ((price - previous) / previous * 100) if previous else 0,
+        'market_cap': info.get('marketCap') or 0,
+        'pe_ratio': info.get('trailingPE'),
+        'error': None,
+    }
+
+
+def fetch_quotes(symbols: Iterable[str]) -> pd.DataFrame:
+    """
+    Récupère les cotations de plusieurs symboles en une seule passe.
+
+    Args:
+        symbols: Symboles à récupérer
+
+    Returns:
+        DataFrame indexé par symbole (colonnes : price, previous_close,
+        change_pct, market_cap, pe_ratio, error), dans l'ordre demandé
+    """
+    symbols = [s.strip().upper() for s in symbols]
+    rows = dict(zip(symbols, _executor.map(_fetch_one, symbols)))
+
+    frame = pd.DataFrame.from_dict(rows, orient='index', columns=QUOTE_COLUMNS)
+    frame.index.name = 'symbol'
+    return frame.reindex(symbols)
+
+
+def _quietly(load, *args):
+    """Exécute un préchargement en ignorant ses erreurs (le tool les signalera)."""
+    try:
+        load(*args)
+    except Exception:
+        pass
+
+
+def prefetch(symbols: Iterable[str], period: str = PREFETCH_PERIOD) -> List[Future]:
+    """
+    Réchauffe en arrière-plan les caches de cotations et d'historiques.
+
+    Les appels ne sont pas attendus : un tool qui demande ensuite le même
+    symbole attend la fin du chargement en cours ou lit le cache.
+
+    Args:
+        symbols: Symboles probablement demandés par la suite
+        period: Période d'historique à charger
+
+    Returns:
+        Futures des préchargements (cotation et historique de chaque symbole)
+    """
+    symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    futures = []
+    for symbol in symbols[:MAX_PREFETCH]:
+        futures.append(_executor.submit(
+            _quietly, quote_cache.get_info, symbol, QUOTE_FIELDS + FUNDAMENTAL_FIELDS
+        ))
+        futures.append(_executor.submit(_quietly, history_store.get_bars, symbol, period))
+    return futures
+
+
+def fetch_infos(
+    symbols: Iterable[str],
+    fields: Sequence[str],
+    provider: Optional[MarketDataProvider] = None,
+) -> Tuple[Dict[str, dict], Dict[str, str]]:
+    """
+    Récupère les dictionnaires `.info` de plusieurs symboles en parallèle.
+
+    Args:
+        symbols: Symboles à récupérer
+        fields: Champs dont la fraîcheur est requise (voir `QuoteCache.get_info`)
+        provider: Fournisseur interrogé directement, sans passer par le cache
+            des cotations (passes sur tout un univers, qui en évinceraient les
+            titres consultés) ; None : cache partagé
+
+    Returns:
+        (symbole -> info, symbole -> erreur)
+    """
+    def fetch(symbol):
+        try:
+            if provider is not None:
+                return provider.get_info(symbol), None
+            return quote_cache.get_info(symbol, fields), None
+        except Exception as e:
+            return None, str(e)
+
+    symbols = [s.strip().upper() for s in symbols]
+    infos, errors = {}, {}
+    for symbol, (info, error) in zip(symbols, _executor.map(fetch, symbols)):
+        if error is None:
+            infos[symbol] = info
+        else:
+            errors[symbol] = error
+    return infos, errors
+
+
+class Panel(NamedTuple):
+    """Historiques alignés sur un calendrier commun (une colonne par symbole)."""
+
+    dates: np.ndarray                # datetime64[ns], trié
+    symbols: List[str]
+    fields: Dict[str, np.ndarray]    # champ -> tableau (dates × symboles), NaN si absent
+    errors: Dict[str, str]           # symbole -> erreur de récupération
+
+
+def _fetch_bars(symbol: str, period: str):
+    try:
+        return history_store.get_bars(symbol, period), None
+    except Exception as e:
+        return None, str(e)
+
+
+def fetch_panel(
+    symbols: Iterable[str],
+    period: str = "1y",
+    fields: Sequence[str] = ('close',),
+) -> Panel:
+    """
+    Récupère les historiques de plusieurs symboles et les aligne par date.
+
+    Args:
+        symbols: Symboles à récupérer
+        period: Période yfinance (1mo, 6mo, 1y, 5y, max...)
+        fields: Champs OHLCV à aligner (open, high, low, close, volume)
+
+    Returns:
+        Panel dont chaque champ est un tableau (dates × symboles) ; les
+        symboles en erreur ou sans données sont exclus et listés dans `errors`
+    """
+    symbols = [s.strip().upper() for s in symbols]
+    results = _executor.map(lambda symbol: _fetch_bars(symbol, period), symbols)
+
+    kept, series, errors = [], [], {}
+    for symbol, (bars, error) in zip(symbols, results):
+        if error is not None:
+            errors[symbol] = error
+        elif len(bars) == 0:
+            errors[symbol] = "Aucune donnée disponible"
+        else:
+            kept.append(symbol)
+            series.append(bars)
+
+    if not series:
+        empty = np.empty((0, 0))
+        return Panel(np.empty(0, dtype='datetime64[ns]'), [], {f: empty for f in fields}, errors)
+
+    # Calendrier commun : union des dates, puis placement de chaque série
+    dates = np.unique(np.concatenate([np.asarray(bars['ts']) for bars in series]))
+    aligned = {field: np.full((len(dates), len(kept)), np.nan) for field in fields}
+    for column, bars in enumerate(series):
+        rows = np.searchsorted(dates, bars['ts'])
+        for field in fields:
+            aligned[field][rows, column] = bars[field]
+
+    return Panel(dates.astype('datetime64[ns]'), kept, aligned, errors)
@@ -2,6 +2,26 @@
 Tools de calcul financier avancé.
 """
 from langchain_core.tools import tool
+import numpy as np
+import pandas as pd
+
+from utils.risk_engine import parse_holdings, returns_matrix, portfolio_risk, TRADING_DAYS
+from utils.monte_carlo import simulate
+from utils.ledger import parse_ledger, make_ledger, parse_numbers, missing_prices, position_metrics
+from utils.cost_basis import build_book
+from utils.batch_fetch import fetch_quotes
+from utils.market_cache import get_ticker_info, QUOTE_FIELDS
+from utils.symbols import resolve_symbol
+from utils import tvm, options
+
+
+MAX_PATHS = 1_000_000
+
+# Lignes détaillées au-delà desquelles le tableau des positions est tronqué
+MAX_ROWS = 40
+
+# Prix d'exercice par défaut, en proportion du cours du sous-jacent
+DEFAULT_MONEYNESS = np.array([0.8, 0.9, 0.95, 1.0, 1.05, 1.1, 1.2])
 
 
 @tool
@@ -41,9 +61,667 @@ def calculate_percent_change(old_value: float, new_value: float) -> str:
         return f"❌ Erreur: {str(e)}"
 
 
+def _positions_table(title: str, frame: pd.DataFrame, metrics: dict) -> str:
+    """Tableau compact des positions suivi des totaux."""
+    lines = [
+        title,
+        "━"*74,
+        f"{'Position':<12}{'Coût':>13}{'Valeur':>13}{'+/- value':>13}{'ROI':>10}{'Poids':>9}",
+    ]
+    rows = np.flatnonzero(metrics['valid'])
+    for row in rows[:MAX_ROWS]:
+        label = frame['symbol'][row] or f"#{row + 1}"
+        roi = metrics['roi'][row]
+        lines.append(
+            f"{label[:11]:<12}{metrics['cost'][row]:>13,.2f}{metrics['value'][row]:>13,.2f}"
+            f"{metrics['pnl'][row]:>+13,.2f}{'N/A' if np.isnan(roi) else f'{roi*100:+.2f}%':>10}"
+            f"{metrics['weight'][row]*100:>8.1f}%"
+        )
+    if len(rows) > MAX_ROWS:
+        lines.append(f"… {len(rows) - MAX_ROWS} autres positions")
+    
+    emoji = "📈" if metrics['total_pnl'] >= 0 else "📉"
+    lines += [
+        "━"*74,
+        f"💼 Total investi: ${metrics['total_cost']:,.2f} | Valeur: ${metrics['total_value']:,.2f}",
+        f"{emoji} Résultat: ${metrics['total_pnl']:+,.2f} ({metrics['total_roi']*100:+.2f}%)",
+    ]
+    gainers = (metrics['pnl'][rows] > 0).sum()
+    lines.append(f"🟢 {gainers} position(s) en gain | 🔴 {len(rows) - gainers} en perte")
+    
+    incomplete = np.flatnonzero(~metrics['valid'])
+    if len(incomplete):
+        labels = [frame['symbol'][row] or f"#{row + 1}" for row in incomplete]
+        lines.append(f"⚠️ Ignorées (coût ou valeur manquant): {', '.join(labels)}")
+    return "\n".join(lines)
+
+
+@tool
+def calculate_portfolio_pnl(
+    positions: str = "",
+    symbols: str = "",
+    quantities: str = "",
+    buy_prices: str = "",
+    current_prices: str = ""
+) -> str:
+    """
+    Calcule en une fois les plus/moins-values, le ROI et le poids de toutes les positions d'un portefeuille.
+    
+    Args:
+        positions: Relevé CSV (avec en-tête) ou JSON, ex:
+            "symbol,quantity,buy_price,current_price\nAAPL,10,150,190\nMSFT,5,300,410"
+            Colonnes reconnues : symbol, quantity, buy_price, current_price, cost, value
+        symbols: Alternative au relevé : symboles séparés par des virgules
+        quantities: Quantités séparées par des virgules (même ordre que symbols)
+        buy_prices: Prix d'achat séparés par des virgules
+        current_prices: Prix actuels séparés par des virgules (optionnel : cours du marché si absent)
+    
+    Returns:
+        Tableau par position (coût, valeur, +/- value, ROI, poids) et totaux du portefeuille
+    """
+    try:
+        if positions.strip():
+            frame = parse_ledger(positions)
+        else:
+            columns = {
+                'symbol': [s.strip().upper() for s in symbols.split(',') if s.strip()],
+                'quantity': parse_numbers(quantities),
+                'buy_price': parse_numbers(buy_prices),
+            }
+            if current_prices.strip():
+                columns['current_price'] = parse_numbers(current_prices)
+            lengths = {name: len(values) for name, values in columns.items()}
+            if len(set(lengths.values())) != 1:
+                return f"❌ Erreur: listes de longueurs différentes ({lengths})"
+            frame = make_ledger(columns)
+        
+        # Prix actuels manquants : cours du marché, en une requête groupée
+        missing = missing_prices(frame)
+        if missing:
+            quotes = fetch_quotes(missing)
+            prices = quotes['price'].where(quotes['error'].isna() & (quotes['price'] > 0))
+            fill = frame['current_price'].isna() & frame['value'].isna()
+            frame.loc[fill, 'current_price'] = frame.loc[fill, 'symbol'].map(prices)
+        
+        metrics = position_metrics(frame)
+        return _positions_table(
+            f"💼 PORTEFEUILLE - {int(metrics['valid'].sum())} positions", frame, metrics
+        )
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def calculate_batch_roi(initial_investments: str, final_values: str, labels: str = "") -> str:
+    """
+    Calcule le ROI de plusieurs investissements en un seul appel.
+    
+    Args:
+        initial_investments: Montants investis séparés par des virgules (ex: "10000,5000,2500")
+        final_values: Valeurs finales séparées par des virgules, même ordre (ex: "15000,4200,3100")
+        labels: Noms optionnels des investissements, séparés par des virgules
+    
+    Returns:
+        ROI et gain/perte de chaque investissement, poids et ROI global
+    """
+    try:
+        costs, values = parse_numbers(initial_investments), parse_numbers(final_values)
+        if len(costs) != len(values):
+            return f"❌ Erreur: {len(costs)} montants investis pour {len(values)} valeurs finales"
+        names = [l.strip() for l in labels.split(',')] if labels.strip() else []
+        names = (names + [""] * len(costs))[:len(costs)]
+        
+        frame = make_ledger({'symbol': names, 'cost': costs, 'value': values})
+        metrics = position_metrics(frame)
+        return _positions_table(f"📊 ROI GROUPÉ - {len(costs)} investissements", frame, metrics)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def analyze_portfolio_risk(
+    holdings: str,
+    weights: str = "",
+    period: str = "1y",
+    confidence: float = 0.95,
+    risk_free_rate: float = 0.0
+) -> str:
+    """
+    Analyse le risque d'un portefeuille : volatilité, VaR/CVaR, Sharpe, Sortino, drawdown max.
+    
+    Args:
+        holdings: Titres séparés par des virgules, avec poids optionnels (ex: "AAPL:0.5,MSFT:0.3,NVDA:0.2")
+        weights: Poids séparés par des virgules si non donnés dans holdings (par défaut : poids égaux)
+        period: Historique utilisé (6mo, 1y, 2y, 5y)
+        confidence: Niveau de confiance de la VaR (ex: 0.95 ou 0.99)
+        risk_free_rate: Taux sans risque annuel (ex: 0.04 pour 4%)
+    
+    Returns:
+        Métriques de risque du portefeuille et principaux contributeurs au risque
+    """
+    try:
+        symbols, target_weights = parse_holdings(holdings, weights)
+        returns, kept, errors = returns_matrix(symbols, period)
+        if not kept:
+            return "❌ Erreur: aucun historique disponible pour ce portefeuille"
+        
+        # Les titres sans historique sont exclus et les poids renormalisés
+        kept_weights = target_weights[[symbols.index(symbol) for symbol in kept]]
+        kept_weights = kept_weights / kept_weights.sum()
+        risk = portfolio_risk(returns, kept_weights, confidence, risk_free_rate)
+        
+        level = f"{confidence*100:g}%"
+        lines = [
+            f"📊 RISQUE DU PORTEFEUILLE ({len(kept)} titres, {risk['observations']} jours)",
+            "━"*50,
+            f"📈 Rendement annualisé: {risk['annual_return']*100:+.2f}%",
+            f"📊 Volatilité annualisée: {risk['annual_volatility']*100:.2f}%",
+            f"⚖️ Sharpe: {risk['sharpe']:.2f} | Sortino: {risk['sortino']:.2f}",
+            f"📉 Drawdown max: {risk['max_drawdown']*100:.2f}%",
+            "━"*50,
+            f"🔻 VaR {level} (1 jour) historique: {risk['var_historical']*100:.2f}% | "
+            f"paramétrique: {risk['var_parametric']*100:.2f}%",
+            f"🔻 CVaR {level} (1 jour) historique: {risk['cvar_historical']*100:.2f}% | "
+            f"paramétrique: {risk['cvar_parametric']*100:.2f}%",
+        ]
+        
+        contributions = risk['risk_contributions']
+        total = contributions.sum()
+        if len(kept) > 1 and total > 0:
+            lines += ["━"*50, "🎯 Principaux contributeurs au risque:"]
+            for i in contributions.argsort()[::-1][:5]:
+                lines.append(
+                    f"  • {kept[i]}: poids {kept_weights[i]*100:.1f}% | "
+                    f"risque {contributions[i]/total*100:.1f}%"
+                )
+        
+        if errors:
+            lines.append(f"⚠️ Exclus (pas de données): {', '.join(errors)}")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def simulate_portfolio_value(
+    initial_value: float,
+    years: float = 5,
+    holdings: str = "",
+    expected_return: float = 0.07,
+    volatility: float = 0.18,
+    method: str = "gbm",
+    n_paths: int = 100000,
+    seed: int = 42,
+    period: str = "5y"
+) -> str:
+    """
+    Projette la valeur future d'un investissement par simulation Monte Carlo.
+    
+    Args:
+        initial_value: Montant investi (ex: 10000)
+        years: Horizon en années
+        holdings: Titres optionnels avec poids (ex: "AAPL:0.6,MSFT:0.4") ; si fourni,
+            rendement et volatilité sont estimés sur l'historique
+        expected_return: Rendement annuel espéré si aucun titre n'est fourni (ex: 0.07)
+        volatility: Volatilité annuelle si aucun titre n'est fourni (ex: 0.18)
+        method: "gbm" (mouvement brownien géométrique) ou "bootstrap" (rendements historiques, nécessite holdings)
+        n_paths: Nombre de trajectoires simulées
+        seed: Graine aléatoire (même graine = même résultat)
+        period: Historique utilisé pour l'estimation (1y, 2y, 5y, 10y)
+    
+    Returns:
+        Bandes de percentiles de la valeur du portefeuille, année par année
+    """
+    try:
+        n_paths = int(min(max(n_paths, 1000), MAX_PATHS))
+        method = method.strip().lower()
+        source = f"hypothèses: {expected_return*100:.1f}%/an, volatilité {volatility*100:.1f}%"
+        sample = None
+        
+        if holdings.strip():
+            symbols, weights = parse_holdings(holdings)
+            returns, kept, errors = returns_matrix(symbols, period)
+            if len(kept) != len(symbols):
+                return f"❌ Erreur: pas d'historique pour {', '.join(errors) or ', '.join(symbols)}"
+            sample = returns @ weights
+            if len(sample) < 2:
+                return "❌ Erreur: historique commun insuffisant"
+            expected_return = sample.mean() * TRADING_DAYS
+            volatility = sample.std(ddof=1) * TRADING_DAYS ** 0.5
+            source = (f"historique {period} de {', '.join(kept)}: "
+                      f"{expected_return*100:.1f}%/an, volatilité {volatility*100:.1f}%")
+        
+        result = simulate(
+            initial_value, years, n_paths, method,
+            drift=expected_return, volatility=volatility,
+            returns_sample=sample, seed=seed
+        )
+        
+        bands = result['percentiles']
+        lines = [
+            f"🎲 SIMULATION MONTE CARLO ({result['n_paths']:,} trajectoires, {method.upper()})",
+            f"💼 Départ: ${initial_value:,.2f} | {source}",
+            "━"*50,
+            "Année | " + " | ".join(f"{h:>10}" for h in ("P5", "P25", "Médiane", "P75", "P95")),
+        ]
+        for i, year in enumerate(result['years']):
+            lines.append(
+                f"{year:>5.1f} | " + " | ".join(f"${bands[p][i]:>9,.0f}" for p in (5, 25, 50, 75, 95))
+            )
+        lines += [
+            "━"*50,
+            f"📊 Valeur moyenne finale: ${result['mean'][-1]:,.2f}",
+            f"📉 Probabilité de perte à {years:g} ans: {result['prob_loss']*100:.1f}%",
+            f"🔁 Graine: {seed} (résultat reproductible)",
+        ]
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def calculate_cost_basis(transactions: str, method: str = "fifo", current_prices: str = "") -> str:
+    """
+    Calcule prix de revient, plus-values réalisées et latentes d'un historique de transactions (achats et ventes).
+    
+    Args:
+        transactions: Nom d'un fichier du dossier des relevés ou relevé CSV/JSON, dans l'ordre chronologique, ex:
+            "date,symbol,side,quantity,price,fees\n2024-01-05,AAPL,buy,10,150,1\n2024-06-03,AAPL,sell,4,190,1"
+            Colonnes : symbol, quantity, price, side (buy/sell, achat/vente ; sinon quantité négative = vente),
+            fees et date optionnels
+        method: Méthode d'affectation des lots : "fifo", "lifo" ou "average" (coût moyen pondéré)
+        current_prices: Cours actuels optionnels (ex: "AAPL:190,MSFT:410") ; sinon cours du marché
+    
+    Returns:
+        Par titre : quantité détenue, prix de revient, plus-values latentes et réalisées ; totaux
+    """
+    try:
+        book = build_book(transactions, method)
+        prices = {}
+        for item in current_prices.split(','):
+            if ':' in item:
+                symbol, price = item.split(':', 1)
+                prices[symbol.strip().upper()] = float(price)
+
+        # Cours du marché pour les positions ouvertes sans cours fourni, en une requête groupée
+        held = book.positions()
+        missing = [s for s in held.index[held['quantity'] > 0] if s not in prices]
+        if missing:
+            quotes = fetch_quotes(missing)
+            quotes = quotes[quotes['error'].isna() & (quotes['price'] > 0)]
+            prices.update(quotes['price'].to_dict())
+        positions = book.positions(prices)
+
+        open_positions = positions[positions['quantity'] > 0]
+        lines = [
+            f"🧾 PRIX DE REVIENT ({book.method.upper()}) - {book.trades:,} transactions, {len(positions)} titres",
+            "━"*74,
+            f"{'Titre':<10}{'Quantité':>11}{'PRU':>11}{'Cours':>11}{'Latente':>15}{'Réalisée':>15}",
+        ]
+        order = positions.assign(total=positions['unrealized'].abs() + positions['realized'].abs())
+        for symbol, row in order.sort_values('total', ascending=False).head(MAX_ROWS).iterrows():
+            avg = "-" if np.isnan(row['avg_cost']) else f"{row['avg_cost']:,.2f}"
+            price = "-" if row['quantity'] == 0 else f"{row['price']:,.2f}" + ("" if row['marked'] else "*")
+            lines.append(
+                f"{symbol[:9]:<10}{row['quantity']:>11,.2f}{avg:>11}{price:>11}"
+                f"{row['unrealized']:>+15,.2f}{row['realized']:>+15,.2f}"
+            )
+        if len(positions) > MAX_ROWS:
+            lines.append(f"… {len(positions) - MAX_ROWS} autres titres")
+
+        unrealized, realized = positions['unrealized'].sum(), positions['realized'].sum()
+        lines += [
+            "━"*74,
+            f"💼 Positions ouvertes: {len(open_positions)} | Prix de revient: ${open_positions['cost_basis'].sum():,.2f} "
+            f"| Valeur: ${open_positions['market_value'].sum():,.2f}",
+            f"{'📈' if unrealized >= 0 else '📉'} Plus-value latente: ${unrealized:+,.2f}",
+            f"{'📈' if realized >= 0 else '📉'} Plus-value réalisée: ${realized:+,.2f}",
+            f"💰 Résultat total: ${unrealized + realized:+,.2f}",
+        ]
+        if not open_positions['marked'].all():
+            lines.append("ℹ️ * cours indisponible : dernier prix de transaction")
+        oversold = positions.index[positions['oversold'] > 0]
+        if len(oversold):
+            lines.append(f"⚠️ Ventes supérieures à la position (excédent ignoré): {', '.join(oversold)}")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+def _percent(value: float) -> str:
+    return "N/A" if np.isnan(value) else f"{value*100:+.2f}%"
+
+
+@tool
+def calculate_npv_irr(cashflows: str, discount_rates: str = "0.08", dates: str = "") -> str:
+    """
+    Calcule la VAN et le TRI d'un ou plusieurs projets (scénarios) en un seul appel.
+    
+    Args:
+        cashflows: Flux séparés par des virgules, le premier à la date 0 (ex: "-1000,300,400,500") ;
+            plusieurs scénarios séparés par "|" (ex: "-1000,300,400,500 | -1000,200,200,900")
+        discount_rates: Taux d'actualisation par période séparés par des virgules (ex: "0.06,0.08,0.10")
+        dates: Dates des flux (AAAA-MM-JJ, séparées par des virgules) pour des flux irréguliers :
+            le TRI annuel (XIRR) est alors calculé
+    
+    Returns:
+        TRI de chaque scénario et VAN pour chaque taux d'actualisation
+    """
+    try:
+        scenarios = [parse_numbers(s) for s in cashflows.split('|') if s.strip()]
+        if not scenarios:
+            return "❌ Erreur: aucun flux fourni"
+        # Scénarios de longueurs différentes : complétés par des flux nuls
+        flows = np.zeros((len(scenarios), max(len(s) for s in scenarios)))
+        for i, scenario in enumerate(scenarios):
+            flows[i, :len(scenario)] = scenario
+        rates = parse_numbers(discount_rates)
+
+        times = None
+        label = "TRI"
+        if dates.strip():
+            days = pd.to_datetime([d.strip() for d in dates.split(',') if d.strip()])
+            if len(days) != flows.shape[1]:
+                return f"❌ Erreur: {len(days)} dates pour {flows.shape[1]} flux"
+            times = tvm.year_fractions(days)
+            label = "XIRR"
+
+        # Tous les scénarios sont résolus ensemble
+        rates_of_return = tvm.irr(flows, times)
+        values = tvm.npv(rates, flows, times)
+
+        lines = [
+            f"💰 VAN / {label} - {len(flows)} scénario(s)",
+            "━"*50,
+            f"{'Scénario':<10}{label:>10}" + "".join(f"{'VAN ' + f'{r*100:g}%':>14}" for r in rates),
+        ]
+        for i in range(len(flows)):
+            lines.append(
+                f"{'#' + str(i + 1):<10}{_percent(rates_of_return[i]):>10}"
+                + "".join(f"{v:>14,.2f}" for v in values[i])
+            )
+        lines.append("━"*50)
+        if np.isnan(rates_of_return).any():
+            lines.append("⚠️ N/A : la VAN ne change pas de signe (pas de TRI)")
+        best = int(np.nanargmax(values[:, 0]))
+        lines.append(f"🏆 Meilleure VAN à {rates[0]*100:g}%: scénario #{best + 1} ({values[best, 0]:+,.2f})")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def calculate_loan_amortization(
+    principal: float,
+    annual_rates: str,
+    years: float,
+    periods_per_year: int = 12
+) -> str:
+    """
+    Calcule l'échéance et le tableau d'amortissement d'un prêt à échéances constantes.
+    
+    Args:
+        principal: Capital emprunté (ex: 200000)
+        annual_rates: Taux annuel (ex: "0.035") ou plusieurs taux à comparer (ex: "0.03,0.035,0.04") ;
+            le tableau d'amortissement est détaillé pour le premier taux
+        years: Durée du prêt en années
+        periods_per_year: Nombre d'échéances par an (12 = mensuel)
+    
+    Returns:
+        Échéance, coût total du crédit et tableau d'amortissement annuel
+    """
+    try:
+        rates = parse_numbers(annual_rates)
+        periods = int(round(years * periods_per_year))
+        if periods <= 0 or principal <= 0:
+            return "❌ Erreur: capital et durée doivent être positifs"
+
+        payments = tvm.payment(principal, rates / periods_per_year, periods)
+        schedule = tvm.amortization(principal, rates[0] / periods_per_year, periods)
+
+        lines = [
+            f"🏦 PRÊT DE ${principal:,.2f} SUR {years:g} ANS ({periods} échéances)",
+            "━"*50,
+        ]
+        for rate, pmt in zip(rates, payments):
+            interest = pmt * periods - principal
+            lines.append(f"📌 Taux {rate*100:.2f}%: échéance ${pmt:,.2f} | intérêts totaux ${interest:,.2f}")
+
+        # Cumul par année du tableau du premier taux
+        year_index = np.arange(periods) // periods_per_year
+        interest_by_year = np.bincount(year_index, weights=schedule['interest'])
+        principal_by_year = np.bincount(year_index, weights=schedule['principal'])
+        balance_by_year = schedule['balance'][np.minimum((np.arange(len(interest_by_year)) + 1) * periods_per_year, periods) - 1]
+
+        lines += [
+            "━"*50,
+            f"📅 Amortissement annuel (taux {rates[0]*100:.2f}%)",
+            f"{'Année':>5} | {'Intérêts':>12} | {'Capital':>12} | {'Restant dû':>12}",
+        ]
+        for year in range(len(interest_by_year)):
+            lines.append(
+                f"{year + 1:>5} | {interest_by_year[year]:>12,.2f} | "
+                f"{principal_by_year[year]:>12,.2f} | {balance_by_year[year]:>12,.2f}"
+            )
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def calculate_compound_growth(
+    initial_value: float,
+    annual_rates: str = "0.05",
+    years: str = "5,10,20",
+    periodic_contribution: float = 0.0,
+    periods_per_year: int = 12
+) -> str:
+    """
+    Calcule la croissance d'un capital à intérêts composés, avec versements réguliers optionnels.
+    
+    Args:
+        initial_value: Capital de départ
+        annual_rates: Taux annuels séparés par des virgules (ex: "0.03,0.05,0.07")
+        years: Horizons en années séparés par des virgules (ex: "5,10,20")
+        periodic_contribution: Versement à chaque période (ex: 200 par mois)
+        periods_per_year: Fréquence de capitalisation et de versement (12 = mensuel, 1 = annuel)
+    
+    Returns:
+        Grille des valeurs futures (taux × horizons) et montants versés
+    """
+    try:
+        rates, horizons = parse_numbers(annual_rates), parse_numbers(years)
+        values = tvm.future_value(
+            initial_value, rates[:, None], horizons[None, :], periodic_contribution, periods_per_year
+        )
+        paid = initial_value + periodic_contribution * horizons * periods_per_year
+
+        lines = [
+            f"🌱 INTÉRÊTS COMPOSÉS - départ ${initial_value:,.2f}"
+            + (f", versement ${periodic_contribution:,.2f} × {periods_per_year}/an" if periodic_contribution else ""),
+            "━"*50,
+            f"{'Taux':>7}" + "".join(f"{f'{h:g} ans':>15}" for h in horizons),
+        ]
+        for rate, row in zip(rates, values):
+            lines.append(f"{rate*100:>6.2f}%" + "".join(f"{v:>15,.2f}" for v in row))
+        lines += [
+            "━"*50,
+            "💵 Total versé: " + " | ".join(f"{h:g} ans ${p:,.2f}" for h, p in zip(horizons, paid)),
+        ]
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def calculate_dcf_valuation(
+    free_cash_flow: float,
+    growth_rate: float = 0.05,
+    discount_rates: str = "0.08,0.09,0.10",
+    terminal_growth_rates: str = "0.02,0.025,0.03",
+    years: int = 5,
+    net_debt: float = 0.0,
+    shares_outstanding: float = 0.0
+) -> str:
+    """
+    Valorise une entreprise par actualisation des flux de trésorerie (DCF), avec table de sensibilité.
+    
+    Args:
+        free_cash_flow: Flux de trésorerie disponible de la dernière année (ex: 1e9)
+        growth_rate: Croissance annuelle des flux pendant la période explicite (ex: 0.05)
+        discount_rates: Taux d'actualisation (WACC) séparés par des virgules
+        terminal_growth_rates: Croissances à l'infini séparées par des virgules
+        years: Durée de la période explicite en années
+        net_debt: Dette nette, retranchée pour obtenir la valeur des fonds propres
+        shares_outstanding: Nombre d'actions (optionnel : valeur par action)
+    
+    Returns:
+        Valeur des fonds propres (ou par action) pour chaque couple WACC × croissance terminale
+    """
+    try:
+        discounts, terminals = parse_numbers(discount_rates), parse_numbers(terminal_growth_rates)
+        result = tvm.dcf(free_cash_flow, growth_rate, discounts, terminals, years)
+        equity = result['enterprise_value'] - net_debt
+        per_share = shares_outstanding > 0
+        if per_share:
+            equity = equity / shares_outstanding
+
+        def fmt(value):
+            if np.isnan(value):
+                return "N/A"
+            return f"${value:,.2f}" if per_share else f"${value/1e6:,.1f}M"
+
+        lines = [
+            f"🏢 VALORISATION DCF ({'par action' if per_share else 'fonds propres'})",
+            f"💵 FCF ${free_cash_flow:,.0f}, croissance {growth_rate*100:.1f}%/an sur {years} ans"
+            + (f", dette nette ${net_debt:,.0f}" if net_debt else ""),
+            "━"*50,
+            f"{'WACC':>7}" + "".join(f"{f'g={g*100:g}%':>14}" for g in terminals),
+        ]
+        for rate, row in zip(discounts, equity):
+            lines.append(f"{rate*100:>6.2f}%" + "".join(f"{fmt(v):>14}" for v in row))
+
+        share = result['terminal_share'][len(discounts) // 2, len(terminals) // 2]
+        lines.append("━"*50)
+        if not np.isnan(share):
+            lines.append(f"📊 Part de la valeur terminale (scénario central): {share*100:.1f}%")
+        if np.isnan(equity).any():
+            lines.append("⚠️ N/A : croissance terminale supérieure ou égale au WACC")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def price_options(
+    symbol: str = "",
+    spot: float = 0.0,
+    strikes: str = "",
+    expiries_days: str = "30,90,180",
+    volatility: float = 0.25,
+    risk_free_rate: float = 0.04,
+    dividend_yield: float = 0.0,
+    option_type: str = "call",
+    market_prices: str = ""
+) -> str:
+    """
+    Évalue une chaîne d'options européennes (Black-Scholes) : prix, delta, gamma, vega, theta, rho.
+    
+    Args:
+        symbol: Sous-jacent (ex: AAPL) ; son cours est utilisé si spot n'est pas fourni
+        spot: Cours du sous-jacent (optionnel si symbol est fourni)
+        strikes: Prix d'exercice séparés par des virgules (par défaut : de 80% à 120% du cours)
+        expiries_days: Échéances en jours séparées par des virgules (ex: "30,90,180")
+        volatility: Volatilité annuelle utilisée pour les prix et sensibilités (ex: 0.25)
+        risk_free_rate: Taux sans risque annuel (ex: 0.04)
+        dividend_yield: Rendement du dividende annuel (ex: 0.01)
+        option_type: "call" ou "put"
+        market_prices: Prix observés pour calculer la volatilité implicite : une ligne par échéance
+            séparée par "|", un prix par strike (ex: "12.1,7.4,3.9 | 15.2,10.8,7.1")
+    
+    Returns:
+        Tableau par échéance et prix d'exercice (prix, sensibilités, volatilité implicite)
+    """
+    try:
+        kind = option_type.strip().lower()
+        if kind not in ('call', 'put'):
+            return "❌ Erreur: option_type doit être 'call' ou 'put'"
+
+        label = "Sous-jacent"
+        if spot <= 0:
+            if not symbol.strip():
+                return "❌ Erreur: indiquer spot ou symbol"
+            label = resolve_symbol(symbol)
+            info = get_ticker_info(label, QUOTE_FIELDS)
+            spot = info.get('currentPrice') or info.get('regularMarketPrice') or 0.0
+            if spot <= 0:
+                return f"❌ Erreur: cours indisponible pour {label}"
+        elif symbol.strip():
+            label = resolve_symbol(symbol)
+
+        strike_grid = parse_numbers(strikes) if strikes.strip() else np.round(spot * DEFAULT_MONEYNESS, 2)
+        days = parse_numbers(expiries_days)
+        expiries = days / options.DAYS_PER_YEAR
+
+        # Toute la grille échéances × strikes en une seule évaluation
+        grid = options.black_scholes(
+            spot, strike_grid[None, :], expiries[:, None],
+            risk_free_rate, volatility, dividend_yield, kind
+        )
+        implied = None
+        if market_prices.strip():
+            observed = np.array([parse_numbers(row) for row in market_prices.split('|') if row.strip()])
+            if observed.shape != grid['price'].shape:
+                return (f"❌ Erreur: {observed.shape[0]}×{observed.shape[-1]} prix observés "
+                        f"pour {len(days)} échéances × {len(strike_grid)} strikes")
+            implied = options.implied_volatility(
+                observed, spot, strike_grid[None, :], expiries[:, None],
+                risk_free_rate, dividend_yield, kind
+            )
+
+        lines = [
+            f"🧮 OPTIONS {kind.upper()} EUROPÉENNES - {label} à ${spot:,.2f}",
+            f"📊 Volatilité {volatility*100:.1f}% | Taux {risk_free_rate*100:.2f}% | Dividende {dividend_yield*100:.2f}%",
+        ]
+        header = (f"{'Strike':>9}{'Prix':>10}{'Delta':>8}{'Gamma':>9}{'Vega':>8}{'Theta/j':>9}{'Rho':>8}"
+                  + (f"{'Marché':>10}{'Vol. impl.':>11}" if implied is not None else ""))
+        for e, day in enumerate(days):
+            lines += ["━"*len(header), f"📅 Échéance {day:g} jours", header]
+            for k, strike in enumerate(strike_grid[:MAX_ROWS]):
+                line = (
+                    f"{strike:>9,.2f}{grid['price'][e, k]:>10,.2f}{grid['delta'][e, k]:>8.3f}"
+                    f"{grid['gamma'][e, k]:>9.4f}{grid['vega'][e, k]:>8.3f}"
+                    f"{grid['theta'][e, k]:>9.3f}{grid['rho'][e, k]:>8.3f}"
+                )
+                if implied is not None:
+                    vol = implied[e, k]
+                    line += f"{observed[e, k]:>10,.2f}{'N/A' if np.isnan(vol) else f'{vol*100:.1f}%':>11}"
+                lines.append(line)
+            if len(strike_grid) > MAX_ROWS:
+                lines.append(f"… {len(strike_grid) - MAX_ROWS} autres prix d'exercice")
+
+        lines.append("━"*len(header))
+        lines.append("ℹ️ Vega et rho pour 1 point de volatilité / de taux ; theta par jour calendaire")
+        if implied is not None and np.isnan(implied).any():
+            lines.append("⚠️ Vol. impl. N/A : prix hors bornes d'arbitrage ou insensible à la volatilité")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
 # Export
 calculator_tools = [
     calculate_roi,
     calculate_profit_loss,
-    calculate_percent_change
+    calculate_percent_change,
+    calculate_portfolio_pnl,
+    calculate_batch_roi,
+    calculate_cost_basis,
+    calculate_npv_irr,
+    calculate_loan_amortization,
+    calculate_compound_growth,
+    calculate_dcf_valuation,
+    price_options,
+    analyze_portfolio_risk,
+    simulate_portfolio_value
 ]
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+Matrice de corrélation en cache pour de grands univers de titres.
+
+Une matrice de log-rendements alignée (dates × titres) est conservée en
+mémoire par période. Elle est complétée au fil de l'eau : les nouveaux
+titres ajoutent des colonnes, les nouvelles barres quotidiennes ajoutent des
+lignes, et les lignes sorties de la fenêtre sont retirées. Aucune requête ne
+reconstruit la matrice complète.
+"""
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.batch_fetch import fetch_panel
+from utils.history_store import period_start
+from utils.indicators import forward_fill
+
+
+# Délai minimal entre deux recherches de nouvelles barres
+REFRESH_INTERVAL = 15 * 60
+
+# Nombre minimal de dates communes pour estimer une corrélation
+MIN_OBSERVATIONS = 20
+
+
+class ReturnsMatrix:
+    """Log-rendements quotidiens alignés pour une période donnée."""
+
+    def __init__(self, period: str = "1y", refresh_interval: float = REFRESH_INTERVAL):
+        self.period = period
+        self.refresh_interval = refresh_interval
+        self.symbols: List[str] = []
+        self.dates = np.empty(0, dtype='datetime64[ns]')
+        self.log_returns = np.empty((0, 0))
+        # Deux dernières clôtures de chaque titre : la dernière barre peut encore
+        # évoluer en séance, sa ligne est recalculée à la mise à jour suivante
+        self.prev_close = np.empty(0)
+        self.last_close = np.empty(0)
+        self.errors: Dict[str, str] = {}
+        self.checked_at = 0.0
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _add_symbols(self, symbols: List[str]):
+        """Ajoute des colonnes pour des titres absents de la matrice."""
+        panel = fetch_panel(symbols, self.period, ('close',))
+        self.errors.update(panel.errors)
+        if not panel.symbols or len(panel.dates) < 2:
+            return
+
+        closes = forward_fill(panel.fields['close'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(np.log(closes), axis=0)
+        dates = panel.dates[1:]
+
+        if self.symbols and dates[-1] > self.dates[-1]:
+            # Les colonnes existantes sont en retard : on les complète d'abord
+            self._append_new_bars()
+
+        if not self.symbols:
+            self.dates, self.log_returns = dates, returns
+            prev_close, last_close = closes[-2], closes[-1]
+        else:
+            # Alignement sur le calendrier existant (NaN si pas de cotation)
+            all_dates = np.union1d(self.dates, dates)
+            merged = np.full((len(all_dates), len(self.symbols) + len(panel.symbols)), np.nan)
+            merged[np.searchsorted(all_dates, self.dates), :len(self.symbols)] = self.log_returns
+            merged[np.searchsorted(all_dates, dates), len(self.symbols):] = returns
+            self.dates, self.log_returns = all_dates, merged
+
+            # Clôtures des nouveaux titres aux deux dernières dates de la matrice
+            # (dernière cotation connue à ces dates), base des mises à jour suivantes
+            rows = np.searchsorted(panel.dates, self.dates[-2:], side='right') - 1
+            tail = closes[np.maximum(rows, 0)]
+            tail[rows < 0] = np.nan
+            prev_close, last_close = tail[0], tail[-1]
+
+        self.symbols = self.symbols + panel.symbols
+        self.prev_close = np.concatenate([self.prev_close, prev_close])
+        self.last_close = np.concatenate([self.last_close, last_close])
+        self.version += 1
+
+    def _drop_symbols(self, symbols: List[str]):
+        """Retire des colonnes (titres dont la mise à jour a échoué)."""
+        keep = [i for i, s in enumerate(self.symbols) if s not in symbols]
+        self.symbols = [self.symbols[i] for i in keep]
+        self.log_returns = self.log_returns[:, keep]
+        self.prev_close, self.last_close = self.prev_close[keep], self.last_close[keep]
+        self.version += 1
+
+    def _append_new_bars(self):
+        """Ajoute les lignes des barres parues depuis la dernière mise à jour."""
+        if not len(self.dates):
+            return
+        panel = fetch_panel(self.symbols, self.period, ('close',))
+        if panel.errors:
+            # Pas de rendements fictifs (forward fill) pour un titre non rafraîchi :
+            # sa colonne est retirée et l'erreur signalée ; il sera rechargé plus tard
+            self.errors.update(panel.errors)
+            self._drop_symbols(list(panel.errors))
+        if not self.symbols or not len(panel.dates):
+            return
+        # La dernière ligne est recalculée : sa barre a pu être complétée depuis
+        new_rows = panel.dates >= self.dates[-1]
+        if new_rows.any():
+            columns = [self.symbols.index(symbol) for symbol in panel.symbols]
+            closes = np.full((new_rows.sum() + 1, len(self.symbols)), np.nan)
+            closes[0] = self.prev_close
+            closes[1:, columns] = panel.fields['close'][new_rows]
+            closes = forward_fill(closes)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = np.diff(np.log(closes), axis=0)
+
+            self.dates = np.concatenate([self.dates[:-1], panel.dates[new_rows]])
+            self.log_returns = np.vstack([self.log_returns[:-1], returns])
+            self.prev_close, self.last_close = closes[-2], closes[-1]
+            self.version += 1
+
+        # Fenêtre glissante : on retire les lignes antérieures à la période
+        start = period_start(self.period)
+        if start is not None:
+            first = np.searchsorted(self.dates, np.datetime64(start, 'ns'))
+            if first:
+                self.dates, self.log_returns = self.dates[first:], self.log_returns[first:]
+                self.version += 1
+
+    def update(self, symbols: List[str]):
+        """Garantit que la matrice couvre `symbols` et intègre les dernières barres."""
+        with self._lock:
+            if time.time() - self.checked_at >= self.refresh_interval:
+                self.errors.clear()  # les titres en erreur seront retentés
+                self._append_new_bars()
+                self.checked_at = time.time()
+            missing = [s for s in symbols if s not in self.symbols and s not in self.errors]
+            if missing:
+                self._add_symbols(missing)
+
+    def columns(self, symbols: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Titres disponibles parmi `symbols` et sous-matrice correspondante."""
+        with self._lock:
+            kept = [s for s in symbols if s in self.symbols]
+            indices = [self.symbols.index(s) for s in kept]
+            return kept, self.log_returns[:, indices]
+
+
+def correlation_matrix(log_returns: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Corrélations de Pearson sur les dates où tous les titres cotent.
+
+    Returns:
+        (matrice de corrélation, nombre d'observations utilisées)
+    """
+    complete = log_returns[~np.isnan(log_returns).any(axis=1)]
+    if len(complete) < MIN_OBSERVATIONS:
+        raise ValueError(
+            f"Historique commun insuffisant ({len(complete)} jours, minimum {MIN_OBSERVATIONS})"
+        )
+    centered = complete - complete.mean(axis=0)
+    std = centered.std(axis=0, ddof=1)
+    std[std == 0] = np.nan
+    standardized = centered / std
+    corr = standardized.T @ standardized / (len(complete) - 1)
+    np.fill_diagonal(corr, 1.0)
+    return np.clip(corr, -1.0, 1.0), len(complete)
+
+
+def top_pairs(corr: np.ndarray, k: int = 5) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """Les k paires les plus corrélées et les k moins corrélées (indices i < j)."""
+    rows, cols = np.triu_indices(len(corr), k=1)
+    values = corr[rows, cols]
+    valid = ~np.isnan(values)
+    rows, cols, values = rows[valid], cols[valid], values[valid]
+    order = np.argsort(values)
+    k = min(k, len(order))
+    most = [(rows[i], cols[i]) for i in order[::-1][:k]]
+    least = [(rows[i], cols[i]) for i in order[:k]]
+    return most, least
+
+
+class CorrelationCache:
+    """Matrices de rendements par période et corrélations mémorisées."""
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._matrices: Dict[str, ReturnsMatrix] = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def matrix(self, period: str) -> ReturnsMatrix:
+        with self._lock:
+            if period not in self._matrices:
+                self._matrices[period] = ReturnsMatrix(period, self.refresh_interval)
+            return self._matrices[period]
+
+    def correlations(self, symbols: List[str], period: str = "1y"):
+        """
+        Matrice de corrélation des log-rendements pour une liste de titres.
+
+        Returns:
+            (titres retenus, matrice de corrélation, observations, erreurs par titre)
+        """
+        matrix = self.matrix(period)
+        matrix.update(symbols)
+        kept, returns = matrix.columns(symbols)
+        errors = {s: matrix.errors[s] for s in symbols if s in matrix.errors}
+
+        key = (period, tuple(kept), matrix.version)
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is None:
+            cached = correlation_matrix(returns) if kept else (np.empty((0, 0)), 0)
+            with self._lock:
+                # Seule la version courante de chaque matrice est conservée
+                self._results = {k: v for k, v in self._results.items()
+                                 if k[0] != period or k[2] == matrix.version}
+                self._results[key] = cached
+        corr, observations = cached
+        return kept, corr, observations, errors
+
+
+# Instance partagée par les tools
+correlation_cache = CorrelationCache()
@@ -0,0 +1,378 @@
+"""
+Prix de revient et plus/moins-values d'un historique de transactions.
+
+Le relevé (CSV, JSON ou JSON lines, éventuellement des centaines de milliers
+de lignes) est lu par blocs et appliqué transaction par transaction à un
+`LotBook`. Les lots ouverts de chaque titre sont rangés dans des tableaux
+compacts (`array('d')`) consommés par le début (FIFO) ou par la fin (LIFO) ;
+la méthode du coût moyen pondéré ne conserve que la quantité et le coût
+ouverts. Plus-values réalisées et coûts ouverts sont tenus à jour à chaque
+transaction : la valorisation latente après un changement de cours ne
+demande qu'un produit vectorisé par titre.
+
+Un relevé sur disque n'est lu que dans `STATEMENTS_DIR` : le nom de fichier
+vient d'un argument de tool, donc du LLM.
+"""
+import io
+import json
+import os
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.symbols import normalize_text
+
+
+# Seul dossier où les relevés de transactions peuvent être lus
+STATEMENTS_DIR = os.getenv("STATEMENTS_DIR", "statements")
+
+METHODS = ('fifo', 'lifo', 'average')
+
+METHOD_ALIASES = {
+    'fifo': 'fifo', 'peps': 'fifo',
+    'lifo': 'lifo', 'deps': 'lifo',
+    'average': 'average', 'moyen': 'average', 'cmp': 'average', 'pmp': 'average', 'avg': 'average',
+}
+
+# Lignes lues par bloc
+CHUNK_ROWS = 50_000
+
+# Quantités considérées comme nulles (arrondis)
+EPSILON = 1e-9
+
+# Noms de colonnes acceptés (français / anglais) -> nom canonique
+TRADE_ALIASES = {
+    'date': 'date', 'trade_date': 'date', 'jour': 'date',
+    'symbol': 'symbol', 'symbole': 'symbol', 'ticker': 'symbol', 'titre': 'symbol',
+    'side': 'side', 'sens': 'side', 'type': 'side', 'action': 'side', 'operation': 'side',
+    'quantity': 'quantity', 'quantite': 'quantity', 'qty': 'quantity', 'shares': 'quantity',
+    'price': 'price', 'prix': 'price', 'cours': 'price', 'prix_unitaire': 'price',
+    'fees': 'fees', 'frais': 'fees', 'commission': 'fees',
+}
+
+_SELL_WORDS = {'sell', 'sold', 's', 'vente', 'vendre', 'v', 'cession'}
+_BUY_WORDS = {'buy', 'bought', 'b', 'achat', 'acheter', 'a', 'acquisition'}
+
+
+class _Lots:
+    """Lots ouverts d'un titre : quantités et prix unitaires, du plus ancien au plus récent."""
+
+    __slots__ = ('qty', 'price', 'head')
+
+    def __init__(self):
+        self.qty = array('d')
+        self.price = array('d')
+        self.head = 0
+
+    def push(self, quantity: float, price: float):
+        self.qty.append(quantity)
+        self.price.append(price)
+
+    def take_oldest(self, quantity: float) -> float:
+        """Consomme `quantity` depuis les lots les plus anciens ; renvoie leur coût."""
+        qty, price = self.qty, self.price
+        cost, i, end = 0.0, self.head, len(qty)
+        while quantity > EPSILON and i < end:
+            if qty[i] <= quantity + EPSILON:
+                cost += qty[i] * price[i]
+                quantity -= qty[i]
+                i += 1
+            else:
+                cost += quantity * price[i]
+                qty[i] -= quantity
+                quantity = 0.0
+        self.head = i
+        # Compactage quand la partie consommée domine le tableau
+        if i > 1024 and i * 2 > end:
+            del qty[:i], price[:i]
+            self.head = 0
+        return cost
+
+    def take_newest(self, quantity: float) -> float:
+        """Consomme `quantity` depuis les lots les plus récents ; renvoie leur coût."""
+        qty, price = self.qty, self.price
+        cost = 0.0
+        while quantity > EPSILON and len(qty) > self.head:
+            if qty[-1] <= quantity + EPSILON:
+                cost += qty[-1] * price[-1]
+                quantity -= qty.pop()
+                price.pop()
+            else:
+                cost += quantity * price[-1]
+                qty[-1] -= quantity
+                quantity = 0.0
+        return cost
+
+    def __len__(self) -> int:
+        return len(self.qty) - self.head
+
+
+class LotBook:
+    """
+    Registre des lots d'un portefeuille, mis à jour transaction par transaction.
+
+    Args:
+        method: 'fifo', 'lifo' ou 'average' (coût moyen pondéré)
+    """
+
+    def __init__(self, method: str = 'fifo'):
+        method = METHOD_ALIASES.get(normalize_text(method).strip(), method)
+        if method not in METHODS:
+            raise ValueError(f"Méthode inconnue: {method} (attendues: {', '.join(METHODS)})")
+        self.method = method
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._lots: List[_Lots] = []
+        # Cumuls par titre, tenus à jour à chaque transaction
+        self._open_qty: List[float] = []
+        self._open_cost: List[float] = []
+        self._realized: List[float] = []
+        self._last_price: List[float] = []
+        self._oversold: List[float] = []
+        self.trades = 0
+
+    def _slot(self, symbol: str) -> int:
+        slot = self._index.get(symbol)
+        if slot is None:
+            slot = self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._lots.append(_Lots())
+            for column in (self._open_qty, self._open_cost, self._realized, self._oversold):
+                column.append(0.0)
+            self._last_price.append(np.nan)
+        return slot
+
+    def buy(self, symbol: str, quantity: float, price: float, fees: float = 0.0):
+        """Ouvre un lot ; les frais sont intégrés au prix de revient."""
+        slot = self._slot(symbol)
+        cost = quantity * price + fees
+        if self.method != 'average':
+            self._lots[slot].push(quantity, cost / quantity)
+        self._open_qty[slot] += quantity
+        self._open_cost[slot] += cost
+        self._last_price[slot] = price
+        self.trades += 1
+
+    def sell(self, symbol: str, quantity: float, price: float, fees: float = 0.0) -> float:
+        """
+        Clôture `quantity` titres selon la méthode du registre.
+
+        La quantité vendue au-delà de la position n'a pas de prix de revient :
+        elle est ignorée et comptée dans `oversold`.
+
+        Returns:
+            Plus ou moins-value réalisée par cette vente
+        """
+        slot = self._slot(symbol)
+        held = self._open_qty[slot]
+        closed = min(quantity, held)
+        if quantity - closed > EPSILON:
+            self._oversold[slot] += quantity - closed
+
+        if self.method == 'fifo':
+            cost = self._lots[slot].take_oldest(closed)
+        elif self.method == 'lifo':
+            cost = self._lots[slot].take_newest(closed)
+        else:
+            cost = self._open_cost[slot] * closed / held if held > EPSILON else 0.0
+
+        proceeds = closed * price - (fees * closed / quantity if quantity else 0.0)
+        pnl = proceeds - cost
+        self._open_qty[slot] = held - closed
+        self._open_cost[slot] = self._open_cost[slot] - cost if held - closed > EPSILON else 0.0
+        self._realized[slot] += pnl
+        self._last_price[slot] = price
+        self.trades += 1
+        return pnl
+
+    def apply(self, symbol: str, quantity: float, price: float, fees: float = 0.0) -> float:
+        """Applique une transaction (quantité positive : achat, négative : vente)."""
+        if quantity > 0:
+            self.buy(symbol, quantity, price, fees)
+            return 0.0
+        if quantity < 0:
+            return self.sell(symbol, -quantity, price, fees)
+        return 0.0
+
+    def apply_frame(self, trades: pd.DataFrame):
+        """Applique un bloc de transactions normalisé (voir `read_transactions`)."""
+        apply = self.apply
+        for symbol, quantity, price, fees in zip(
+            trades['symbol'].tolist(), trades['quantity'].tolist(),
+            trades['price'].tolist(), trades['fees'].tolist()
+        ):
+            apply(symbol, quantity, price, fees)
+
+    def open_lots(self, symbol: str) -> int:
+        """Nombre de lots ouverts d'un titre (1 au plus pour le coût moyen)."""
+        slot = self._index[symbol]
+        if self.method == 'average':
+            return int(self._open_qty[slot] > EPSILON)
+        return len(self._lots[slot])
+
+    def positions(self, prices: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        État du portefeuille valorisé aux cours donnés.
+
+        Args:
+            prices: Cours par symbole ; à défaut, dernier prix de transaction
+
+        Returns:
+            DataFrame indexé par symbole : quantity, cost_basis, avg_cost, price,
+            market_value, unrealized, realized, oversold, marked (cours fourni)
+        """
+        prices = prices or {}
+        quantity = np.array(self._open_qty)
+        quantity[np.abs(quantity) < EPSILON] = 0.0
+        cost = np.array(self._open_cost)
+        marks = np.array([prices.get(symbol, np.nan) for symbol in self.symbols], dtype='f8')
+        marked = ~np.isnan(marks)
+        price = np.where(marked, marks, np.array(self._last_price))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            avg_cost = np.where(quantity > 0, cost / quantity, np.nan)
+        value = quantity * price
+        return pd.DataFrame({
+            'quantity': quantity,
+            'cost_basis': cost,
+            'avg_cost': avg_cost,
+            'price': price,
+            'market_value': value,
+            'unrealized': np.where(quantity > 0, value - cost, 0.0),
+            'realized': np.array(self._realized),
+            'oversold': np.array(self._oversold),
+            'marked': marked,
+        }, index=pd.Index(self.symbols, name='symbol'))
+
+
+def _canonical(name: str) -> Optional[str]:
+    return TRADE_ALIASES.get(normalize_text(str(name)).strip().replace(' ', '_'))
+
+
+def normalize_trades(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ramène un bloc de transactions aux colonnes symbol, quantity (signée), price, fees.
+
+    Une colonne `side` (buy/sell, achat/vente) donne le sens ; sinon, ou si
+    elle est vide, une quantité négative est une vente. Un autre libellé
+    (dividende, split...) est refusé plutôt que compté comme un achat.
+    """
+    renamed = {}
+    for column in frame.columns:
+        canonical = _canonical(column)
+        if canonical is None:
+            raise ValueError(f"Colonne inconnue: {column} (attendues: {', '.join(sorted(set(TRADE_ALIASES.values())))})")
+        renamed[column] = canonical
+    frame = frame.rename(columns=renamed)
+    for column in ('symbol', 'quantity', 'price'):
+        if column not in frame.columns:
+            raise ValueError(f"Colonne requise manquante: {column}")
+
+    quantity = pd.to_numeric(frame['quantity'], errors='coerce').to_numpy(dtype='f8')
+    if 'side' in frame.columns:
+        side = frame['side'].fillna('').astype(str)
+        # Normalisation faite une fois par libellé distinct
+        sells, buys = [], []
+        for label in side.unique():
+            word = normalize_text(label).strip()
+            if word in _SELL_WORDS:
+                sells.append(label)
+            elif word in _BUY_WORDS:
+                buys.append(label)
+            elif word:
+                raise ValueError(f"Sens de transaction inconnu: {label} (attendus: buy/sell, achat/vente)")
+        quantity = np.where(side.isin(sells).to_numpy(), -np.abs(quantity),
+                            np.where(side.isin(buys).to_numpy(), np.abs(quantity), quantity))
+    fees = (pd.to_numeric(frame['fees'], errors='coerce').fillna(0.0).to_numpy(dtype='f8')
+            if 'fees' in frame.columns else np.zeros(len(frame)))
+
+    trades = pd.DataFrame({
+        'symbol': frame['symbol'].fillna('').astype(str).str.strip().str.upper().to_numpy(),
+        'quantity': quantity,
+        'price': pd.to_numeric(frame['price'], errors='coerce').to_numpy(dtype='f8'),
+        'fees': fees,
+    })
+    valid = (trades['symbol'] != '') & trades['quantity'].notna() & trades['price'].notna()
+    return trades[valid]
+
+
+def _open_source(source: str) -> io.TextIOBase:
+    """
+    Texte en ligne, ou fichier de `STATEMENTS_DIR` si `source` est un nom de fichier.
+
+    Une ligne unique qui n'est pas du JSON désigne un fichier ; il doit se
+    trouver dans `STATEMENTS_DIR` (pas de chemin absolu, de `~` ni de `..`).
+    """
+    candidate = source.strip()
+    if '\n' in candidate or candidate[:1] in ('[', '{'):
+        return io.StringIO(candidate)
+
+    root = os.path.realpath(STATEMENTS_DIR)
+    path = os.path.realpath(os.path.join(root, candidate))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        raise ValueError(f"Relevé introuvable: {candidate} (fichiers lus dans {STATEMENTS_DIR})")
+    return open(path, encoding='utf-8-sig')
+
+
+def _json_layout(first_line: str) -> str:
+    """
+    Forme d'un relevé JSON d'après sa première ligne.
+
+    Returns:
+        'records' (liste d'objets ou objet de listes, lu en entier) ou 'lines' (JSON lines)
+    """
+    if first_line.lstrip().startswith('['):
+        return 'records'
+    try:
+        first = json.loads(first_line)
+    except ValueError:
+        # Objet réparti sur plusieurs lignes
+        return 'records'
+    # Une ligne qui est à elle seule un objet de listes : tout le relevé
+    if isinstance(first, dict) and any(isinstance(value, list) for value in first.values()):
+        return 'records'
+    return 'lines'
+
+
+def read_transactions(source: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Lit un relevé de transactions par blocs normalisés.
+
+    Args:
+        source: Nom d'un fichier de `STATEMENTS_DIR` ou contenu : CSV avec en-tête (séparé par
+            des virgules ou des points-virgules), JSON (liste d'objets ou objet
+            de listes) ou JSON lines ; transactions dans l'ordre chronologique
+        chunk_rows: Taille des blocs
+
+    Yields:
+        Blocs de transactions (symbol, quantity signée, price, fees)
+    """
+    with _open_source(source) as handle:
+        first_line = handle.readline()
+        handle.seek(0)
+        start = first_line.lstrip()[:1]
+
+        layout = _json_layout(first_line) if start in ('[', '{') else None
+        if layout == 'records':
+            frame = pd.DataFrame(json.load(handle))
+            for offset in range(0, len(frame), chunk_rows):
+                yield normalize_trades(frame.iloc[offset:offset + chunk_rows])
+            return
+        if layout == 'lines':
+            chunks = pd.read_json(handle, lines=True, chunksize=chunk_rows)
+        else:
+            sep = ';' if first_line.count(';') > first_line.count(',') else ','
+            chunks = pd.read_csv(handle, sep=sep, skipinitialspace=True, chunksize=chunk_rows)
+        for chunk in chunks:
+            yield normalize_trades(chunk)
+
+
+def build_book(source: str, method: str = 'fifo') -> LotBook:
+    """Applique tout un relevé de transactions à un nouveau registre."""
+    book = LotBook(method)
+    for chunk in read_transactions(source):
+        book.apply_frame(chunk)
+    if not book.trades:
+        raise ValueError("Aucune transaction valide dans le relevé")
+    return book
@@ -2,11 +2,23 @@
 Tools financiers pour l'analyse de marché.
 """
 from langchain_core.tools import tool
-import yfinance as yf
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from typing import Optional
 
+from utils.market_cache import (
+    get_ticker_info, QUOTE_FIELDS, FUNDAMENTAL_FIELDS, PROFILE_FIELDS
+)
+from utils.batch_fetch import fetch_quotes, fetch_panel, parse_symbols
+from utils.history_store import get_history
+from utils import indicators as ind
+from utils.correlation import correlation_cache, top_pairs
+from utils import backtest as bt
+from utils.fundamentals import fundamentals_index
+from utils.symbols import resolve_symbol
+from utils.async_tools import add_async
+
 
 @tool
 def get_stock_price(symbol: str) -> str:
@@ -14,14 +26,14 @@ def get_stock_price(symbol: str) -> str:
     Récupère le prix actuel d'une action avec variation.
     
     Args:
-        symbol: Symbole de l'action (ex: AAPL, MSFT, GOOGL)
+        symbol: Symbole de l'action ou nom de l'entreprise (ex: AAPL, Microsoft)
     
     Returns:
         Prix actuel, variation et statistiques du jour
     """
     try:
-        stock = yf.Ticker(symbol.upper())
-        info = stock.info
+        symbol = resolve_symbol(symbol)
+        info = get_ticker_info(symbol, QUOTE_FIELDS + ('longName',))
         
         current_price = info.get('currentPrice', info.get('regularMarketPrice'))
         previous_close = info.get('previousClose')
@@ -54,15 +66,15 @@ def get_stock_history(symbol: str, period: str = "1mo") -> str:
     Récupère l'historique d'une action avec statistiques.
     
     Args:
-        symbol: Symbole de l'action
+        symbol: Symbole de l'action ou nom de l'entreprise
         period: Période (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, max)
     
     Returns:
         Statistiques détaillées sur la période
     """
     try:
-        stock = yf.Ticker(symbol.upper())
-        hist = stock.history(period=period)
+        symbol = resolve_symbol(symbol)
+        hist = get_history(symbol, period)
         
         if hist.empty:
             return f"Aucune donnée disponible pour {symbol}"
@@ -97,29 +109,25 @@ def compare_stocks(symbols: str) -> str:
     Compare plusieurs actions côte à côte.
     
     Args:
-        symbols: Symboles séparés par des virgules (ex: AAPL,MSFT,GOOGL)
+        symbols: Symboles ou noms séparés par des virgules (ex: AAPL,MSFT,Google)
     
     Returns:
         Tableau comparatif des actions
     """
     try:
-        symbol_list = [s.strip().upper() for s in symbols.split(',')]
+        quotes = fetch_quotes(parse_symbols(symbols))
         comparisons = []
         
-        for symbol in symbol_list:
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            
-            price = info.get('currentPrice', info.get('regularMarketPrice', 0))
-            previous = info.get('previousClose', price)
-            change_pct = ((price - previous) / previous * 100) if previous else 0
-            market_cap = info.get('marketCap', 0)
-            pe_ratio = info.get('trailingPE', 'N/A')
+        for symbol, row in quotes.iterrows():
+            if row['error']:
+                comparisons.append(f"{symbol}: ❌ {row['error']}")
+                continue
             
+            pe_ratio = row['pe_ratio']
             comparisons.append(
-                f"{symbol}: ${price:.2f} ({change_pct:+.2f}%) | "
-                f"P/E: {pe_ratio if pe_ratio == 'N/A' else f'{pe_ratio:.2f}'} | "
-                f"Cap: ${market_cap/1e9:.1f}B"
+                f"{symbol}: ${row['price']:.2f} ({row['change_pct']:+.2f}%) | "
+                f"P/E: {'N/A' if pd.isna(pe_ratio) else f'{pe_ratio:.2f}'} | "
+                f"Cap: ${row['market_cap']/1e9:.1f}B"
             )
         
         return "📊 COMPARAISON DES ACTIONS\n" + "━"*50 + "\n" + "\n".join(comparisons)
@@ -133,14 +141,14 @@ def get_company_info(symbol: str) -> str:
     Récupère les informations détaillées d'une entreprise.
     
     Args:
-        symbol: Symbole de l'action
+        symbol: Symbole de l'action ou nom de l'entreprise
     
     Returns:
         Informations complètes sur l'entreprise
     """
     try:
-        stock = yf.Ticker(symbol.upper())
-        info = stock.info
+        symbol = resolve_symbol(symbol)
+        info = get_ticker_info(symbol, FUNDAMENTAL_FIELDS + PROFILE_FIELDS)
         
         return f"""
 🏢 {info.get('longName', symbol.upper())}
@@ -164,10 +172,305 @@ def get_company_info(symbol: str) -> str:
         return f"❌ Erreur: {str(e)}"
 
 
+@tool
+def get_technical_indicators(
+    symbols: str,
+    indicators: str = "sma_20,sma_50,rsi_14,macd,bbands_20,atr_14,vol_20",
+    period: str = "1y"
+) -> str:
+    """
+    Calcule plusieurs indicateurs techniques pour une ou plusieurs actions en un seul appel.
+    
+    Args:
+        symbols: Symboles séparés par des virgules (ex: AAPL,MSFT,NVDA)
+        indicators: Indicateurs séparés par des virgules, paramètres après "_" :
+            sma_N, ema_N, rsi_N, macd_RAPIDE_LENTE_SIGNAL, bbands_N_K, atr_N, vol_N
+            (ex: "sma_50,sma_200,rsi_14,macd")
+        period: Historique utilisé pour le calcul (3mo, 6mo, 1y, 2y, 5y)
+    
+    Returns:
+        Dernière valeur de chaque indicateur pour chaque action
+    """
+    try:
+        specs = ind.parse_specs(indicators)
+        panel = fetch_panel(parse_symbols(symbols), period, ind.required_fields(specs))
+        
+        lines = [f"📐 INDICATEURS TECHNIQUES ({period})", "━"*50]
+        if panel.symbols:
+            fields = {name: ind.forward_fill(values) for name, values in panel.fields.items()}
+            results = ind.compute_indicators(fields, specs)
+            closes = ind.last_valid(fields['close'])
+            last = {
+                label: {part: ind.last_valid(values) for part, values in parts.items()}
+                for label, parts in results.items()
+            }
+            
+            for column, symbol in enumerate(panel.symbols):
+                lines.append(f"{symbol} - ${closes[column]:.2f}")
+                for label, parts in last.items():
+                    values = {part: v[column] for part, v in parts.items()}
+                    if label.startswith("MACD"):
+                        text = (f"{values['macd']:.2f} | signal {values['signal']:.2f} | "
+                                f"hist {values['hist']:+.2f}")
+                    elif label.startswith("Bollinger"):
+                        text = (f"${values['lower']:.2f} – ${values['upper']:.2f} "
+                                f"(%B {values['percent_b']:.2f})")
+                    elif label.startswith("RSI"):
+                        text = f"{values['value']:.1f}"
+                    elif label.startswith("Vol"):
+                        text = f"{values['value']*100:.1f}% annualisée"
+                    else:
+                        text = f"${values['value']:.2f}"
+                    lines.append(f"  • {label}: {text}")
+        
+        for symbol, error in panel.errors.items():
+            lines.append(f"{symbol}: ❌ {error}")
+        
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def get_correlation_matrix(symbols: str, target: str = "", top_k: int = 5, period: str = "1y") -> str:
+    """
+    Calcule les corrélations entre de nombreuses actions (matrice et paires extrêmes).
+    
+    Args:
+        symbols: Symboles séparés par des virgules (watchlist, univers de titres)
+        target: Symbole optionnel dont on veut les titres les plus/moins corrélés (ex: NVDA)
+        top_k: Nombre de paires (ou de titres) à afficher de chaque côté
+        period: Période des rendements quotidiens (3mo, 6mo, 1y, 2y, 5y)
+    
+    Returns:
+        Matrice de corrélation (petits univers) et paires les plus/moins corrélées
+    """
+    try:
+        symbol_list = parse_symbols(symbols)
+        target = resolve_symbol(target) if target.strip() else ""
+        if target and target not in symbol_list:
+            symbol_list.append(target)
+        
+        kept, corr, observations, errors = correlation_cache.correlations(symbol_list, period)
+        if len(kept) < 2:
+            return "❌ Erreur: au moins deux titres avec historique sont nécessaires"
+        
+        lines = [f"🔗 CORRÉLATIONS ({period}, {len(kept)} titres, {observations} jours)", "━"*50]
+        
+        if len(kept) <= 8:
+            lines.append(" " * 7 + "".join(f"{s:>7}" for s in kept))
+            for symbol, row in zip(kept, corr):
+                lines.append(f"{symbol:<7}" + "".join(f"{v:>7.2f}" for v in row))
+            lines.append("━"*50)
+        
+        if target in kept:
+            i = kept.index(target)
+            others = np.delete(np.arange(len(kept)), i)
+            order = others[np.argsort(corr[i, others])]
+            lines.append(f"🎯 Plus corrélés avec {target}:")
+            lines += [f"  • {kept[j]}: {corr[i, j]:+.2f}" for j in order[::-1][:top_k]]
+            lines.append(f"🎯 Moins corrélés avec {target}:")
+            lines += [f"  • {kept[j]}: {corr[i, j]:+.2f}" for j in order[:top_k]]
+        else:
+            most, least = top_pairs(corr, top_k)
+            lines.append("📈 Paires les plus corrélées:")
+            lines += [f"  • {kept[i]} / {kept[j]}: {corr[i, j]:+.2f}" for i, j in most]
+            lines.append("📉 Paires les moins corrélées:")
+            lines += [f"  • {kept[i]} / {kept[j]}: {corr[i, j]:+.2f}" for i, j in least]
+        
+        if errors:
+            lines.append(f"⚠️ Exclus (pas de données): {', '.join(errors)}")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def backtest_strategy(
+    symbols: str,
+    strategy: str = "ma_crossover",
+    period: str = "10y",
+    fast: int = 50,
+    slow: int = 200,
+    lookback: int = 126,
+    top_n: int = 3,
+    rebalance_days: int = 21,
+    cost_bps: float = 10.0
+) -> str:
+    """
+    Teste une stratégie simple sur l'historique ("est-ce que ça aurait marché ?").
+    
+    Args:
+        symbols: Symboles séparés par des virgules (ex: AAPL,MSFT,NVDA)
+        strategy: "ma_crossover" (croisement de moyennes mobiles), "momentum"
+            (meilleurs rendements récents) ou "rebalance" (poids égaux rééquilibrés)
+        period: Période du backtest (1y, 5y, 10y, max)
+        fast: Moyenne mobile rapide en jours (ma_crossover)
+        slow: Moyenne mobile lente en jours (ma_crossover)
+        lookback: Fenêtre de mesure du momentum en jours (momentum)
+        top_n: Nombre de titres détenus (momentum)
+        rebalance_days: Fréquence de rééquilibrage en jours de bourse (momentum, rebalance)
+        cost_bps: Frais de transaction en points de base (10 = 0.10%)
+    
+    Returns:
+        Performance de la stratégie comparée à un achat-conservation à poids égaux
+    """
+    try:
+        strategy = strategy.strip().lower()
+        if strategy not in bt.STRATEGIES:
+            return f"❌ Erreur: stratégie inconnue ({', '.join(bt.STRATEGIES)})"
+        
+        panel = fetch_panel(parse_symbols(symbols), period, ('close',))
+        if not panel.symbols:
+            return f"❌ Erreur: aucun historique disponible ({', '.join(panel.errors)})"
+        closes = ind.forward_fill(panel.fields['close'])
+        
+        if strategy == "ma_crossover":
+            target, rebalance = bt.ma_crossover(closes, fast, slow)
+            label = f"Croisement SMA {fast}/{slow}"
+        elif strategy == "momentum":
+            target, rebalance = bt.momentum(closes, lookback, top_n, rebalance_days)
+            label = f"Momentum {lookback}j, top {top_n}, rééquilibrage {rebalance_days}j"
+        else:
+            target, rebalance = bt.periodic_rebalance(closes, None, rebalance_days)
+            label = f"Poids égaux, rééquilibrage {rebalance_days}j"
+        
+        result = bt.run_backtest(closes, target, rebalance, cost_bps)
+        stats = bt.summarize(result['equity'], result['returns'])
+        
+        # Référence : achat à poids égaux le premier jour, sans rééquilibrage
+        hold_target, _ = bt.periodic_rebalance(closes, None, len(closes))
+        hold_rebalance = np.zeros(len(closes), dtype=bool)
+        hold_rebalance[0] = True
+        hold = bt.run_backtest(closes, hold_target, hold_rebalance, cost_bps)
+        hold_stats = bt.summarize(hold['equity'], hold['returns'])
+        
+        start = pd.Timestamp(panel.dates[0]).strftime('%d/%m/%Y')
+        end = pd.Timestamp(panel.dates[-1]).strftime('%d/%m/%Y')
+        lines = [
+            f"🧪 BACKTEST - {label}",
+            f"📅 {start} → {end} | {len(panel.symbols)} titres | frais {cost_bps:g} bps",
+            "━"*50,
+            f"{'':<20}{'Stratégie':>12}{'Buy & Hold':>12}",
+        ]
+        rows = [
+            ("Performance totale", 'total_return', 100, "%"),
+            ("Rendement annuel", 'cagr', 100, "%"),
+            ("Volatilité", 'volatility', 100, "%"),
+            ("Sharpe", 'sharpe', 1, ""),
+            ("Drawdown max", 'max_drawdown', 100, "%"),
+        ]
+        for name, key, scale, unit in rows:
+            lines.append(
+                f"{name:<20}{stats[key]*scale:>11.2f}{unit or ' '}{hold_stats[key]*scale:>11.2f}{unit or ' '}"
+            )
+        lines += [
+            "━"*50,
+            f"🔄 Rééquilibrages: {result['rebalances']} | Rotation cumulée: {result['turnover']*100:.0f}% "
+            f"| Frais: {result['costs']*100:.2f}%",
+        ]
+        if panel.errors:
+            lines.append(f"⚠️ Exclus (pas de données): {', '.join(panel.errors)}")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+@tool
+def screen_stocks(
+    sector: str = "",
+    industry: str = "",
+    min_market_cap_b: float = 0.0,
+    max_market_cap_b: float = 0.0,
+    min_pe: float = 0.0,
+    max_pe: float = 0.0,
+    min_dividend_pct: float = 0.0,
+    min_eps: float = 0.0,
+    sort_by: str = "market_cap",
+    ascending: bool = False,
+    limit: int = 15
+) -> str:
+    """
+    Recherche des actions selon leurs fondamentaux (ex: "tech avec PER < 20 et capitalisation > 50 Mds$").
+    Utilise un index local : aucun appel réseau par titre.
+    
+    Args:
+        sector: Secteur (ex: Technology, Healthcare, Energy ; noms français acceptés)
+        industry: Industrie (ex: Semiconductors, Banks)
+        min_market_cap_b: Capitalisation minimale en milliards de dollars (0 = pas de borne)
+        max_market_cap_b: Capitalisation maximale en milliards de dollars (0 = pas de borne)
+        min_pe: PER minimal (0 = pas de borne)
+        max_pe: PER maximal (0 = pas de borne)
+        min_dividend_pct: Rendement du dividende minimal en % (0 = pas de borne)
+        min_eps: BPA minimal (0 = pas de borne)
+        sort_by: Tri par market_cap, pe_ratio, eps ou dividend_yield
+        ascending: Tri croissant (ex: PER les plus bas d'abord)
+        limit: Nombre maximal de résultats
+    
+    Returns:
+        Liste des titres correspondant aux critères
+    """
+    try:
+        results = fundamentals_index.screen(
+            sector=sector,
+            industry=industry,
+            min_market_cap=min_market_cap_b * 1e9 or None,
+            max_market_cap=max_market_cap_b * 1e9 or None,
+            min_pe=min_pe or None,
+            max_pe=max_pe or None,
+            min_dividend_yield=min_dividend_pct / 100 or None,
+            min_eps=min_eps or None,
+            sort_by=sort_by,
+            ascending=ascending,
+            limit=limit,
+        )
+        stats = fundamentals_index.stats()
+        # Titres que la dernière reconstruction n'a pas pu obtenir
+        failed = ""
+        if stats['errors']:
+            failed = (f"\n⚠️ {len(stats['errors'])} titre(s) non mis à jour: "
+                      + ", ".join(list(stats['errors'])[:10]))
+        
+        if not results:
+            return f"🔎 Aucun titre ne correspond aux critères ({stats['symbols']} titres indexés)" + failed
+        
+        def fmt(value, pattern):
+            return "N/A" if np.isnan(value) else pattern.format(value)
+        
+        lines = [
+            f"🔎 FILTRAGE D'ACTIONS - {len(results)} résultat(s) sur {stats['symbols']} titres indexés",
+            "━"*70,
+            f"{'Symbole':<8}{'Secteur':<24}{'Cap.':>10}{'PER':>8}{'BPA':>8}{'Div.':>8}",
+        ]
+        for row in results:
+            lines.append(
+                f"{row['symbol']:<8}{row['sector'][:23]:<24}"
+                f"{fmt(row['market_cap'] / 1e9, '{:.1f}B'):>10}"
+                f"{fmt(row['pe_ratio'], '{:.1f}'):>8}"
+                f"{fmt(row['eps'], '{:.2f}'):>8}"
+                f"{fmt(row['dividend_yield'] * 100, '{:.2f}%'):>8}"
+            )
+        lines.append("━"*70)
+        age = stats['age'] or 0
+        lines.append(f"🕒 Index mis à jour il y a {age / 60:.0f} min")
+        return "\n".join(lines) + failed
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
 # Export des tools
 finance_tools = [
     get_stock_price,
     get_stock_history,
     compare_stocks,
-    get_company_info
-]
\ No newline at end of file
+    get_company_info,
+    get_technical_indicators,
+    get_correlation_matrix,
+    backtest_strategy,
+    screen_stocks
+]
+
+# Variantes asynchrones (ainvoke) : yfinance étant bloquant, les appels
+# s'exécutent sur le pool partagé et plusieurs tools avancent en parallèle
+for _tool in finance_tools:
+    add_async(_tool)
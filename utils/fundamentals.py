@@ -0,0 +1,346 @@
+"""
+Index local des fondamentaux pour le filtrage d'actions.
+
+Les fondamentaux d'un univers de titres (secteur, industrie, capitalisation,
+PER, BPA, rendement du dividende) sont récupérés en une passe groupée puis
+conservés sous forme de colonnes NumPy (`<fournisseur>/fundamentals.npz`).
+Le filtrage se fait par masques booléens sur ces colonnes, sans appel réseau.
+Quand l'index vieillit, il est reconstruit en tâche de fond pendant que les
+requêtes continuent d'être servies par la version précédente.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.batch_fetch import fetch_infos
+from utils.history_store import STORE_DIR
+from utils.market_cache import FUNDAMENTAL_FIELDS
+from utils.market_data import MarketDataProvider, get_provider, on_provider_change
+from utils.symbols import normalize_text
+
+
+# Âge au-delà duquel l'index est reconstruit en tâche de fond (secondes)
+MAX_AGE = 6 * 60 * 60
+
+# Part minimale de l'univers à obtenir pour qu'une reconstruction remplace l'index
+# (réseau coupé, limite de débit : l'index précédent reste en place)
+MIN_COVERAGE = 0.5
+
+# Univers par défaut : grandes capitalisations américaines, tous secteurs
+DEFAULT_UNIVERSE = (
+    "AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "AVGO", "ORCL", "CRM",
+    "ADBE", "AMD", "INTC", "CSCO", "IBM", "QCOM", "TXN", "NFLX", "DIS", "CMCSA",
+    "T", "VZ", "JPM", "BAC", "WFC", "GS", "MS", "C", "BLK", "V",
+    "MA", "AXP", "BRK-B", "JNJ", "UNH", "LLY", "PFE", "MRK", "ABBV", "TMO",
+    "ABT", "AMGN", "WMT", "COST", "HD", "MCD", "NKE", "SBUX", "PG", "KO",
+    "PEP", "PM", "XOM", "CVX", "COP", "CAT", "BA", "GE", "HON", "UPS",
+    "RTX", "LIN", "NEE", "DUK", "SO", "AMT", "PLD", "SPG",
+)
+
+NUMERIC_COLUMNS = {
+    'market_cap': 'marketCap',
+    'pe_ratio': 'trailingPE',
+    'eps': 'trailingEps',
+    'dividend_yield': 'dividendYield',
+}
+TEXT_COLUMNS = {
+    'sector': 'sector',
+    'industry': 'industry',
+}
+INDEX_FIELDS = tuple(TEXT_COLUMNS.values()) + FUNDAMENTAL_FIELDS
+
+# Noms de secteurs en français -> libellés yfinance
+SECTOR_ALIASES = {
+    'technologie': 'technology',
+    'tech': 'technology',
+    'sante': 'healthcare',
+    'finance': 'financial',
+    'banque': 'financial',
+    'energie': 'energy',
+    'industrie': 'industrials',
+    'consommation': 'consumer',
+    'immobilier': 'real estate',
+    'services publics': 'utilities',
+    'materiaux': 'basic materials',
+    'telecom': 'communication',
+    'communication': 'communication',
+}
+
+
+def load_universe() -> List[str]:
+    """
+    Univers à indexer : variable d'environnement `SCREENER_UNIVERSE`, soit une
+    liste de symboles séparés par des virgules, soit un fichier (un symbole
+    par ligne) ; à défaut, `DEFAULT_UNIVERSE`.
+    """
+    value = os.getenv("SCREENER_UNIVERSE", "").strip()
+    if not value:
+        return list(DEFAULT_UNIVERSE)
+    if os.path.isfile(value):
+        with open(value, 'r') as f:
+            value = ",".join(line.split('#')[0] for line in f)
+    symbols = []
+    for symbol in value.split(','):
+        symbol = symbol.strip().upper()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+def _encode(values: List[str]):
+    """Encode une colonne de texte en (catégories, codes) ; code -1 si absent."""
+    categories = sorted({v for v in values if v})
+    lookup = {v: i for i, v in enumerate(categories)}
+    codes = np.array([lookup.get(v, -1) for v in values], dtype='i2')
+    return np.array(categories, dtype='U'), codes
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def build_table(infos: Dict[str, dict]) -> Dict[str, np.ndarray]:
+    """Construit les colonnes de l'index à partir des dictionnaires `.info`."""
+    symbols = list(infos)
+    table = {'symbol': np.array(symbols, dtype='U')}
+    for column, field in NUMERIC_COLUMNS.items():
+        table[column] = np.array(
+            [_to_float(infos[s].get(field)) for s in symbols], dtype='f8'
+        )
+    for column, field in TEXT_COLUMNS.items():
+        categories, codes = _encode([infos[s].get(field) or "" for s in symbols])
+        table[column + '_categories'] = categories
+        table[column + '_codes'] = codes
+    table['updated_at'] = np.array(time.time())
+    return table
+
+
+class FundamentalsIndex:
+    """Colonnes de fondamentaux d'un univers de titres, persistées sur disque."""
+
+    def __init__(
+        self,
+        root: str = STORE_DIR,
+        universe: Optional[List[str]] = None,
+        max_age: float = MAX_AGE,
+        provider: Optional[MarketDataProvider] = None,
+    ):
+        self.root = root
+        # None : univers configuré au moment de la reconstruction
+        self.universe = universe
+        self.max_age = max_age
+        # None : fournisseur actif au moment de l'appel
+        self.provider = provider
+
+        self._table: Optional[Dict[str, np.ndarray]] = None
+        self.errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+
+    def _provider(self) -> MarketDataProvider:
+        return self.provider or get_provider()
+
+    def _path(self) -> str:
+        return os.path.join(self.root, self._provider().name, "fundamentals.npz")
+
+    def reset(self):
+        """Oublie l'index chargé en mémoire (le disque n'est pas touché)."""
+        with self._lock:
+            self._table = None
+
+    def _load(self) -> Optional[Dict[str, np.ndarray]]:
+        try:
+            with np.load(self._path(), allow_pickle=False) as data:
+                return {key: data[key] for key in data.files}
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, table: Dict[str, np.ndarray]):
+        """Écrit l'index de façon atomique."""
+        path = self._path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", 'wb') as f:
+            np.savez(f, **table)
+        os.replace(path + ".tmp", path)
+
+    def refresh(self, symbols: Optional[List[str]] = None) -> int:
+        """
+        Reconstruit l'index en une passe groupée.
+
+        Args:
+            symbols: Univers à indexer (univers configuré si None)
+
+        Une reconstruction qui n'obtient pas `MIN_COVERAGE` de l'univers ne
+        remplace pas l'index courant : ses erreurs sont seulement conservées
+        dans `errors`.
+
+        Returns:
+            Nombre de titres obtenus
+        """
+        with self._refresh_lock:
+            symbols = symbols or self.universe or load_universe()
+            # Directement auprès du fournisseur : l'index est son propre cache,
+            # et une passe sur l'univers ne doit pas vider le cache des cotations
+            infos, errors = fetch_infos(symbols, INDEX_FIELDS, provider=self._provider())
+            complete = bool(infos) and len(infos) >= MIN_COVERAGE * len(symbols)
+            if complete:
+                table = build_table(infos)
+                self._save(table)
+            with self._lock:
+                if complete:
+                    self._table = table
+                self.errors = errors
+                self.refreshes += 1
+            return len(infos)
+
+    def refresh_async(self) -> bool:
+        """Lance une reconstruction en tâche de fond (sauf si une est déjà en cours)."""
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._refresh_thread = threading.Thread(
+                target=self.refresh, name="fundamentals-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+            return True
+
+    def table(self) -> Dict[str, np.ndarray]:
+        """
+        Colonnes de l'index courant.
+
+        Au premier appel, l'index est relu depuis le disque, ou construit s'il
+        n'existe pas encore. S'il est plus ancien que `max_age`, la version
+        actuelle est retournée et une reconstruction est lancée en arrière-plan.
+
+        Raises:
+            RuntimeError: Aucun index sur disque et la construction a échoué
+        """
+        with self._lock:
+            table = self._table
+        if table is None:
+            table = self._load()
+            if table is None:
+                self.refresh()
+                with self._lock:
+                    table, errors = self._table, dict(self.errors)
+                if table is None:
+                    sample = ", ".join(f"{s}: {e}" for s, e in list(errors.items())[:3])
+                    raise RuntimeError(
+                        f"Index des fondamentaux indisponible ({len(errors)} titres en erreur"
+                        + (f" - {sample}" if sample else "") + ")"
+                    )
+                return table
+            with self._lock:
+                self._table = table
+        if time.time() - float(table['updated_at']) >= self.max_age:
+            self.refresh_async()
+        return table
+
+    def screen(
+        self,
+        sector: str = "",
+        industry: str = "",
+        min_market_cap: Optional[float] = None,
+        max_market_cap: Optional[float] = None,
+        min_pe: Optional[float] = None,
+        max_pe: Optional[float] = None,
+        min_dividend_yield: Optional[float] = None,
+        min_eps: Optional[float] = None,
+        sort_by: str = "market_cap",
+        ascending: bool = False,
+        limit: int = 20,
+    ) -> List[dict]:
+        """
+        Filtre et classe les titres de l'index.
+
+        Args:
+            sector: Secteur recherché (sous-chaîne, accents et casse ignorés ; noms français acceptés)
+            industry: Industrie recherchée (sous-chaîne)
+            min_market_cap / max_market_cap: Bornes de capitalisation (en dollars)
+            min_pe / max_pe: Bornes du PER (les PER négatifs ou absents sont exclus si une borne est donnée)
+            min_dividend_yield: Rendement du dividende minimal (fraction, 0.02 = 2%)
+            min_eps: BPA minimal
+            sort_by: Colonne de tri (market_cap, pe_ratio, eps, dividend_yield)
+            ascending: Tri croissant
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Lignes retenues (dictionnaires symbol, sector, industry et colonnes numériques)
+        """
+        if sort_by not in NUMERIC_COLUMNS:
+            raise ValueError(f"Tri inconnu: {sort_by} ({', '.join(NUMERIC_COLUMNS)})")
+        table = self.table()
+        mask = np.ones(len(table['symbol']), dtype=bool)
+
+        for column, query in (('sector', sector), ('industry', industry)):
+            query = normalize_text(query)
+            if not query:
+                continue
+            query = SECTOR_ALIASES.get(query, query) if column == 'sector' else query
+            # Le filtre texte porte sur les catégories, puis sur les codes
+            categories = table[column + '_categories']
+            matching = [i for i, name in enumerate(categories) if query in normalize_text(str(name))]
+            mask &= np.isin(table[column + '_codes'], matching)
+
+        bounds = (
+            ('market_cap', min_market_cap, max_market_cap),
+            ('pe_ratio', min_pe, max_pe),
+            ('dividend_yield', min_dividend_yield, None),
+            ('eps', min_eps, None),
+        )
+        with np.errstate(invalid='ignore'):
+            for column, low, high in bounds:
+                values = table[column]
+                if column == 'pe_ratio' and (low is not None or high is not None):
+                    mask &= values > 0
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+
+        rows = np.flatnonzero(mask)
+        keys = table[sort_by][rows]
+        # Valeurs absentes en fin de classement, quel que soit le sens
+        order = np.argsort(np.where(np.isnan(keys), np.inf, keys if ascending else -keys), kind='stable')
+        rows = rows[order[:limit]]
+
+        results = []
+        for row in rows:
+            item = {'symbol': str(table['symbol'][row])}
+            for column in TEXT_COLUMNS:
+                code = table[column + '_codes'][row]
+                item[column] = str(table[column + '_categories'][code]) if code >= 0 else ""
+            for column in NUMERIC_COLUMNS:
+                item[column] = float(table[column][row])
+            results.append(item)
+        return results
+
+    def stats(self) -> dict:
+        """Taille et âge de l'index courant, erreurs de la dernière reconstruction."""
+        with self._lock:
+            table = self._table
+            errors = dict(self.errors)
+            refreshing = self._refresh_thread is not None and self._refresh_thread.is_alive()
+        if table is None:
+            return {'symbols': 0, 'age': None, 'refreshes': self.refreshes,
+                    'refreshing': refreshing, 'errors': errors}
+        return {
+            'symbols': len(table['symbol']),
+            'age': time.time() - float(table['updated_at']),
+            'refreshes': self.refreshes,
+            'refreshing': refreshing,
+            'errors': errors,
+        }
+
+
+# Instance partagée par les tools
+fundamentals_index = FundamentalsIndex()
+on_provider_change(fundamentals_index.reset)
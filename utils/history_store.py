@@ -0,0 +1,284 @@
+"""
+Stockage local des historiques OHLCV quotidiens.
+
+Chaque symbole est conservé sur disque sous forme d'un tableau NumPy
+structuré (`<fournisseur>/<SYMBOLE>.npy`, relu en mémoire mappée)
+accompagné d'un petit fichier de métadonnées JSON. Une requête d'historique
+est servie depuis le disque ; seules les barres manquantes depuis le dernier
+horodatage stocké sont téléchargées.
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.market_data import MarketDataProvider, get_provider, on_provider_change
+from utils.singleflight import market_flight
+
+
+STORE_DIR = os.getenv("MARKET_DATA_DIR", ".market_data")
+
+# Délai minimal entre deux vérifications de barres manquantes pour un symbole
+REFRESH_INTERVAL = 15 * 60
+
+BAR_DTYPE = np.dtype([
+    ('ts', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+COLUMNS = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+}
+
+_PERIOD_RE = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+
+def period_start(period: str, today: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Date de début calendaire à couvrir pour une période yfinance.
+
+    Args:
+        period: Période (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+        today: Date de référence (aujourd'hui par défaut)
+
+    Returns:
+        Date de début, ou None pour `max`
+    """
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "max":
+        return None
+    if period == "ytd":
+        return today.replace(month=1, day=1)
+
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Période invalide: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+
+    if unit == "d":
+        # Périodes en jours de bourse : marge pour les week-ends et jours fériés
+        return today - timedelta(days=count * 2 + 7)
+    if unit == "wk":
+        return today - timedelta(weeks=count)
+    if unit == "mo":
+        return (pd.Timestamp(today) - pd.DateOffset(months=count)).to_pydatetime()
+    return (pd.Timestamp(today) - pd.DateOffset(years=count)).to_pydatetime()
+
+
+def frame_to_bars(frame: pd.DataFrame) -> np.ndarray:
+    """Convertit un DataFrame yfinance en tableau structuré de barres quotidiennes."""
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    if frame.empty:
+        return bars
+
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    bars['ts'] = index.normalize().asi8
+    for field, column in COLUMNS.items():
+        bars[field] = frame[column].to_numpy(dtype='f8')
+    return bars
+
+
+def bars_to_frame(bars: np.ndarray) -> pd.DataFrame:
+    """Convertit un tableau de barres en DataFrame (index de dates, colonnes OHLCV)."""
+    return pd.DataFrame(
+        {column: np.asarray(bars[field]) for field, column in COLUMNS.items()},
+        index=pd.DatetimeIndex(np.asarray(bars['ts']).astype('datetime64[ns]'), name='Date'),
+    )
+
+
+def merge_bars(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """Fusionne deux séries de barres triées ; en cas de doublon, `new` l'emporte."""
+    if len(old) == 0:
+        return np.array(new, dtype=BAR_DTYPE)
+    if len(new) == 0:
+        return np.array(old, dtype=BAR_DTYPE)
+
+    combined = np.concatenate([np.asarray(old), new])[::-1]
+    _, first = np.unique(combined['ts'], return_index=True)
+    return combined[first]
+
+
+class HistoryStore:
+    """Historiques OHLCV quotidiens persistés sur disque, complétés à la demande."""
+
+    def __init__(
+        self,
+        root: str = STORE_DIR,
+        refresh_interval: float = REFRESH_INTERVAL,
+        provider: Optional[MarketDataProvider] = None,
+    ):
+        self.root = root
+        self.refresh_interval = refresh_interval
+        # None : fournisseur actif au moment de l'appel
+        self.provider = provider
+
+        # (fournisseur, symbole) -> {"bars", "coverage_start", "checked_at"}
+        self._memory = {}
+        # Protège `_memory` et les compteurs (accès depuis le pool de batch_fetch)
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.fetches = 0
+
+    def _provider(self) -> MarketDataProvider:
+        return self.provider or get_provider()
+
+    def clear_memory(self):
+        """Oublie les états chargés en mémoire (le disque n'est pas touché)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _fetch(self, symbol: str, start: Optional[datetime]) -> np.ndarray:
+        """Télécharge les barres depuis `start`, en partageant les appels concurrents identiques."""
+        provider = self._provider()
+        with self._lock:
+            self.fetches += 1
+        frame = market_flight.do(
+            ("history", provider.name, symbol, start), provider.get_history, symbol, start
+        )
+        return frame_to_bars(frame)
+
+    def _lock_for(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _paths(self, symbol: str):
+        base = os.path.join(self.root, self._provider().name, symbol)
+        return base + ".npy", base + ".json"
+
+    def _load(self, symbol: str) -> dict:
+        """Charge l'état d'un symbole (mémoire, puis disque)."""
+        key = (self._provider().name, symbol)
+        with self._lock:
+            state = self._memory.get(key)
+        if state is not None:
+            return state
+
+        bars_path, meta_path = self._paths(symbol)
+        state = {"bars": np.empty(0, dtype=BAR_DTYPE), "coverage_start": "", "checked_at": 0.0}
+        try:
+            state["bars"] = np.load(bars_path, mmap_mode='r')
+            with open(meta_path, 'r') as f:
+                state["coverage_start"] = json.load(f).get("coverage_start", "")
+        except (OSError, ValueError):
+            pass
+
+        with self._lock:
+            # Un autre thread a pu charger le symbole entre-temps
+            return self._memory.setdefault(key, state)
+
+    def _save(self, symbol: str, bars: np.ndarray, coverage_start: Optional[str]):
+        """Écrit les barres et les métadonnées de façon atomique."""
+        bars_path, meta_path = self._paths(symbol)
+        os.makedirs(os.path.dirname(bars_path), exist_ok=True)
+
+        with open(bars_path + ".tmp", 'wb') as f:
+            np.save(f, bars)
+        os.replace(bars_path + ".tmp", bars_path)
+
+        with open(meta_path + ".tmp", 'w') as f:
+            json.dump({"coverage_start": coverage_start}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    @staticmethod
+    def _covers(coverage_start, start: Optional[datetime]) -> bool:
+        """Vrai si la couverture stockée inclut la date de début demandée."""
+        if coverage_start is None:
+            return True  # historique complet ("max")
+        if not coverage_start:
+            return False
+        return start is not None and coverage_start <= start.strftime("%Y-%m-%d")
+
+    def _refresh(self, symbol: str, start: Optional[datetime]) -> dict:
+        """Complète le stockage d'un symbole pour couvrir `start` et les barres récentes."""
+        state = self._load(symbol)
+        bars = state["bars"]
+        coverage_start = state["coverage_start"]
+
+        if not self._covers(coverage_start, start) or len(bars) == 0:
+            # Période demandée plus longue que celle stockée : on télécharge tout l'intervalle
+            fresh = self._fetch(symbol, start)
+            bars = merge_bars(bars, fresh)
+            coverage_start = None if start is None else start.strftime("%Y-%m-%d")
+        elif time.time() - state["checked_at"] >= self.refresh_interval:
+            # On recharge à partir de l'avant-dernière barre : la dernière peut être
+            # incomplète, l'avant-dernière sert à détecter un réajustement (split, dividende)
+            overlap = bars[-2:] if len(bars) > 1 else bars[-1:]
+            gap_start = pd.Timestamp(int(overlap['ts'][0])).to_pydatetime()
+            fresh = self._fetch(symbol, gap_start)
+
+            if len(fresh) and len(overlap) > 1 and fresh['ts'][0] == overlap['ts'][0]:
+                if not np.isclose(fresh['close'][0], overlap['close'][0], rtol=1e-4):
+                    # Prix historiques réajustés : on reconstruit la couverture complète
+                    refetch_start = None if coverage_start is None else datetime.strptime(coverage_start, "%Y-%m-%d")
+                    fresh = self._fetch(symbol, refetch_start)
+                    bars = np.empty(0, dtype=BAR_DTYPE)
+            bars = merge_bars(bars, fresh)
+        else:
+            return state
+
+        self._save(symbol, bars, coverage_start)
+        state = {"bars": bars, "coverage_start": coverage_start, "checked_at": time.time()}
+        with self._lock:
+            self._memory[(self._provider().name, symbol)] = state
+        return state
+
+    def get_bars(self, symbol: str, period: str = "1mo") -> np.ndarray:
+        """
+        Retourne les barres quotidiennes d'un symbole sur une période.
+
+        Args:
+            symbol: Symbole de l'action
+            period: Période yfinance (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+
+        Returns:
+            Tableau structuré (ts, open, high, low, close, volume) trié par date
+        """
+        symbol = symbol.strip().upper()
+        start = period_start(period)
+
+        with self._lock_for(symbol):
+            bars = self._refresh(symbol, start)["bars"]
+
+        match = _PERIOD_RE.match(period)
+        if match and match.group(2) == "d":
+            return bars[-int(match.group(1)):]
+        if start is None:
+            return bars
+        first = np.searchsorted(bars['ts'], pd.Timestamp(start).value)
+        return bars[first:]
+
+    def get_history(self, symbol: str, period: str = "1mo") -> pd.DataFrame:
+        """Comme `get_bars`, sous forme de DataFrame (colonnes Open/High/Low/Close/Volume)."""
+        return bars_to_frame(self.get_bars(symbol, period))
+
+    def stats(self) -> dict:
+        """Nombre de symboles en mémoire et de téléchargements effectués."""
+        with self._lock:
+            return {'symbols': len(self._memory), 'fetches': self.fetches}
+
+
+# Instance partagée par les tools et l'interface Streamlit
+history_store = HistoryStore()
+on_provider_change(history_store.clear_memory)
+
+
+def get_history(symbol: str, period: str = "1mo") -> pd.DataFrame:
+    """Raccourci vers le stockage partagé des historiques."""
+    return history_store.get_history(symbol, period)
@@ -0,0 +1,143 @@
+"""
+Sessions HTTP partagées.
+
+Chaque appel réseau réutilise des connexions déjà ouvertes (keep-alive)
+au lieu de refaire la poignée de main TCP/TLS : une `requests.Session`
+pour le code synchrone, un `httpx.AsyncClient` par boucle d'événements
+pour le code asynchrone (un client httpx est lié à la boucle qui l'a créé).
+
+Le débit de chaque fournisseur distant peut être plafonné : chaque requête
+envoyée au fournisseur consomme un jeton de son limiteur, quel que soit le
+tool ou l'étape (préchargement, comparaison...) qui l'émet. `set_rate_limit`
+fixe une limite pour tout le processus ; `rate_limits` installe des limiteurs
+le temps d'un bloc (un appel d'agent) et les retire à la sortie.
+"""
+import asyncio
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+import requests
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from requests.adapters import HTTPAdapter
+
+
+# Connexions conservées par hôte
+POOL_SIZE = 16
+
+TIMEOUT = 100
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+# Limiteur de débit par fournisseur ("market_data", "search"), partagé par le processus
+_rate_limiters: Dict[str, InMemoryRateLimiter] = {}
+
+# Limiteurs installés par `rate_limits` ; le plus récent prime sur la limite du processus
+_scoped_limiters: Dict[str, List[InMemoryRateLimiter]] = {}
+_limits_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Session `requests` partagée par le processus."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Client `httpx` partagé par la boucle d'événements courante."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """Ferme le client de la boucle courante (à appeler avant d'arrêter la boucle)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def set_rate_limit(provider: str, requests_per_second: Optional[float]):
+    """
+    Plafonne le débit des requêtes envoyées à un fournisseur, pour tout le processus.
+
+    Args:
+        provider: Nom du fournisseur ("market_data", "search")
+        requests_per_second: Débit maximal, ou None pour lever la limite
+    """
+    if requests_per_second is None:
+        _rate_limiters.pop(provider, None)
+        return
+    if requests_per_second <= 0:
+        raise ValueError("Le débit doit être strictement positif")
+    _rate_limiters[provider] = InMemoryRateLimiter(
+        requests_per_second=requests_per_second,
+        max_bucket_size=max(requests_per_second, 1),
+    )
+
+
+@contextmanager
+def rate_limits(limiters: Dict[str, InMemoryRateLimiter]) -> Iterator[None]:
+    """
+    Applique des limiteurs par fournisseur le temps d'un bloc.
+
+    Les blocs peuvent s'imbriquer ou se chevaucher (requêtes concurrentes) :
+    chacun retire à la sortie les limiteurs qu'il a installés, et la limite
+    du processus (`set_rate_limit`) s'applique de nouveau quand il n'en reste
+    aucun.
+
+    Args:
+        limiters: Limiteur par nom de fournisseur ("market_data", "search")
+    """
+    with _limits_lock:
+        for provider, limiter in limiters.items():
+            _scoped_limiters.setdefault(provider, []).append(limiter)
+    try:
+        yield
+    finally:
+        with _limits_lock:
+            for provider, limiter in limiters.items():
+                stack = _scoped_limiters.get(provider, [])
+                for i in range(len(stack) - 1, -1, -1):
+                    if stack[i] is limiter:
+                        del stack[i]
+                        break
+                if not stack:
+                    _scoped_limiters.pop(provider, None)
+
+
+def _limiter(provider: str) -> Optional[InMemoryRateLimiter]:
+    with _limits_lock:
+        stack = _scoped_limiters.get(provider)
+        return stack[-1] if stack else _rate_limiters.get(provider)
+
+
+def throttle(provider: str):
+    """Attend le jeton d'une requête vers `provider` (immédiat sans limite)."""
+    limiter = _limiter(provider)
+    if limiter is not None:
+        limiter.acquire()
+
+
+async def athrottle(provider: str):
+    """Comme `throttle`, sans bloquer la boucle d'événements."""
+    limiter = _limiter(provider)
+    if limiter is not None:
+        await limiter.aacquire()
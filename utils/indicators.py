@@ -0,0 +1,218 @@
+"""
+Indicateurs techniques vectorisés.
+
+Toutes les fonctions travaillent sur des tableaux 2D (dates × symboles) :
+un seul appel calcule l'indicateur pour tous les symboles d'un panel, sans
+boucle Python sur les lignes. Les moyennes exponentielles s'appuient sur
+`DataFrame.ewm` (implémentation compilée de pandas), appliqué à toutes les
+colonnes à la fois.
+"""
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+TRADING_DAYS = 252
+
+
+def _as_2d(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype='f8')
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _rolling_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """Fenêtres glissantes (T-window+1 × N × window) sans copie."""
+    return sliding_window_view(values, window, axis=0)
+
+
+def _pad(values: np.ndarray, window: int) -> np.ndarray:
+    """Complète par des NaN les `window - 1` premières lignes d'un calcul glissant."""
+    padding = np.full((window - 1,) + values.shape[1:], np.nan)
+    return np.concatenate([padding, values], axis=0)
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Propage la dernière valeur connue sur les NaN (jours fériés propres à un marché)."""
+    values = _as_2d(values)
+    rows = np.where(~np.isnan(values), np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return values[rows, np.arange(values.shape[1])]
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Moyenne mobile simple (NaN tant que la fenêtre n'est pas complète)."""
+    values = _as_2d(values)
+    if len(values) < window:
+        return np.full(values.shape, np.nan)
+
+    valid = ~np.isnan(values)
+    sums = np.cumsum(np.where(valid, values, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    sums = np.concatenate([np.zeros((1, values.shape[1])), sums])
+    counts = np.concatenate([np.zeros((1, values.shape[1])), counts])
+
+    window_sums = sums[window:] - sums[:-window]
+    window_counts = counts[window:] - counts[:-window]
+    means = np.where(window_counts == window, window_sums / window, np.nan)
+    return _pad(means, window)
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Écart-type glissant (échantillon, ddof=1)."""
+    values = _as_2d(values)
+    if len(values) < window:
+        return np.full(values.shape, np.nan)
+    return _pad(_rolling_windows(values, window).std(axis=-1, ddof=1), window)
+
+
+def ema(values: np.ndarray, span: int = None, alpha: float = None) -> np.ndarray:
+    """Moyenne mobile exponentielle (récursive, `adjust=False`)."""
+    values = _as_2d(values)
+    smoothed = pd.DataFrame(values).ewm(span=span, alpha=alpha, adjust=False, min_periods=1).mean()
+    return smoothed.to_numpy()
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Relative Strength Index avec lissage de Wilder."""
+    close = _as_2d(close)
+    delta = np.diff(close, axis=0, prepend=np.nan)
+    gains = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+    losses = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+
+    avg_gain = ema(gains, alpha=1 / window)
+    avg_loss = ema(losses, alpha=1 / window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = 100 - 100 / (1 + avg_gain / avg_loss)
+    result = np.where(avg_loss == 0, 100.0, result)
+
+    # Pas de valeur tant que `window` variations ne sont pas disponibles
+    observed = np.cumsum(~np.isnan(delta), axis=0)
+    return np.where(observed >= window, result, np.nan)
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """MACD : ligne, signal et histogramme."""
+    line = ema(close, span=fast) - ema(close, span=slow)
+    signal_line = ema(line, span=signal)
+    return {'macd': line, 'signal': signal_line, 'hist': line - signal_line}
+
+
+def bollinger(close: np.ndarray, window: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bandes de Bollinger et %B."""
+    middle = sma(close, window)
+    width = num_std * rolling_std(close, window)
+    upper, lower = middle + width, middle - width
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_b = (_as_2d(close) - lower) / (upper - lower)
+    return {'middle': middle, 'upper': upper, 'lower': lower, 'percent_b': percent_b}
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Average True Range avec lissage de Wilder."""
+    high, low, close = _as_2d(high), _as_2d(low), _as_2d(close)
+    previous_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    true_range = np.fmax(
+        high - low,
+        np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)),
+    )
+    return ema(true_range, alpha=1 / window)
+
+
+def volatility(close: np.ndarray, window: int = 20) -> np.ndarray:
+    """Volatilité annualisée des rendements logarithmiques sur une fenêtre glissante."""
+    close = _as_2d(close)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_returns = np.diff(np.log(close), axis=0, prepend=np.nan)
+    return rolling_std(log_returns, window) * np.sqrt(TRADING_DAYS)
+
+
+# nom -> (paramètres par défaut, champs OHLC requis)
+INDICATORS = {
+    'sma': ((20,), ('close',)),
+    'ema': ((20,), ('close',)),
+    'rsi': ((14,), ('close',)),
+    'macd': ((12, 26, 9), ('close',)),
+    'bbands': ((20, 2), ('close',)),
+    'atr': ((14,), ('high', 'low', 'close')),
+    'vol': ((20,), ('close',)),
+}
+
+_SPEC_RE = re.compile(r'^([a-z]+)((?:_\d+(?:\.\d+)?)*)$')
+
+
+def parse_specs(indicators: str) -> List[Tuple[str, tuple]]:
+    """
+    Analyse une liste d'indicateurs du type "sma_20,ema_50,rsi_14,macd,bbands_20_2".
+
+    Returns:
+        Liste de (nom, paramètres), paramètres par défaut complétés
+    """
+    specs = []
+    for raw in indicators.split(','):
+        raw = raw.strip().lower()
+        if not raw:
+            continue
+        match = _SPEC_RE.match(raw)
+        if not match or match.group(1) not in INDICATORS:
+            raise ValueError(
+                f"Indicateur inconnu: {raw} (disponibles: {', '.join(INDICATORS)})"
+            )
+        name = match.group(1)
+        defaults = INDICATORS[name][0]
+        given = [float(p) if '.' in p else int(p) for p in match.group(2).split('_')[1:]]
+        specs.append((name, tuple(given[:len(defaults)]) + defaults[len(given):]))
+    return specs
+
+
+def required_fields(specs: List[Tuple[str, tuple]]) -> List[str]:
+    """Champs OHLC nécessaires au calcul d'une liste d'indicateurs."""
+    fields = ['close']
+    for name, _ in specs:
+        for field in INDICATORS[name][1]:
+            if field not in fields:
+                fields.append(field)
+    return fields
+
+
+def compute_indicators(fields: Dict[str, np.ndarray], specs: List[Tuple[str, tuple]]) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Calcule plusieurs indicateurs sur un panel en une passe.
+
+    Args:
+        fields: Champs OHLC alignés (dates × symboles), ex: Panel.fields
+        specs: Indicateurs demandés, issus de `parse_specs`
+
+    Returns:
+        Libellé de l'indicateur -> {composante: tableau (dates × symboles)}
+    """
+    close = fields['close']
+    results = {}
+    for name, params in specs:
+        if name == 'sma':
+            label, value = f"SMA({params[0]})", {'value': sma(close, params[0])}
+        elif name == 'ema':
+            label, value = f"EMA({params[0]})", {'value': ema(close, span=params[0])}
+        elif name == 'rsi':
+            label, value = f"RSI({params[0]})", {'value': rsi(close, params[0])}
+        elif name == 'macd':
+            label, value = f"MACD({params[0]},{params[1]},{params[2]})", macd(close, *params)
+        elif name == 'bbands':
+            label, value = f"Bollinger({params[0]},{params[1]:g})", bollinger(close, *params)
+        elif name == 'atr':
+            label, value = f"ATR({params[0]})", {'value': atr(fields['high'], fields['low'], close, params[0])}
+        else:
+            label, value = f"Vol({params[0]})", {'value': volatility(close, params[0])}
+        results[label] = value
+    return results
+
+
+def last_valid(values: np.ndarray) -> np.ndarray:
+    """Dernière valeur non-NaN de chaque colonne (NaN si aucune)."""
+    values = _as_2d(values)
+    valid = ~np.isnan(values)
+    last_rows = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+    result = values[last_rows, np.arange(values.shape[1])]
+    return np.where(valid.any(axis=0), result, np.nan)
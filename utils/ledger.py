@@ -0,0 +1,138 @@
+"""
+Calculs groupés sur un relevé de positions.
+
+Un relevé (CSV ou JSON) est ramené à des colonnes NumPy : coût d'achat et
+valeur actuelle de chaque ligne. ROI, plus/moins-values et poids sont
+ensuite calculés pour toutes les positions en une seule passe vectorisée,
+au lieu d'un appel de tool par position.
+"""
+import io
+import json
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.symbols import normalize_text
+
+
+# Noms de colonnes acceptés (français / anglais) -> nom canonique
+COLUMN_ALIASES = {
+    'symbol': 'symbol', 'symbole': 'symbol', 'ticker': 'symbol', 'titre': 'symbol', 'name': 'symbol', 'nom': 'symbol',
+    'quantity': 'quantity', 'quantite': 'quantity', 'qty': 'quantity', 'shares': 'quantity', 'actions': 'quantity',
+    'buy_price': 'buy_price', 'prix_achat': 'buy_price', 'purchase_price': 'buy_price', 'pru': 'buy_price', 'cost_price': 'buy_price',
+    'current_price': 'current_price', 'prix_actuel': 'current_price', 'price': 'current_price', 'cours': 'current_price',
+    'sell_price': 'current_price', 'prix_vente': 'current_price',
+    'cost': 'cost', 'invested': 'cost', 'investi': 'cost', 'cout': 'cost', 'initial_investment': 'cost',
+    'value': 'value', 'valeur': 'value', 'current_value': 'value', 'final_value': 'value', 'valeur_actuelle': 'value',
+}
+
+COLUMNS = ('symbol', 'quantity', 'buy_price', 'current_price', 'cost', 'value')
+
+
+def parse_numbers(values: str) -> np.ndarray:
+    """Liste de nombres séparés par des virgules ou points-virgules."""
+    items = [v.strip() for v in values.replace(';', ',').split(',') if v.strip()]
+    return np.array([float(v.replace(' ', '').replace('_', '')) for v in items], dtype='f8')
+
+
+def _canonical(name: str) -> Optional[str]:
+    return COLUMN_ALIASES.get(normalize_text(str(name)).replace(' ', '_'))
+
+
+def parse_ledger(ledger: str) -> pd.DataFrame:
+    """
+    Lit un relevé de positions.
+
+    Args:
+        ledger: JSON (liste d'objets ou objet de listes) ou CSV avec en-tête,
+            séparé par des virgules ou des points-virgules ; colonnes reconnues :
+            symbol, quantity, buy_price, current_price, cost, value (et alias français)
+
+    Returns:
+        DataFrame aux colonnes canoniques (NaN pour les valeurs absentes)
+    """
+    text = ledger.strip()
+    if not text:
+        raise ValueError("Relevé de positions vide")
+
+    if text[0] in '[{':
+        return make_ledger(pd.DataFrame(json.loads(text)))
+    first_line = text.splitlines()[0]
+    sep = ';' if first_line.count(';') > first_line.count(',') else ','
+    return make_ledger(pd.read_csv(io.StringIO(text), sep=sep, skipinitialspace=True))
+
+
+def make_ledger(columns) -> pd.DataFrame:
+    """
+    Construit un relevé à partir de colonnes (DataFrame ou dictionnaire de listes).
+
+    Returns:
+        DataFrame aux colonnes canoniques (NaN pour les valeurs absentes)
+    """
+    frame = pd.DataFrame(columns)
+    renamed = {}
+    for column in frame.columns:
+        canonical = _canonical(column)
+        if canonical is None:
+            raise ValueError(f"Colonne inconnue: {column} (attendues: {', '.join(COLUMNS)})")
+        renamed[column] = canonical
+    frame = frame.rename(columns=renamed)
+
+    for column in COLUMNS:
+        if column not in frame.columns:
+            frame[column] = np.nan
+    frame['symbol'] = frame['symbol'].fillna('').astype(str).str.strip().str.upper()
+    numeric = [c for c in COLUMNS if c != 'symbol']
+    frame[numeric] = frame[numeric].apply(pd.to_numeric, errors='coerce')
+    return frame[list(COLUMNS)].reset_index(drop=True)
+
+
+def missing_prices(frame: pd.DataFrame) -> List[str]:
+    """Symboles dont la valeur actuelle ne peut être déduite du relevé."""
+    unknown = frame['value'].isna() & frame['current_price'].isna() & (frame['symbol'] != '')
+    return list(dict.fromkeys(frame.loc[unknown, 'symbol']))
+
+
+def position_metrics(frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Coût, valeur, plus/moins-value, ROI et poids de chaque position.
+
+    Le coût vaut `cost` ou `quantity × buy_price` ; la valeur vaut `value` ou
+    `quantity × current_price`.
+
+    Returns:
+        Colonnes par position (cost, value, pnl, roi, weight, valid : coût et
+        valeur connus) et totaux (total_cost, total_value, total_pnl, total_roi)
+    """
+    quantity = frame['quantity'].to_numpy(dtype='f8')
+    cost = frame['cost'].to_numpy(dtype='f8')
+    value = frame['value'].to_numpy(dtype='f8')
+    cost = np.where(np.isnan(cost), quantity * frame['buy_price'].to_numpy(dtype='f8'), cost)
+    value = np.where(np.isnan(value), quantity * frame['current_price'].to_numpy(dtype='f8'), value)
+
+    invalid = np.isnan(cost) | np.isnan(value)
+    if invalid.all():
+        raise ValueError("Aucune position complète (coût et valeur requis)")
+
+    pnl = value - cost
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(cost != 0, pnl / np.abs(cost), np.nan)
+
+    total_cost = np.nansum(np.where(invalid, np.nan, cost))
+    total_value = np.nansum(np.where(invalid, np.nan, value))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(invalid, np.nan, value / total_value)
+
+    return {
+        'cost': cost,
+        'value': value,
+        'pnl': pnl,
+        'roi': roi,
+        'weight': weight,
+        'valid': ~invalid,
+        'total_cost': total_cost,
+        'total_value': total_value,
+        'total_pnl': total_value - total_cost,
+        'total_roi': (total_value - total_cost) / total_cost if total_cost else np.nan,
+    }
@@ -0,0 +1,198 @@
+"""
+Cache disque des réponses LLM (SQLite).
+
+Branché sur les `ChatOpenAI` via `cache=llm_cache` : un appel dont le
+modèle, les paramètres, les tools liés et les messages sont identiques à un
+appel précédent est servi depuis le disque, sans requête OpenAI. La clé
+est l'empreinte de la chaîne de paramètres LangChain (modèle, température,
+tools) et des messages sérialisés. Les entrées expirent après un TTL ; au-delà
+d'un nombre maximal d'entrées, les moins récemment utilisées sont évincées.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import warnings
+from typing import Any, Optional, Sequence
+
+from langchain_core._api import LangChainBetaWarning
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+from utils.history_store import STORE_DIR
+
+
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(STORE_DIR, "llm_cache.sqlite"))
+
+# Durée de vie d'une réponse (secondes)
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 6 * 60 * 60))
+
+# Nombre maximal de réponses conservées
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 20_000))
+
+# Insertions entre deux passes d'éviction
+EVICTION_INTERVAL = 100
+
+# Prix en $ par million de tokens (entrée, sortie), pour estimer les économies
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4.1-mini': (0.40, 1.60),
+    'gpt-4.1': (2.00, 8.00),
+}
+
+_MODEL_RE = re.compile(r"""["']model(?:_name)?["']\s*[:,]\s*["']([^"']+)["']""")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def _price(model: str):
+    # Le préfixe le plus long l'emporte (gpt-4o-mini avant gpt-4o)
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PRICES[name]
+    return (0.0, 0.0)
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Cache LangChain persistant, avec TTL, éviction LRU et statistiques d'économies.
+
+    Args:
+        path: Fichier SQLite (créé au besoin)
+        ttl: Durée de vie des réponses en secondes
+        max_entries: Nombre d'entrées au-delà duquel les moins récemment utilisées sont évincées
+            (vérifié toutes les `EVICTION_INTERVAL` insertions)
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._inserts = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_input_tokens = 0
+        self.saved_output_tokens = 0
+        self.saved_cost = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Ouverture paresseuse : l'import ne crée aucun fichier
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Réponse en cache pour ce prompt et ces paramètres, ou None."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value, created, model FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE llm_cache SET accessed = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            conn.commit()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            generations = loads(row[0])
+        self._account(generations, row[2])
+        return generations
+
+    def _account(self, generations, model: str):
+        """Comptabilise l'appel évité ; l'usage de la réponse servie est remis à zéro."""
+        input_tokens = output_tokens = 0
+        for generation in generations:
+            message = getattr(generation, 'message', None)
+            usage = getattr(message, 'usage_metadata', None)
+            if usage:
+                input_tokens += usage.get('input_tokens', 0)
+                output_tokens += usage.get('output_tokens', 0)
+                message.usage_metadata = {'input_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+        price_in, price_out = _price(model or "")
+        with self._lock:
+            self.hits += 1
+            self.saved_input_tokens += input_tokens
+            self.saved_output_tokens += output_tokens
+            self.saved_cost += (input_tokens * price_in + output_tokens * price_out) / 1e6
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Enregistre une réponse."""
+        match = _MODEL_RE.search(llm_string)
+        now = time.time()
+        value = dumps(list(return_val))
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, value, created, accessed, hits) VALUES (?, ?, ?, ?, ?, 0)",
+                (self._key(prompt, llm_string), match.group(1) if match else None, value, now, now),
+            )
+            self._inserts += 1
+            if self._inserts % EVICTION_INTERVAL == 0:
+                self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM llm_cache WHERE created < ?", (now - self.ttl,))
+        excess = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Vide le cache."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def stats(self) -> dict:
+        """Appels servis depuis le cache, taux de succès et économies estimées."""
+        with self._lock:
+            conn = self._connection()
+            entries, stored_hits = conn.execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM llm_cache").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'saved_tokens': self.saved_input_tokens + self.saved_output_tokens,
+                'saved_cost': round(self.saved_cost, 6),
+                'lifetime_hits': stored_hits,
+            }
+
+
+# Cache partagé par tous les agents ; LLM_CACHE=0 le désactive
+llm_cache: Optional[SQLiteLLMCache] = SQLiteLLMCache() if os.getenv("LLM_CACHE", "1") != "0" else None
@@ -0,0 +1,161 @@
+"""
+Cache process-wide des cotations et métadonnées de marché.
+
+Toutes les lectures de cotations passent par ce cache : chaque
+champ a sa propre durée de vie (les prix expirent vite, le profil de
+l'entreprise beaucoup plus lentement) et le nombre de symboles conservés
+est borné par une éviction LRU. Les requêtes simultanées sur un même
+symbole sont regroupées en un seul appel amont.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from utils.market_data import MarketDataProvider, get_provider, on_provider_change
+from utils.singleflight import market_flight
+
+
+# Durées de vie par champ (secondes)
+QUOTE_TTL = 60
+FUNDAMENTALS_TTL = 15 * 60
+PROFILE_TTL = 24 * 60 * 60
+
+QUOTE_FIELDS = (
+    'currentPrice', 'regularMarketPrice', 'previousClose',
+    'dayHigh', 'dayLow', 'volume',
+)
+FUNDAMENTAL_FIELDS = (
+    'marketCap', 'trailingPE', 'trailingEps', 'dividendYield',
+)
+PROFILE_FIELDS = (
+    'longName', 'sector', 'industry', 'country', 'fullTimeEmployees',
+    'longBusinessSummary', 'website',
+)
+
+DEFAULT_FIELD_TTLS = {
+    **{field: QUOTE_TTL for field in QUOTE_FIELDS},
+    **{field: FUNDAMENTALS_TTL for field in FUNDAMENTAL_FIELDS},
+    **{field: PROFILE_TTL for field in PROFILE_FIELDS},
+}
+
+
+class QuoteCache:
+    """Cache LRU thread-safe des dictionnaires `.info`, avec TTL par champ."""
+
+    def __init__(
+        self,
+        max_symbols: int = 512,
+        field_ttls: Optional[dict] = None,
+        default_ttl: float = QUOTE_TTL,
+        provider: Optional[MarketDataProvider] = None,
+    ):
+        self.max_symbols = max_symbols
+        self.field_ttls = dict(DEFAULT_FIELD_TTLS if field_ttls is None else field_ttls)
+        self.default_ttl = default_ttl
+        # None : fournisseur actif au moment de l'appel
+        self.provider = provider
+
+        # symbole -> (info, horodatage de la récupération)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _ttl_for(self, fields: Optional[Iterable[str]]) -> float:
+        """TTL effectif d'une requête : le plus court parmi les champs demandés."""
+        if not fields:
+            return self.default_ttl
+        return min(self.field_ttls.get(field, self.default_ttl) for field in fields)
+
+    def get_info(self, symbol: str, fields: Optional[Iterable[str]] = None) -> dict:
+        """
+        Retourne le dictionnaire `.info` d'un symbole, depuis le cache si possible.
+
+        Args:
+            symbol: Symbole de l'action
+            fields: Champs dont la fraîcheur est requise (tous si None)
+
+        Returns:
+            Dictionnaire `.info` (partagé, ne pas le modifier)
+        """
+        symbol = symbol.strip().upper()
+        fields = tuple(fields) if fields else None
+        ttl = self._ttl_for(fields)
+        now = time.monotonic()
+
+        info = self._lookup(symbol, ttl, now)
+        if info is not None:
+            return info
+
+        # Appel réseau hors du verrou pour ne pas bloquer les autres symboles ;
+        # le `.info` complet est récupéré, la clé ne dépend donc que du symbole
+        provider = self.provider or get_provider()
+        return market_flight.do(
+            ("info", provider.name, symbol), self._fetch, provider, symbol, ttl
+        )
+
+    def _lookup(self, symbol: str, ttl: float, now: float, count: bool = True) -> Optional[dict]:
+        """Retourne l'entrée si elle est plus récente que `ttl`, sinon None."""
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and now - entry[1] < ttl:
+                self._entries.move_to_end(symbol)
+                if count:
+                    self.hits += 1
+                return entry[0]
+            if count:
+                self.misses += 1
+            return None
+
+    def _fetch(self, provider: MarketDataProvider, symbol: str, ttl: float) -> dict:
+        """Récupère et stocke l'entrée d'un symbole (exécuté une fois par vol)."""
+        # Un vol précédent a pu remplir le cache entre la lecture et ce point
+        info = self._lookup(symbol, ttl, time.monotonic(), count=False)
+        if info is None:
+            info = provider.get_info(symbol)
+            self.put(symbol, info)
+        return info
+
+    def put(self, symbol: str, info: dict, fetched_at: Optional[float] = None):
+        """Insère (ou remplace) l'entrée d'un symbole."""
+        symbol = symbol.strip().upper()
+        fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        with self._lock:
+            self._entries[symbol] = (info, fetched_at)
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_symbols:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Supprime un symbole du cache (ou tout le cache si None)."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol.strip().upper(), None)
+
+    def stats(self) -> dict:
+        """Compteurs du cache (hits, misses, taux de hit, taille)."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / total) if total else 0.0,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_symbols': self.max_symbols,
+            }
+
+
+# Instance partagée par tous les tools et l'interface Streamlit
+quote_cache = QuoteCache()
+on_provider_change(quote_cache.invalidate)
+
+
+def get_ticker_info(symbol: str, fields: Optional[Iterable[str]] = None) -> dict:
+    """Raccourci vers le cache partagé des cotations."""
+    return quote_cache.get_info(symbol, fields)
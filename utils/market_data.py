@@ -0,0 +1,181 @@
+"""
+Fournisseurs de données de marché.
+
+Les tools, le cache des cotations et le stockage des historiques ne parlent
+qu'à un `MarketDataProvider`. Le fournisseur actif est choisi via la
+variable d'environnement `MARKET_DATA_PROVIDER` :
+
+- `yfinance` (défaut) : données en direct depuis Yahoo Finance
+- `record` : données en direct, enregistrées au passage dans `MARKET_DATA_FIXTURES`
+- `replay` : données rejouées depuis `MARKET_DATA_FIXTURES`, sans réseau
+"""
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Optional
+
+import pandas as pd
+import yfinance as yf
+
+from utils.http_pool import get_session, throttle
+
+
+FIXTURES_DIR = os.getenv("MARKET_DATA_FIXTURES", "fixtures/market_data")
+
+
+class MarketDataProvider(ABC):
+    """Interface commune à toutes les sources de données de marché."""
+
+    # Nom utilisé pour séparer les données persistées de chaque source
+    name = "abstract"
+
+    @abstractmethod
+    def get_info(self, symbol: str) -> dict:
+        """Retourne le dictionnaire de cotation/métadonnées (format `yf.Ticker.info`)."""
+
+    @abstractmethod
+    def get_history(self, symbol: str, start: Optional[datetime] = None) -> pd.DataFrame:
+        """Retourne les barres quotidiennes OHLCV depuis `start` (tout l'historique si None)."""
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Données en direct depuis Yahoo Finance."""
+
+    name = "yfinance"
+
+    def _ticker(self, symbol: str) -> yf.Ticker:
+        # Session partagée : les connexions à Yahoo restent ouvertes entre deux appels
+        return yf.Ticker(symbol, session=get_session())
+
+    def get_info(self, symbol: str) -> dict:
+        throttle("market_data")
+        return self._ticker(symbol).info or {}
+
+    def get_history(self, symbol: str, start: Optional[datetime] = None) -> pd.DataFrame:
+        throttle("market_data")
+        stock = self._ticker(symbol)
+        if start is None:
+            return stock.history(period="max", interval="1d")
+        return stock.history(start=start.strftime("%Y-%m-%d"), interval="1d")
+
+
+def _fixture_paths(fixtures_dir: str, symbol: str):
+    base = os.path.join(fixtures_dir, symbol.upper())
+    return base + ".info.json", base + ".history.csv"
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Rejoue des données enregistrées sur disque, sans accès réseau.
+
+    Chaque symbole correspond à deux fichiers : `<SYMBOLE>.info.json` et
+    `<SYMBOLE>.history.csv`. Une latence artificielle peut être ajoutée pour
+    simuler un fournisseur distant lors des benchmarks.
+    """
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, latency: float = 0.0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self._history = {}
+
+    def get_info(self, symbol: str) -> dict:
+        # Fournisseur simulé : même limite de débit que le fournisseur réel
+        throttle("market_data")
+        if self.latency:
+            time.sleep(self.latency)
+        info_path, _ = _fixture_paths(self.fixtures_dir, symbol)
+        try:
+            with open(info_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise LookupError(f"Aucune donnée enregistrée pour {symbol.upper()}")
+
+    def get_history(self, symbol: str, start: Optional[datetime] = None) -> pd.DataFrame:
+        throttle("market_data")
+        if self.latency:
+            time.sleep(self.latency)
+        symbol = symbol.upper()
+        if symbol not in self._history:
+            _, history_path = _fixture_paths(self.fixtures_dir, symbol)
+            try:
+                self._history[symbol] = pd.read_csv(history_path, index_col=0, parse_dates=True)
+            except FileNotFoundError:
+                raise LookupError(f"Aucun historique enregistré pour {symbol}")
+
+        hist = self._history[symbol]
+        if start is None:
+            return hist
+        return hist[hist.index >= pd.Timestamp(start)]
+
+
+class RecordingProvider(MarketDataProvider):
+    """Délègue à un autre fournisseur et enregistre chaque réponse pour `ReplayProvider`."""
+
+    def __init__(self, inner: MarketDataProvider, fixtures_dir: str = FIXTURES_DIR):
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+        self.name = inner.name
+
+    def get_info(self, symbol: str) -> dict:
+        info = self.inner.get_info(symbol)
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        info_path, _ = _fixture_paths(self.fixtures_dir, symbol)
+        with open(info_path, 'w') as f:
+            json.dump(info, f, default=str)
+        return info
+
+    def get_history(self, symbol: str, start: Optional[datetime] = None) -> pd.DataFrame:
+        hist = self.inner.get_history(symbol, start)
+        os.makedirs(self.fixtures_dir, exist_ok=True)
+        _, history_path = _fixture_paths(self.fixtures_dir, symbol)
+
+        # Les appels incrémentaux ne renvoient qu'une partie de l'historique :
+        # on les fusionne avec ce qui est déjà enregistré
+        recorded = hist.copy()
+        if recorded.index.tz is not None:
+            recorded.index = recorded.index.tz_localize(None)
+        if os.path.exists(history_path):
+            previous = pd.read_csv(history_path, index_col=0, parse_dates=True)
+            recorded = pd.concat([previous, recorded])
+            recorded = recorded[~recorded.index.duplicated(keep='last')].sort_index()
+        recorded.to_csv(history_path)
+        return hist
+
+
+def _provider_from_env() -> MarketDataProvider:
+    """Construit le fournisseur désigné par `MARKET_DATA_PROVIDER`."""
+    kind = os.getenv("MARKET_DATA_PROVIDER", "yfinance").lower()
+    if kind == "replay":
+        return ReplayProvider()
+    if kind == "record":
+        return RecordingProvider(YFinanceProvider())
+    return YFinanceProvider()
+
+
+_provider = None
+_listeners = []
+
+
+def get_provider() -> MarketDataProvider:
+    """Retourne le fournisseur actif (créé à la première utilisation)."""
+    global _provider
+    if _provider is None:
+        _provider = _provider_from_env()
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider):
+    """Remplace le fournisseur actif et vide les caches qui en dépendent."""
+    global _provider
+    _provider = provider
+    for callback in _listeners:
+        callback()
+
+
+def on_provider_change(callback: Callable[[], None]):
+    """Enregistre une fonction appelée à chaque changement de fournisseur."""
+    _listeners.append(callback)
@@ -0,0 +1,174 @@
+"""
+Simulation Monte Carlo de la valeur d'un portefeuille.
+
+Les trajectoires sont générées par blocs de `CHUNK_SIZE` sous forme de
+tableaux NumPy, selon un mouvement brownien géométrique (GBM) ou par
+ré-échantillonnage des rendements historiques (bootstrap). Sur une machine
+multi-cœurs, les blocs sont répartis sur un pool de processus (démarrés par
+forkserver, jamais par fork, et arrêtés à la sortie). Chaque bloc
+reçoit sa propre graine dérivée de la graine utilisateur : le résultat est
+identique quel que soit le nombre de processus.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+TRADING_DAYS = 252
+CHUNK_SIZE = 10_000
+
+# En dessous de ce nombre de trajectoires, le coût du pool dépasse le gain
+PARALLEL_THRESHOLD = 50_000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _start_method() -> str:
+    # Pas de fork : le processus parent (Streamlit, clients HTTP, agents) a des
+    # threads dont les verrous pourraient être copiés dans un état verrouillé
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """Pool de processus partagé (None sur une machine mono-cœur)."""
+    global _pool
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(_start_method()),
+            )
+        return _pool
+
+
+def shutdown_pool():
+    """Arrête le pool de processus (appelé à la sortie de l'interpréteur)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_pool)
+
+
+def _simulate_chunk(
+    n_paths: int,
+    checkpoints: Sequence[int],
+    seed: np.random.SeedSequence,
+    initial_value: float,
+    drift: float,
+    sigma: float,
+    sample: Optional[np.ndarray],
+) -> np.ndarray:
+    """
+    Simule un bloc de trajectoires et retourne leurs valeurs aux jours `checkpoints`.
+
+    En GBM (`sample` à None), l'accroissement log entre deux points de contrôle
+    est tiré directement (loi normale exacte) ; en bootstrap, les log-rendements
+    quotidiens sont tirés dans `sample` puis sommés par segment.
+    """
+    rng = np.random.default_rng(seed)
+    log_value = np.full(n_paths, np.log(initial_value))
+    values = np.empty((n_paths, len(checkpoints)))
+
+    previous = 0
+    for i, day in enumerate(checkpoints):
+        steps = day - previous
+        if sample is None:
+            dt = steps / TRADING_DAYS
+            log_value += (drift - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * rng.standard_normal(n_paths)
+        else:
+            log_value += sample[rng.integers(0, len(sample), size=(n_paths, steps))].sum(axis=1)
+        values[:, i] = log_value
+        previous = day
+
+    return np.exp(values)
+
+
+def simulate(
+    initial_value: float,
+    years: float,
+    n_paths: int = 100_000,
+    method: str = "gbm",
+    drift: float = 0.07,
+    volatility: float = 0.18,
+    returns_sample: Optional[np.ndarray] = None,
+    seed: Optional[int] = None,
+    parallel: Optional[bool] = None,
+) -> dict:
+    """
+    Projette la valeur d'un portefeuille et calcule les bandes de percentiles.
+
+    Args:
+        initial_value: Valeur de départ
+        years: Horizon en années
+        n_paths: Nombre de trajectoires
+        method: "gbm" ou "bootstrap"
+        drift: Rendement annuel espéré (GBM)
+        volatility: Volatilité annuelle (GBM)
+        returns_sample: Rendements quotidiens simples à ré-échantillonner (bootstrap)
+        seed: Graine pour la reproductibilité
+        parallel: Forcer (ou désactiver) le pool de processus ; automatique si None
+
+    Returns:
+        Dictionnaire avec les années des points de contrôle, les percentiles
+        (percentile -> valeurs), la moyenne et la probabilité de perte
+    """
+    if initial_value <= 0 or years <= 0 or n_paths <= 0:
+        raise ValueError("Valeur initiale, horizon et nombre de trajectoires doivent être positifs")
+    if method not in ("gbm", "bootstrap"):
+        raise ValueError(f"Méthode inconnue: {method} (gbm ou bootstrap)")
+
+    sample = None
+    if method == "bootstrap":
+        if returns_sample is None or len(returns_sample) < 2:
+            raise ValueError("Le bootstrap nécessite un historique de rendements")
+        sample = np.log1p(np.asarray(returns_sample, dtype='f8'))
+
+    # Un point de contrôle par an, plus l'horizon final
+    horizon = max(1, int(round(years * TRADING_DAYS)))
+    checkpoints = sorted(set(list(range(TRADING_DAYS, horizon, TRADING_DAYS)) + [horizon]))
+
+    sizes = [CHUNK_SIZE] * (n_paths // CHUNK_SIZE)
+    if n_paths % CHUNK_SIZE:
+        sizes.append(n_paths % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(size, checkpoints, s, initial_value, drift, volatility, sample) for size, s in zip(sizes, seeds)]
+
+    # Un seul bloc, ou peu de trajectoires sans demande explicite : calcul sur place
+    pool = None
+    if len(sizes) > 1 and (parallel or (parallel is None and n_paths >= PARALLEL_THRESHOLD)):
+        pool = _get_pool()
+
+    chunks = None
+    if pool is not None:
+        try:
+            chunks = list(pool.map(_simulate_chunk, *zip(*args)))
+        except BrokenProcessPool:
+            shutdown_pool()
+    if chunks is None:
+        chunks = [_simulate_chunk(*a) for a in args]
+    values = np.concatenate(chunks)
+
+    return {
+        'years': [day / TRADING_DAYS for day in checkpoints],
+        'percentiles': dict(zip(PERCENTILES, np.percentile(values, PERCENTILES, axis=0))),
+        'mean': values.mean(axis=0),
+        'prob_loss': float((values[:, -1] < initial_value).mean()),
+        'n_paths': n_paths,
+    }
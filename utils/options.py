@@ -0,0 +1,166 @@
+"""
+Évaluation d'options européennes (Black-Scholes-Merton).
+
+Prix et sensibilités sont calculés pour toute une grille échéances × prix
+d'exercice en une seule diffusion NumPy. Les volatilités implicites de la
+grille sont résolues ensemble par le solveur vectorisé de `utils.tvm`.
+"""
+import math
+from typing import Dict
+
+import numpy as np
+
+from utils.tvm import solve_rates
+
+
+# Bornes de recherche de la volatilité implicite
+VOL_MIN = 1e-4
+VOL_MAX = 5.0
+
+# Vega (pour 1 point de volatilité) sous laquelle la volatilité implicite n'est pas identifiable
+MIN_VEGA = 1e-6
+
+DAYS_PER_YEAR = 365.0
+
+# Approximation rationnelle de Hart (1968, algorithme 5666) de la queue de la
+# loi normale, pour |x| < 7.07 ; fraction continue au-delà. Erreur absolue de
+# l'ordre de 1e-16, entièrement en float64 (pas de boucle Python par élément).
+_HART_NUM = (
+    3.52624965998911e-02, 0.700383064443688, 6.37396220353165, 33.912866078383,
+    112.079291497871, 221.213596169931, 220.206867912376,
+)
+_HART_DEN = (
+    8.83883476483184e-02, 1.75566716318264, 16.064177579207, 86.7807322029461,
+    296.564248779674, 637.333633378831, 793.826512519948, 440.413735824752,
+)
+_HART_SPLIT = 7.07106781186547
+_TAIL_ZERO = 37.0
+
+
+def norm_cdf(x) -> np.ndarray:
+    """Fonction de répartition de la loi normale centrée réduite."""
+    x = np.asarray(x, dtype='f8')
+    z = np.abs(x)
+    # x infini : les branches non retenues peuvent produire inf/inf
+    with np.errstate(invalid='ignore', over='ignore'):
+        gauss = np.exp(-0.5 * z * z)
+        near = gauss * np.polyval(_HART_NUM, z) / np.polyval(_HART_DEN, z)
+        # Fraction continue (évaluée partout, retenue seulement au-delà du seuil)
+        zf = np.maximum(z, _HART_SPLIT)
+        fraction = zf + 0.65
+        for k in (4.0, 3.0, 2.0, 1.0):
+            fraction = zf + k / fraction
+        far = gauss / fraction / math.sqrt(2.0 * math.pi)
+    tail = np.where(z < _HART_SPLIT, near, np.where(z > _TAIL_ZERO, 0.0, far))
+    # NaN propagé tel quel
+    return np.where(x > 0, 1.0 - tail, tail)
+
+
+def norm_pdf(x) -> np.ndarray:
+    """Densité de la loi normale centrée réduite."""
+    x = np.asarray(x, dtype='f8')
+    return np.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+def _d1_d2(spot, strikes, expiries, rate, volatility, dividend):
+    sqrt_t = np.sqrt(expiries)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(spot / strikes) + (rate - dividend + 0.5 * volatility ** 2) * expiries) / (volatility * sqrt_t)
+    return d1, d1 - volatility * sqrt_t
+
+
+def black_scholes(
+    spot: float,
+    strikes,
+    expiries,
+    rate: float,
+    volatility,
+    dividend: float = 0.0,
+    kind: str = 'call',
+) -> Dict[str, np.ndarray]:
+    """
+    Prix et sensibilités d'options européennes.
+
+    Les arguments sont diffusés entre eux : avec `expiries[:, None]` et
+    `strikes[None, :]`, le résultat couvre toute la grille.
+
+    Args:
+        spot: Cours du sous-jacent
+        strikes: Prix d'exercice
+        expiries: Maturités en années
+        rate: Taux sans risque continu
+        volatility: Volatilité annuelle (scalaire ou grille)
+        dividend: Rendement du dividende continu
+        kind: 'call' ou 'put'
+
+    Returns:
+        price, delta, gamma, vega (pour 1 point de volatilité), theta (par jour)
+        et rho (pour 1 point de taux)
+    """
+    strikes, expiries, volatility = (np.asarray(v, dtype='f8') for v in (strikes, expiries, volatility))
+    d1, d2 = _d1_d2(spot, strikes, expiries, rate, volatility, dividend)
+    sign = 1.0 if kind == 'call' else -1.0
+    disc_q = np.exp(-dividend * expiries)
+    disc_r = np.exp(-rate * expiries)
+    cdf1, cdf2 = norm_cdf(sign * d1), norm_cdf(sign * d2)
+    pdf1 = norm_pdf(d1)
+    sqrt_t = np.sqrt(expiries)
+
+    price = sign * (spot * disc_q * cdf1 - strikes * disc_r * cdf2)
+    theta = (
+        -spot * disc_q * pdf1 * volatility / (2 * sqrt_t)
+        + sign * (dividend * spot * disc_q * cdf1 - rate * strikes * disc_r * cdf2)
+    )
+    return {
+        'price': price,
+        'delta': sign * disc_q * cdf1,
+        'gamma': disc_q * pdf1 / (spot * volatility * sqrt_t),
+        'vega': spot * disc_q * pdf1 * sqrt_t / 100,
+        'theta': theta / DAYS_PER_YEAR,
+        'rho': sign * strikes * expiries * disc_r * cdf2 / 100,
+    }
+
+
+def implied_volatility(
+    prices,
+    spot: float,
+    strikes,
+    expiries,
+    rate: float,
+    dividend: float = 0.0,
+    kind: str = 'call',
+) -> np.ndarray:
+    """
+    Volatilités implicites d'une grille de prix observés.
+
+    Tous les points sont résolus ensemble (Newton sur la vega, bissection de
+    secours). Les prix hors des bornes d'arbitrage, ou trop peu sensibles à
+    la volatilité pour la déterminer (vega quasi nulle), donnent NaN.
+
+    Returns:
+        Volatilités implicites, de même forme que la diffusion des arguments
+    """
+    prices, strikes, expiries = np.broadcast_arrays(
+        *(np.asarray(v, dtype='f8') for v in (prices, strikes, expiries))
+    )
+    shape = prices.shape
+    prices, strikes, expiries = prices.ravel(), strikes.ravel(), expiries.ravel()
+
+    def evaluate(vols):
+        # Les points déjà résolus sont évalués à une volatilité nulle : résultats ignorés
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return black_scholes(spot, strikes, expiries, rate, vols, dividend, kind)
+
+    def f(vols):
+        return evaluate(vols)['price'] - prices
+
+    def df(vols):
+        return evaluate(vols)['vega'] * 100
+
+    lo, hi = np.full(prices.shape, VOL_MIN), np.full(prices.shape, VOL_MAX)
+    bracketed = np.sign(f(lo)) * np.sign(f(hi)) <= 0
+    bracketed &= ~np.isnan(prices)
+    lo[~bracketed] = np.nan
+    vols = solve_rates(f, df, lo, hi, tol=1e-8)
+    vols[~(evaluate(np.nan_to_num(vols))['vega'] > MIN_VEGA)] = np.nan
+    return vols.reshape(shape)
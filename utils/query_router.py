@@ -0,0 +1,307 @@
+"""
+Routage local des requêtes vers les agents spécialisés.
+
+Deux signaux sont combinés : des règles par mots-clés (français et anglais)
+et un petit classifieur TF-IDF (centroïdes de classes, similarité cosinus)
+entraîné sur des exemples de référence et sur les requêtes déjà routées par
+le LLM, journalisées au fil de l'eau. Au-dessus du seuil de confiance la
+requête est routée sans appel LLM ; en dessous, le superviseur LLM décide et
+sa réponse enrichit le classifieur.
+"""
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.history_store import STORE_DIR
+from utils.symbols import normalize_text
+
+
+ROUTES = ('market_analyst', 'calculator', 'researcher')
+
+# Confiance minimale pour router sans LLM
+MIN_CONFIDENCE = 0.6
+
+# Journal des requêtes routées par le LLM (exemples d'entraînement)
+ROUTER_LOG = os.getenv("ROUTER_LOG", os.path.join(STORE_DIR, "router_queries.jsonl"))
+
+# Exemples journalisés relus au démarrage (les plus récents)
+MAX_LOGGED = 5000
+
+# Dimension de l'espace des caractéristiques hachées
+DIMS = 1 << 14
+
+# Netteté du softmax sur les similarités cosinus
+TEMPERATURE = 12.0
+
+# Part des règles dans la probabilité combinée (quand au moins une règle s'applique)
+RULE_WEIGHT = 0.6
+
+# Poids de la mention d'un titre en faveur de l'analyse de marché
+SYMBOL_WEIGHT = 0.5
+
+_RULES = {
+    'calculator': [
+        (r"\b(roi|rentabilite|retour sur investissement|return on investment)\b", 2.0),
+        (r"\b(calcul\w*|combien (vaut|vaudra|vaudrait|rapporte)|compute|calculate)\b", 1.5),
+        (r"\b(profit|perte|pertes|plus.value|moins.value|p&l|gain|gains|loss)\b", 1.0),
+        (r"\b(variation|pourcentage|percent(age)?)\b (entre|de|from|between)", 1.5),
+        (r"\b(van|tri|npv|irr|xirr|dcf|wacc|actualis\w*)\b", 2.0),
+        (r"\b(pret|emprunt|credit|mensualite\w*|amortissement|loan|mortgage)\b", 2.0),
+        (r"\b(interets composes|compound\w*|capitalisation des interets|epargne mensuelle)\b", 2.0),
+        (r"\b(black.scholes|grecques|greeks|delta|gamma|vega|volatilite implicite|implied vol\w*)\b", 2.0),
+        (r"\b(options?|calls?|puts?) .*\b(strike|echeance|expir\w*|prix d'exercice)\b", 1.5),
+        (r"\b(prix de revient|pru|fifo|lifo|cout moyen|cost basis|tax.lots?)\b", 2.0),
+        (r"\b(var|cvar|value at risk|sharpe|sortino|drawdown|monte.carlo|simul\w*)\b", 1.5),
+        (r"\b(mon|mes|my) (portefeuille|portfolio|positions?|investissements?)\b", 1.0),
+    ],
+    'market_analyst': [
+        (r"\b(prix|cours|cotation|quote|price|vaut l'action|stock price)\b", 1.5),
+        (r"\b(compare[rz]?|comparaison|versus|vs)\b", 1.0),
+        (r"\b(historique|history|evolution sur|performance sur|derniers jours|dernier mois)\b", 1.5),
+        (r"\b(rsi|macd|bollinger|moyennes? mobiles?|sma|ema|atr|analyse technique|indicateurs?)\b", 2.0),
+        (r"\b(correlation\w*|correle\w*|beta)\b", 1.5),
+        (r"\b(backtest\w*|strategie|croisement|momentum|rebalancement)\b", 2.0),
+        (r"\b(filtre\w*|screen\w*|actions? (tech|qui|avec|dont)|per inferieur|capitalisation de plus)\b", 1.5),
+        (r"\b(informations? sur l'entreprise|fiche|secteur d'activite|capitalisation|dividende|bpa|per)\b", 1.0),
+    ],
+    'researcher': [
+        (r"\b(actualites?|news|nouvelles|infos? recentes|headlines?)\b", 2.0),
+        (r"\b(sentiment|opinion|avis des analystes|consensus|tendance du marche)\b", 2.0),
+        (r"\b(recherche\w*|search|renseigne|informe-moi|trouve des informations)\b", 1.5),
+        (r"\b(pourquoi|why|que se passe|what happened|explique)\b", 1.0),
+        (r"\b(annonce\w*|rumeur\w*|evenements?|earnings call|resultats trimestriels|fed|inflation|crypto\w*)\b", 1.0),
+    ],
+}
+
+_COMPILED_RULES = {
+    route: [(re.compile(pattern), weight) for pattern, weight in rules]
+    for route, rules in _RULES.items()
+}
+
+# Exemples de référence : le classifieur est utilisable sans journal
+SEED_QUERIES = {
+    'market_analyst': [
+        "Quel est le prix actuel de Apple ?",
+        "Prix de l'action Tesla",
+        "Compare Microsoft et Google",
+        "Donne-moi l'historique de Nvidia sur 30 jours",
+        "Informations sur l'entreprise Amazon",
+        "Analyse technique de AAPL avec RSI et MACD",
+        "Corrélation entre AAPL, MSFT et NVDA",
+        "Backteste un croisement de moyennes mobiles sur SPY",
+        "Quelles actions tech ont un PER inférieur à 20 ?",
+        "What is the stock price of Meta?",
+        "Compare the performance of TSLA and F this year",
+        "Cours de LVMH aujourd'hui",
+    ],
+    'calculator': [
+        "Calcule mon ROI si j'ai investi 10000 et j'ai maintenant 15000",
+        "Quel est mon profit si j'achète 50 actions à 100$ et je vends à 150$ ?",
+        "Quelle est la variation entre 1000 et 1200 ?",
+        "Mensualité d'un prêt de 200000 sur 20 ans à 3,5%",
+        "Quel est le TRI d'un projet à -1000, 300, 400, 500 ?",
+        "Valorisation DCF avec un FCF de 1 milliard",
+        "Combien vaudra 10000 euros placés à 5% pendant 20 ans ?",
+        "Prix et grecques des calls Apple strike 200 échéance 30 jours",
+        "Calcule mes plus-values en FIFO sur ces transactions",
+        "Analyse le risque de mon portefeuille : VaR et Sharpe",
+        "Simule la valeur de mon portefeuille dans 10 ans",
+        "Calculate the NPV of these cash flows at 8%",
+    ],
+    'researcher': [
+        "Quelles sont les actualités sur Tesla ?",
+        "Analyse le sentiment du marché crypto",
+        "Recherche des informations sur le secteur tech",
+        "Pourquoi le marché a baissé aujourd'hui ?",
+        "Dernières nouvelles sur la Fed et l'inflation",
+        "Que pensent les analystes de Nvidia ?",
+        "Latest news about Apple earnings",
+        "Quel est le sentiment des investisseurs sur l'IA ?",
+        "Que se passe-t-il sur les marchés asiatiques ?",
+        "Recherche les annonces récentes de Microsoft",
+        "Opinion du marché sur le pétrole",
+        "What happened to bank stocks this week?",
+    ],
+}
+
+_STOPWORDS = {
+    'le', 'la', 'les', 'de', 'des', 'du', 'un', 'une', 'et', 'ou', 'a', 'au', 'aux', 'en', 'pour',
+    'sur', 'mon', 'ma', 'mes', 'est', 'quel', 'quelle', 'quels', 'quelles', 'ce', 'cette', 'il',
+    'je', 'j', 'l', 'd', 'qu', 'que', 'the', 'of', 'and', 'for', 'is', 'what', 'my', 'to', 'in',
+}
+
+
+class Route(NamedTuple):
+    agent: str           # 'market_analyst', 'calculator' ou 'researcher'
+    confidence: float
+    source: str          # 'rules', 'model' ou 'rules+model'
+
+
+def _features(query: str) -> Dict[int, float]:
+    """Caractéristiques hachées : mots, bigrammes de mots et 4-grammes de caractères."""
+    words = [w for w in re.findall(r"[a-z0-9&]+", normalize_text(query)) if w not in _STOPWORDS]
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        grams += [f"c:{padded[i:i + 4]}" for i in range(len(padded) - 3)]
+
+    counts: Dict[int, float] = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode()) % DIMS
+        counts[index] = counts.get(index, 0.0) + 1.0
+    return counts
+
+
+def _rule_scores(text: str) -> np.ndarray:
+    return np.array([
+        sum(weight for pattern, weight in _COMPILED_RULES[route] if pattern.search(text))
+        for route in ROUTES
+    ], dtype='f8')
+
+
+class QueryRouter:
+    """
+    Classifieur local des requêtes (règles + TF-IDF), enrichi par les décisions du LLM.
+
+    Les statistiques du modèle (fréquences documentaires, sommes des vecteurs
+    de chaque classe) sont mises à jour à chaque exemple : l'apprentissage est
+    incrémental et ne relit jamais le journal complet.
+
+    Args:
+        log_path: Journal JSON lines des requêtes routées par le LLM (None : pas de journal)
+        min_confidence: Confiance minimale pour router sans LLM
+    """
+
+    def __init__(self, log_path: Optional[str] = ROUTER_LOG, min_confidence: float = MIN_CONFIDENCE):
+        self.log_path = log_path
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self._doc_freq = np.zeros(DIMS)
+        self._class_sums = np.zeros((len(ROUTES), DIMS))
+        self._documents = 0
+        self.logged = 0
+        self.local_routes = 0
+        self.llm_routes = 0
+
+        for agent, queries in SEED_QUERIES.items():
+            for query in queries:
+                self._learn(query, agent)
+        for query, agent in self._read_log():
+            self._learn(query, agent)
+            self.logged += 1
+
+    def _read_log(self) -> List[Tuple[str, str]]:
+        if not self.log_path or not os.path.exists(self.log_path):
+            return []
+        examples = []
+        with open(self.log_path, encoding='utf-8') as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('agent') in ROUTES and entry.get('query'):
+                    examples.append((entry['query'], entry['agent']))
+        return examples[-MAX_LOGGED:]
+
+    def _learn(self, query: str, agent: str):
+        counts = _features(query)
+        if not counts:
+            return
+        index = np.fromiter(counts.keys(), dtype=np.int64)
+        values = np.fromiter(counts.values(), dtype='f8')
+        values /= np.linalg.norm(values)
+        with self._lock:
+            self._doc_freq[index] += 1
+            self._class_sums[ROUTES.index(agent), index] += values
+            self._documents += 1
+
+    def _model_probabilities(self, query: str) -> Optional[np.ndarray]:
+        counts = _features(query)
+        if not counts:
+            return None
+        index = np.fromiter(counts.keys(), dtype=np.int64)
+        with self._lock:
+            idf = np.log((1 + self._documents) / (1 + self._doc_freq)) + 1
+            centroids = self._class_sums * idf
+        norms = np.linalg.norm(centroids, axis=1)
+        vector = np.fromiter(counts.values(), dtype='f8') * idf[index]
+        vector /= np.linalg.norm(vector)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosine = np.where(norms > 0, centroids[:, index] @ vector / norms, 0.0)
+        weights = np.exp(TEMPERATURE * (cosine - cosine.max()))
+        return weights / weights.sum()
+
+    def route(self, query: str, symbols: Iterable = ()) -> Route:
+        """
+        Agent le plus probable pour une requête.
+
+        Args:
+            query: Requête de l'utilisateur
+            symbols: Titres repérés dans la requête (indice en faveur de l'analyse de marché)
+
+        Returns:
+            Agent, confiance (probabilité combinée) et signaux utilisés
+        """
+        rules = _rule_scores(normalize_text(query))
+        if any(True for _ in symbols):
+            rules[ROUTES.index('market_analyst')] += SYMBOL_WEIGHT
+        model = self._model_probabilities(query)
+
+        if model is None and not rules.any():
+            return Route(ROUTES[0], 0.0, 'model')
+        if model is None:
+            probabilities, source = rules / rules.sum(), 'rules'
+        elif rules.any():
+            probabilities = RULE_WEIGHT * rules / rules.sum() + (1 - RULE_WEIGHT) * model
+            source = 'rules+model'
+        else:
+            probabilities, source = model, 'model'
+        best = int(probabilities.argmax())
+        return Route(ROUTES[best], float(probabilities[best]), source)
+
+    def local_route(self, query: str, symbols: Iterable = ()) -> Optional[str]:
+        """Agent choisi localement, ou None si la requête est ambiguë (décision du LLM)."""
+        route = self.route(query, symbols)
+        if route.confidence >= self.min_confidence:
+            self.local_routes += 1
+            return route.agent
+        return None
+
+    def record(self, query: str, agent: str):
+        """Ajoute une décision du LLM aux exemples (et au journal)."""
+        if agent not in ROUTES:
+            return
+        self.llm_routes += 1
+        self._learn(query, agent)
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with self._lock, open(self.log_path, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps({'query': query, 'agent': agent, 'ts': time.time()}, ensure_ascii=False) + "\n")
+            self.logged += 1
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        """Répartition des décisions entre routage local et LLM."""
+        total = self.local_routes + self.llm_routes
+        return {
+            'local': self.local_routes,
+            'llm': self.llm_routes,
+            'local_rate': self.local_routes / total if total else 0.0,
+            'examples': self._documents,
+            'logged': self.logged,
+        }
+
+
+# Routeur partagé par le processus
+query_router = QueryRouter()
@@ -0,0 +1,301 @@
+"""
+Calculs simples reconnus sans LLM.
+
+Les demandes de calcul courantes ("Calcule mon ROI : investi 10000, valeur
+15000", "profit si j'achète 50 actions à 100$ et je vends à 150$",
+"variation entre 1000 et 1200") sont analysées par expressions régulières,
+en français et en anglais. Chaque montant reçoit un rôle d'après les mots
+qui l'entourent ; un score de confiance pénalise les rôles devinés, les
+nombres inexpliqués et les demandes qui appellent une explication. En
+dessous du seuil, la requête suit le chemin normal (agents LLM).
+
+Les années ("entre 2020 et 2024") ne sont jamais des montants, et une
+requête qui cite une entreprise ou un symbole demande des données de marché :
+elle n'est pas traitée localement.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.calculator_tools import calculate_roi, calculate_profit_loss, calculate_percent_change
+from utils.symbols import symbol_resolver
+
+
+# Confiance minimale pour répondre sans passer par les agents
+MIN_CONFIDENCE = 0.8
+
+
+class Amount(NamedTuple):
+    value: float
+    start: int
+    end: int
+    unit: str          # '$', '€', '%', 'qty' (nombre d'actions), 'period' (durée), 'date' (année) ou ''
+    ambiguous: bool = False    # virgule lue comme séparateur de milliers sans certitude ("1,500")
+
+
+class QuickCalc(NamedTuple):
+    intent: str        # 'roi', 'profit_loss' ou 'percent_change'
+    args: Dict[str, float]
+    confidence: float
+
+
+# Signe : "-50", "−50 €", "-$50" ou "$-50" (pas le tiret de "2023-2024").
+# Milliers à l'anglaise : "10,000" y compris avant une virgule d'énumération ("$10,000, now...")
+_NUMBER_RE = re.compile(
+    r"(?:(?<![\w-])(?P<sign1>[-\u2212])(?=[$€]?\d))?"
+    r"(?:(?P<cur1>[$€])\s?(?P<sign2>[-\u2212](?=\d))?)?"
+    r"(?P<int>\d{1,3}(?:[ \u00a0\u202f]\d{3})+|\d{1,3}(?:,\d{3})+(?!\d|,\d)|\d+)"
+    r"(?:[.,](?P<dec>\d+))?"
+    r"(?P<mult>\s?(?:k|K|M)\b)?"
+    r"\s?(?P<cur2>[$€%]|euros?|dollars?)?"
+)
+_QUANTITY_RE = re.compile(r"^\s*(actions?|titres?|parts?|shares?|stocks?|units?)\b", re.I)
+_PERIOD_RE = re.compile(r"^\s*(jours?|mois|ans?|années?|semaines?|days?|months?|years?|weeks?)\b", re.I)
+
+_INTENTS = {
+    'roi': re.compile(r"\b(roi|retour sur investissement|return on investment|rentabilit[ée])\b", re.I),
+    'profit_loss': re.compile(
+        r"(\b(profit|perte|pertes|gains?|b[ée]n[ée]fice|plus-value|moins-value|loss|p&l)\b)", re.I
+    ),
+    'percent_change': re.compile(
+        r"\b(variation|pourcentage|percent(age)?( change)?|[ée]volution|changement|change|hausse|baisse)\b", re.I
+    ),
+}
+
+_CUES = {
+    'initial_investment': re.compile(
+        r"\b(investi|investis|investissement|plac[ée]|mis|invested|initial|put in|co[uû]t[ée]?|pay[ée]|paid)\W*\w*\W*$", re.I
+    ),
+    'final_value': re.compile(
+        r"\b(valeur|vaut|maintenant|aujourd'hui|final[e]?|now|worth|devenu|r[ée]cup[ée]r[ée]|vendu pour|sold for)\W*\w*\W*$", re.I
+    ),
+    'buy_price': re.compile(r"\b(ach[eè]t[ée]?e?s?|achat|buy|bought|purchased?)\b.*?(à|a|at|@|pour|for)?\s*$", re.I),
+    'sell_price': re.compile(r"\b(vend[su]?|vendue?s?|revend[su]?|vente|sell|sold)\b.*?(à|a|at|@|pour|for)?\s*$", re.I),
+}
+
+# Indices placés après le nombre ("10 000 € investis")
+_CUES_AFTER = {
+    'initial_investment': re.compile(r"^\W*(investis?|plac[ée]s?|mis|invested|paid)\b", re.I),
+    'final_value': re.compile(r"^\W*(aujourd'hui|maintenant|actuellement|now|today)\b", re.I),
+}
+
+# Demandes qui appellent une explication ou des données de marché
+_OPEN_ENDED_RE = re.compile(
+    r"\b(pourquoi|explique|expliquer|conseil|devrais|faut-il|compare|should|why|explain|advice|prix actuel|cours actuel)\b",
+    re.I,
+)
+
+# Fenêtre de texte examinée avant un nombre pour lui attribuer un rôle
+_CUE_WINDOW = 30
+
+# Pénalité d'un montant dont la virgule est ambiguë (milliers ou décimales)
+_AMBIGUOUS_PENALTY = 0.2
+
+# Année isolée (1900-2099), sans devise ni décimale
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+
+# Unités qui ne sont pas des montants (prix, valeurs)
+_NOT_MONEY = ('%', 'period', 'qty', 'date')
+
+
+def parse_amounts(text: str) -> List[Amount]:
+    """Nombres d'une phrase (formats français et anglais, k/M, devises, %)."""
+    amounts = []
+    for match in _NUMBER_RE.finditer(text):
+        digits = re.sub(r"[ \u00a0\u202f,]", "", match.group('int'))
+        value = float(digits + ('.' + match.group('dec') if match.group('dec') else ''))
+        mult = (match.group('mult') or '').strip()
+        value *= {'k': 1e3, 'K': 1e3, 'M': 1e6}.get(mult, 1)
+        if match.group('sign1') or match.group('sign2'):
+            value = -value
+
+        currency = (match.group('cur1') or match.group('cur2') or '').lower()
+        unit = '%' if currency == '%' else ('€' if currency.startswith(('€', 'euro')) else ('$' if currency else ''))
+        rest = text[match.end():]
+        if not unit and _QUANTITY_RE.match(rest):
+            unit = 'qty'
+        elif not unit and _PERIOD_RE.match(rest):
+            unit = 'period'
+        elif (not unit and _YEAR_RE.fullmatch(match.group('int')) and not match.group('dec')
+              and not match.group('mult') and value > 0):
+            unit = 'date'
+        # "1,500" : 1500 à l'anglaise ou 1,5 à la française ; le dollar tranche
+        ambiguous = match.group('int').count(',') == 1 and not match.group('dec') and unit != '$'
+        amounts.append(Amount(value, match.start(), match.end(), unit, ambiguous))
+    return amounts
+
+
+def _roles(text: str, amounts: List[Amount], roles: List[str]) -> Dict[str, Amount]:
+    """Attribue à chaque montant le rôle dont l'indice textuel le précède (ou, à défaut, le suit)."""
+    assigned = {}
+    previous_end = 0
+    for amount in amounts:
+        window = text[max(previous_end, amount.start - _CUE_WINDOW):amount.start]
+        for role in roles:
+            if role not in assigned and _CUES[role].search(window):
+                assigned[role] = amount
+                break
+        previous_end = amount.end
+
+    taken = list(assigned.values())
+    for i, amount in enumerate(amounts):
+        if amount in taken:
+            continue
+        end = amounts[i + 1].start if i + 1 < len(amounts) else len(text)
+        window = text[amount.end:min(end, amount.end + _CUE_WINDOW)]
+        for role, cue in _CUES_AFTER.items():
+            if role in roles and role not in assigned and cue.search(window):
+                assigned[role] = amount
+                break
+    return assigned
+
+
+def _score(base: float, amounts: List[Amount], used: List[Amount], open_ended: bool) -> float:
+    unexplained = [a for a in amounts if a not in used and a.unit not in ('%', 'date')]
+    ambiguous = [a for a in used if a.ambiguous]
+    return (base - 0.3 * len(unexplained) - _AMBIGUOUS_PENALTY * len(ambiguous)
+            - (0.3 if open_ended else 0.0))
+
+
+def _match_roi(text, amounts, open_ended) -> Optional[QuickCalc]:
+    values = [a for a in amounts if a.unit not in _NOT_MONEY]
+    if len(values) < 2:
+        return None
+    roles = _roles(text, values, ['initial_investment', 'final_value'])
+    if len(roles) == 2:
+        base = 0.95
+    else:
+        # Ordre d'apparition : montant investi puis valeur finale
+        roles = {'initial_investment': values[0], 'final_value': values[1]}
+        base = 0.75
+    args = {role: amount.value for role, amount in roles.items()}
+    # Mise négative ou nulle : pas de ROI à calculer mécaniquement
+    if args['initial_investment'] <= 0:
+        return None
+    return QuickCalc('roi', args, _score(base, amounts, list(roles.values()), open_ended))
+
+
+def _match_profit_loss(text, amounts, open_ended) -> Optional[QuickCalc]:
+    quantities = [a for a in amounts if a.unit == 'qty']
+    prices = [a for a in amounts if a.unit not in _NOT_MONEY]
+    if len(quantities) != 1 or len(prices) < 2:
+        return None
+    roles = _roles(text, prices, ['buy_price', 'sell_price'])
+    if len(roles) == 2:
+        base = 0.95
+    else:
+        roles = {'buy_price': prices[0], 'sell_price': prices[1]}
+        base = 0.75
+    args = {role: amount.value for role, amount in roles.items()}
+    if args['buy_price'] <= 0 or args['sell_price'] < 0 or quantities[0].value <= 0:
+        return None
+    args['quantity'] = int(quantities[0].value)
+    used = list(roles.values()) + quantities
+    return QuickCalc('profit_loss', args, _score(base, amounts, used, open_ended))
+
+
+_BETWEEN_RE = re.compile(r"^\s*(et|à|a|to|and|->|→|vers)\s*$", re.I)
+
+
+def _match_percent_change(text, amounts, open_ended) -> Optional[QuickCalc]:
+    values = [a for a in amounts if a.unit not in _NOT_MONEY]
+    if len(values) < 2:
+        return None
+    # "entre X et Y", "de X à Y", "from X to Y" : les deux nombres sont reliés
+    for first, second in zip(values, values[1:]):
+        if _BETWEEN_RE.match(text[first.end:second.start]):
+            # Variation relative à une base négative ou nulle : sans signification
+            if first.value <= 0:
+                return None
+            args = {'old_value': first.value, 'new_value': second.value}
+            return QuickCalc('percent_change', args, _score(0.95, amounts, [first, second], open_ended))
+    return None
+
+
+_MATCHERS = {
+    'roi': _match_roi,
+    'profit_loss': _match_profit_loss,
+    'percent_change': _match_percent_change,
+}
+
+_TOOLS = {
+    'roi': calculate_roi,
+    'profit_loss': calculate_profit_loss,
+    'percent_change': calculate_percent_change,
+}
+
+
+def match(query: str) -> Optional[QuickCalc]:
+    """
+    Reconnaît un calcul simple dans une requête.
+
+    Returns:
+        Le calcul le plus probable (intention, arguments, confiance), ou None
+    """
+    amounts = parse_amounts(query)
+    if len(amounts) < 2:
+        return None
+    open_ended = bool(_OPEN_ENDED_RE.search(query))
+
+    candidates = []
+    for intent, pattern in _INTENTS.items():
+        if pattern.search(query):
+            result = _MATCHERS[intent](query, amounts, open_ended)
+            if result is not None:
+                candidates.append(result)
+    return max(candidates, key=lambda c: c.confidence, default=None)
+
+
+# Montant en dollars dans la sortie d'un tool ("$+2,500.00")
+_DOLLAR_RE = re.compile(r"\$([+-]?[\d,]+(?:\.\d+)?)")
+
+
+def _money(value: float, currency: str) -> str:
+    return f"{value:,.2f} €" if currency == '€' else f"${value:,.2f}"
+
+
+def _describe(calc: QuickCalc, currency: str) -> str:
+    args = calc.args
+
+    def money(value):
+        return _money(value, currency)
+
+    if calc.intent == 'roi':
+        return f"Investissement initial : {money(args['initial_investment'])} → valeur finale : {money(args['final_value'])}"
+    if calc.intent == 'profit_loss':
+        return (f"{args['quantity']} actions achetées à {money(args['buy_price'])} "
+                f"et vendues à {money(args['sell_price'])}")
+    return f"De {args['old_value']:,.2f} à {args['new_value']:,.2f}"
+
+
+def answer(
+    query: str,
+    min_confidence: float = MIN_CONFIDENCE,
+    mentions: Optional[Iterable[Tuple[str, str]]] = None,
+) -> Optional[str]:
+    """
+    Répond directement à une demande de calcul simple.
+
+    Args:
+        query: Requête de l'utilisateur
+        min_confidence: Confiance minimale (sinon None : la requête suit le chemin normal)
+        mentions: Entreprises citées (`find_mentions`), recherchées si None
+
+    Returns:
+        Réponse mise en forme, ou None si la requête n'est pas reconnue avec assez de confiance
+    """
+    # Une entreprise citée appelle des données de marché : chemin normal
+    if mentions is None:
+        mentions = symbol_resolver.find_mentions(query)
+    if mentions:
+        return None
+    calc = match(query)
+    if calc is None or calc.confidence < min_confidence:
+        return None
+    result = _TOOLS[calc.intent].func(**calc.args)
+    if result.startswith("❌"):
+        return None
+    currency = '€' if any(a.unit == '€' for a in parse_amounts(query)) else '$'
+    if currency == '€':
+        # Les tools affichent des dollars : la réponse garde la devise de la question
+        result = _DOLLAR_RE.sub(lambda m: f"{m.group(1)} €", result)
+    return f"{_describe(calc, currency)}\n{result}"
@@ -2,10 +2,73 @@
 Tools de recherche et d'analyse de marché.
 """
 from langchain_core.tools import tool
-from tavily import TavilyClient
-import os
 from datetime import datetime
 
+from utils.async_tools import add_async
+from utils.search_client import search_client
+
+
+def _format_search(response: dict) -> str:
+    results = []
+    for i, result in enumerate(response.get('results', []), 1):
+        results.append(
+            f"{i}. {result['title']}\n"
+            f"   📰 {result['content'][:200]}...\n"
+            f"   🔗 {result['url']}"
+        )
+
+    return "🔍 RÉSULTATS DE RECHERCHE\n" + "━"*50 + "\n\n" + "\n\n".join(results)
+
+
+def _news_params(company_or_topic: str) -> dict:
+    return {
+        'query': f"{company_or_topic} financial news stock market",
+        'max_results': 5,
+        'search_depth': "advanced",
+        'topic': "news",
+    }
+
+
+def _format_news(company_or_topic: str, response: dict) -> str:
+    news = []
+    for i, result in enumerate(response.get('results', []), 1):
+        news.append(
+            f"{i}. 📰 {result['title']}\n"
+            f"   {result['content'][:250]}...\n"
+            f"   🔗 Source: {result['url']}\n"
+        )
+
+    return f"""
+📰 ACTUALITÉS FINANCIÈRES - {company_or_topic.upper()}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{chr(10).join(news)}
+"""
+
+
+def _sentiment_params(topic: str) -> dict:
+    return {
+        'query': f"{topic} market sentiment analysis opinion",
+        'max_results': 5,
+        'search_depth': "advanced",
+    }
+
+
+def _format_sentiment(topic: str, response: dict) -> str:
+    articles = []
+    for result in response.get('results', [])[:3]:
+        articles.append(f"• {result['content'][:150]}...")
+
+    return f"""
+📊 SENTIMENT DU MARCHÉ - {topic.upper()}
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+Analyse basée sur les sources récentes:
+
+{chr(10).join(articles)}
+
+⚠️ Note: Cette analyse est basée sur des sources publiques.
+Consultez un conseiller financier pour des décisions d'investissement.
+"""
+
 
 @tool
 def web_search(query: str) -> str:
@@ -19,18 +82,14 @@ def web_search(query: str) -> str:
         Résultats pertinents de la recherche
     """
     try:
-        tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-        response = tavily_client.search(query, max_results=5)
-        
-        results = []
-        for i, result in enumerate(response.get('results', []), 1):
-            results.append(
-                f"{i}. {result['title']}\n"
-                f"   📰 {result['content'][:200]}...\n"
-                f"   🔗 {result['url']}"
-            )
-        
-        return "🔍 RÉSULTATS DE RECHERCHE\n" + "━"*50 + "\n\n" + "\n\n".join(results)
+        return _format_search(search_client.search(query, max_results=5))
+    except Exception as e:
+        return f"❌ Erreur de recherche: {str(e)}"
+
+
+async def _aweb_search(query: str) -> str:
+    try:
+        return _format_search(await search_client.asearch(query, max_results=5))
     except Exception as e:
         return f"❌ Erreur de recherche: {str(e)}"
 
@@ -47,29 +106,16 @@ def search_financial_news(company_or_topic: str) -> str:
         Actualités financières pertinentes
     """
     try:
-        tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-        
-        query = f"{company_or_topic} financial news stock market"
-        response = tavily_client.search(
-            query, 
-            max_results=5,
-            search_depth="advanced",
-            topic="news"
-        )
-        
-        news = []
-        for i, result in enumerate(response.get('results', []), 1):
-            news.append(
-                f"{i}. 📰 {result['title']}\n"
-                f"   {result['content'][:250]}...\n"
-                f"   🔗 Source: {result['url']}\n"
-            )
-        
-        return f"""
-📰 ACTUALITÉS FINANCIÈRES - {company_or_topic.upper()}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{chr(10).join(news)}
-"""
+        response = search_client.search(**_news_params(company_or_topic))
+        return _format_news(company_or_topic, response)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
+
+
+async def _asearch_financial_news(company_or_topic: str) -> str:
+    try:
+        response = await search_client.asearch(**_news_params(company_or_topic))
+        return _format_news(company_or_topic, response)
     except Exception as e:
         return f"❌ Erreur: {str(e)}"
 
@@ -86,25 +132,16 @@ def get_market_sentiment(topic: str) -> str:
         Analyse du sentiment basée sur les actualités
     """
     try:
-        tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-        
-        query = f"{topic} market sentiment analysis opinion"
-        response = tavily_client.search(query, max_results=5, search_depth="advanced")
-        
-        articles = []
-        for result in response.get('results', [])[:3]:
-            articles.append(f"• {result['content'][:150]}...")
-        
-        return f"""
-📊 SENTIMENT DU MARCHÉ - {topic.upper()}
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-Analyse basée sur les sources récentes:
+        response = search_client.search(**_sentiment_params(topic))
+        return _format_sentiment(topic, response)
+    except Exception as e:
+        return f"❌ Erreur: {str(e)}"
 
-{chr(10).join(articles)}
 
-⚠️ Note: Cette analyse est basée sur des sources publiques.
-Consultez un conseiller financier pour des décisions d'investissement.
-"""
+async def _aget_market_sentiment(topic: str) -> str:
+    try:
+        response = await search_client.asearch(**_sentiment_params(topic))
+        return _format_sentiment(topic, response)
     except Exception as e:
         return f"❌ Erreur: {str(e)}"
 
@@ -121,10 +158,20 @@ def get_current_time() -> str:
     return f"📅 {now.strftime('%d/%m/%Y')} ⏰ {now.strftime('%H:%M:%S')}"
 
 
+async def _aget_current_time() -> str:
+    return get_current_time.func()
+
+
+# Variantes asynchrones natives (ainvoke)
+add_async(web_search, _aweb_search)
+add_async(search_financial_news, _asearch_financial_news)
+add_async(get_market_sentiment, _aget_market_sentiment)
+add_async(get_current_time, _aget_current_time)
+
 # Export des tools
 research_tools = [
     web_search,
     search_financial_news,
     get_market_sentiment,
     get_current_time
-]
\ No newline at end of file
+]
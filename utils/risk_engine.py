@@ -0,0 +1,151 @@
+"""
+Moteur de risque de portefeuille.
+
+Construit une matrice de rendements alignée (dates × titres) à partir des
+historiques stockés, puis calcule en forme matricielle la covariance, la
+VaR/CVaR historique et paramétrique, les ratios de Sharpe/Sortino et le
+drawdown maximal. Les calculs restent rapides pour plusieurs centaines de
+titres : tout passe par des produits matriciels NumPy.
+"""
+from statistics import NormalDist
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.batch_fetch import fetch_panel
+from utils.indicators import forward_fill
+from utils.symbols import resolve_symbol
+
+
+TRADING_DAYS = 252
+
+
+def parse_holdings(holdings: str, weights: str = "") -> Tuple[List[str], np.ndarray]:
+    """
+    Analyse la composition d'un portefeuille.
+
+    Args:
+        holdings: "AAPL,MSFT,NVDA" ou "AAPL:0.5,MSFT:0.3,NVDA:0.2"
+        weights: Poids optionnels séparés par des virgules (même ordre que holdings)
+
+    Returns:
+        (symboles, poids normalisés à 1) ; poids égaux si aucun n'est fourni
+    """
+    symbols, explicit = [], []
+    for item in holdings.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        symbol, _, weight = item.partition(':')
+        symbols.append(resolve_symbol(symbol))
+        explicit.append(float(weight) if weight.strip() else np.nan)
+
+    if not symbols:
+        raise ValueError("Aucun titre dans le portefeuille")
+    if len(set(symbols)) != len(symbols):
+        raise ValueError("Titre en double dans le portefeuille")
+
+    if weights.strip():
+        explicit = [float(w) for w in weights.split(',') if w.strip()]
+        if len(explicit) != len(symbols):
+            raise ValueError(f"{len(explicit)} poids pour {len(symbols)} titres")
+
+    values = np.asarray(explicit, dtype='f8')
+    if np.isnan(values).all():
+        values = np.ones(len(symbols))
+    elif np.isnan(values).any():
+        raise ValueError("Poids manquant pour certains titres")
+
+    total = values.sum()
+    if total == 0:
+        raise ValueError("La somme des poids est nulle")
+    return symbols, values / total
+
+
+def returns_matrix(symbols: List[str], period: str = "1y") -> Tuple[np.ndarray, List[str], Dict[str, str]]:
+    """
+    Matrice des rendements quotidiens simples, alignée sur les dates communes.
+
+    Returns:
+        (rendements dates × titres, titres retenus, erreurs par titre)
+    """
+    panel = fetch_panel(symbols, period, ('close',))
+    if not panel.symbols:
+        return np.empty((0, 0)), [], panel.errors
+
+    closes = forward_fill(panel.fields['close'])
+    returns = closes[1:] / closes[:-1] - 1
+    # Fenêtre commune : on écarte les dates où un titre n'a pas encore d'historique
+    returns = returns[~np.isnan(returns).any(axis=1)]
+    return returns, panel.symbols, panel.errors
+
+
+def max_drawdown(returns: np.ndarray) -> np.ndarray:
+    """Drawdown maximal (valeur positive) de chaque colonne d'une matrice de rendements."""
+    wealth = np.cumprod(1 + returns, axis=0)
+    peaks = np.maximum.accumulate(wealth, axis=0)
+    return -(wealth / peaks - 1).min(axis=0)
+
+
+def portfolio_risk(
+    returns: np.ndarray,
+    weights: np.ndarray,
+    confidence: float = 0.95,
+    risk_free_rate: float = 0.0,
+) -> dict:
+    """
+    Statistiques de risque d'un portefeuille à poids constants.
+
+    Args:
+        returns: Rendements quotidiens (dates × titres)
+        weights: Poids des titres (somme = 1)
+        confidence: Niveau de confiance de la VaR/CVaR (ex: 0.95)
+        risk_free_rate: Taux sans risque annuel
+
+    Returns:
+        Dictionnaire de métriques (VaR/CVaR quotidiennes en fraction du portefeuille)
+    """
+    if len(returns) < 2:
+        raise ValueError("Historique commun insuffisant pour estimer le risque")
+
+    mean_returns = returns.mean(axis=0)
+    centered = returns - mean_returns
+    covariance = centered.T @ centered / (len(returns) - 1)
+
+    portfolio = returns @ weights
+    mu = portfolio.mean()
+    sigma = np.sqrt(weights @ covariance @ weights)
+
+    # VaR / CVaR historiques
+    cutoff = np.quantile(portfolio, 1 - confidence)
+    var_hist = -cutoff
+    cvar_hist = -portfolio[portfolio <= cutoff].mean()
+
+    # VaR / CVaR paramétriques (normale)
+    normal = NormalDist()
+    z = normal.inv_cdf(confidence)
+    var_param = z * sigma - mu
+    cvar_param = sigma * normal.pdf(z) / (1 - confidence) - mu
+
+    daily_rf = risk_free_rate / TRADING_DAYS
+    excess = portfolio - daily_rf
+    downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2))
+    annual_vol = sigma * np.sqrt(TRADING_DAYS)
+
+    # Contribution de chaque titre à la volatilité du portefeuille
+    contributions = weights * (covariance @ weights) / sigma if sigma > 0 else np.zeros_like(weights)
+
+    return {
+        'observations': len(returns),
+        'annual_return': mu * TRADING_DAYS,
+        'annual_volatility': annual_vol,
+        'sharpe': (excess.mean() * TRADING_DAYS) / annual_vol if annual_vol > 0 else np.nan,
+        'sortino': (excess.mean() / downside) * np.sqrt(TRADING_DAYS) if downside > 0 else np.nan,
+        'var_historical': var_hist,
+        'cvar_historical': cvar_hist,
+        'var_parametric': var_param,
+        'cvar_parametric': cvar_param,
+        'max_drawdown': float(max_drawdown(portfolio[:, None])[0]),
+        'covariance': covariance,
+        'risk_contributions': contributions,
+    }
@@ -0,0 +1,78 @@
+"""
+Client de recherche web (API Tavily) sur sessions HTTP partagées.
+
+Les clients du SDK Tavily ouvrent une nouvelle connexion à chaque requête.
+Ce client envoie les mêmes requêtes à travers les sessions de
+`utils.http_pool`, en synchrone (`search`) comme en asynchrone (`asearch`).
+"""
+import os
+from typing import Optional
+
+from tavily.errors import InvalidAPIKeyError, MissingAPIKeyError, UsageLimitExceededError
+
+from utils.http_pool import athrottle, get_async_client, get_session, throttle, TIMEOUT
+
+
+TAVILY_URL = "https://api.tavily.com/search"
+
+
+class SearchClient:
+    """Recherche Tavily, synchrone ou asynchrone."""
+
+    def __init__(self, api_key: Optional[str] = None, url: str = TAVILY_URL):
+        # None : clé lue dans l'environnement à chaque appel (après load_dotenv)
+        self.api_key = api_key
+        self.url = url
+
+    def _payload(self, query: str, **params) -> dict:
+        api_key = self.api_key or os.getenv("TAVILY_API_KEY")
+        if not api_key:
+            raise MissingAPIKeyError()
+        return {
+            "api_key": api_key,
+            "query": query,
+            "search_depth": "basic",
+            "topic": "general",
+            "max_results": 5,
+            **params,
+        }
+
+    @staticmethod
+    def _result(status_code: int, payload) -> dict:
+        """Décode la réponse, avec les mêmes erreurs que le SDK Tavily."""
+        if status_code == 200:
+            return payload()
+        if status_code == 429:
+            try:
+                detail = payload()['detail']['error']
+            except Exception:
+                detail = 'Too many requests.'
+            raise UsageLimitExceededError(detail)
+        if status_code == 401:
+            raise InvalidAPIKeyError()
+        raise RuntimeError(f"Recherche web: erreur HTTP {status_code}")
+
+    def search(self, query: str, **params) -> dict:
+        """
+        Lance une recherche.
+
+        Args:
+            query: Termes recherchés
+            **params: Paramètres Tavily (max_results, search_depth, topic...)
+
+        Returns:
+            Réponse JSON de l'API (clé `results`)
+        """
+        throttle("search")
+        response = get_session().post(self.url, json=self._payload(query, **params), timeout=TIMEOUT)
+        return self._result(response.status_code, response.json)
+
+    async def asearch(self, query: str, **params) -> dict:
+        """Comme `search`, sans bloquer la boucle d'événements."""
+        await athrottle("search")
+        response = await get_async_client().post(self.url, json=self._payload(query, **params))
+        return self._result(response.status_code, response.json)
+
+
+# Instance partagée par les tools de recherche
+search_client = SearchClient()
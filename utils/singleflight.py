@@ -0,0 +1,79 @@
+"""
+Regroupement des requêtes concurrentes identiques ("single-flight").
+
+Quand plusieurs threads (sessions Streamlit, appels de tools parallèles)
+demandent la même donnée au même moment, un seul appel amont est effectué :
+les autres attendent son résultat et le partagent.
+"""
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    """Appel amont en cours, partagé par tous les demandeurs d'une même clé."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Exécute au plus un appel simultané par clé et partage son résultat."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Appelle `fn(*args, **kwargs)`, sauf si un appel de même clé est déjà en cours.
+
+        Args:
+            key: Identifiant de la requête (ex: ("info", "AAPL"))
+            fn: Fonction effectuant l'appel amont
+
+        Returns:
+            Résultat de l'appel (partagé entre tous les demandeurs concurrents)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        """Nombre d'appels effectués, partagés, et en cours."""
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'shared': self.shared,
+                'in_flight': len(self._calls),
+            }
+
+
+# Instance partagée par le cache des cotations et le stockage des historiques
+market_flight = SingleFlight()
@@ -0,0 +1,342 @@
+"""
+Résolution locale des noms d'entreprises en symboles boursiers.
+
+Une table de symboles (symbole -> noms usuels) est indexée de deux façons :
+un dictionnaire des noms normalisés (minuscules, sans accents ni forme
+juridique) pour les correspondances exactes, et un index de trigrammes de
+caractères pour les fautes de frappe ("Microsft", "Palantirr"). La résolution
+se fait en mémoire, sans appel réseau ni LLM.
+"""
+import re
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Score de Dice minimal (trigrammes partagés) pour une correspondance approchée
+MIN_SIMILARITY = 0.6
+
+# Score minimal pour un mot quelconque d'une phrase ("Metal" ne doit pas
+# devenir META) ; le seuil normal s'applique après un mot de contexte boursier
+MENTION_SIMILARITY = 0.85
+
+# Mots qui annoncent un nom d'entreprise ("cours de Microsft", "compare Nvdia et ...")
+_COMPANY_CONTEXT = {
+    "action", "actions", "titre", "titres", "cours", "prix", "cotation", "societe",
+    "entreprise", "compare", "comparer", "stock", "stocks", "shares", "price", "ticker",
+}
+
+COMPANIES = {
+    # Technologie
+    "AAPL": ("Apple",),
+    "MSFT": ("Microsoft",),
+    "NVDA": ("Nvidia",),
+    "GOOGL": ("Alphabet", "Google"),
+    "AMZN": ("Amazon",),
+    "META": ("Meta", "Meta Platforms", "Facebook"),
+    "TSLA": ("Tesla",),
+    "AVGO": ("Broadcom",),
+    "ORCL": ("Oracle",),
+    "CRM": ("Salesforce",),
+    "ADBE": ("Adobe",),
+    "AMD": ("AMD", "Advanced Micro Devices"),
+    "INTC": ("Intel",),
+    "CSCO": ("Cisco",),
+    "IBM": ("IBM",),
+    "QCOM": ("Qualcomm",),
+    "TXN": ("Texas Instruments",),
+    "NFLX": ("Netflix",),
+    "UBER": ("Uber",),
+    "ABNB": ("Airbnb",),
+    "PLTR": ("Palantir",),
+    "SHOP": ("Shopify",),
+    "SPOT": ("Spotify",),
+    "PYPL": ("PayPal",),
+    "SNOW": ("Snowflake",),
+    "TSM": ("TSMC", "Taiwan Semiconductor"),
+    "ASML": ("ASML",),
+    "SAP": ("SAP",),
+    # Médias et télécoms
+    "DIS": ("Disney", "Walt Disney"),
+    "CMCSA": ("Comcast",),
+    "T": ("AT&T",),
+    "VZ": ("Verizon",),
+    # Finance
+    "JPM": ("JPMorgan", "JP Morgan", "JPMorgan Chase"),
+    "BAC": ("Bank of America",),
+    "WFC": ("Wells Fargo",),
+    "GS": ("Goldman Sachs",),
+    "MS": ("Morgan Stanley",),
+    "C": ("Citigroup", "Citi"),
+    "BLK": ("BlackRock",),
+    "V": ("Visa",),
+    "MA": ("Mastercard",),
+    "AXP": ("American Express", "Amex"),
+    "BRK-B": ("Berkshire Hathaway", "Berkshire"),
+    # Santé
+    "JNJ": ("Johnson & Johnson", "Johnson and Johnson"),
+    "UNH": ("UnitedHealth",),
+    "LLY": ("Eli Lilly", "Lilly"),
+    "PFE": ("Pfizer",),
+    "MRK": ("Merck",),
+    "ABBV": ("AbbVie",),
+    "TMO": ("Thermo Fisher",),
+    "ABT": ("Abbott",),
+    "AMGN": ("Amgen",),
+    "MRNA": ("Moderna",),
+    "NVO": ("Novo Nordisk",),
+    # Consommation
+    "WMT": ("Walmart",),
+    "COST": ("Costco",),
+    "HD": ("Home Depot",),
+    "MCD": ("McDonald's", "McDonalds"),
+    "NKE": ("Nike",),
+    "SBUX": ("Starbucks",),
+    "PG": ("Procter & Gamble", "Procter and Gamble"),
+    "KO": ("Coca-Cola", "Coca Cola", "Coke"),
+    "PEP": ("PepsiCo", "Pepsi"),
+    "PM": ("Philip Morris",),
+    # Énergie et industrie
+    "XOM": ("ExxonMobil", "Exxon Mobil", "Exxon"),
+    "CVX": ("Chevron",),
+    "COP": ("ConocoPhillips",),
+    "CAT": ("Caterpillar",),
+    "BA": ("Boeing",),
+    "GE": ("General Electric",),
+    "HON": ("Honeywell",),
+    "UPS": ("UPS", "United Parcel Service"),
+    "RTX": ("RTX", "Raytheon"),
+    "LIN": ("Linde",),
+    "F": ("Ford",),
+    "GM": ("General Motors",),
+    # Services publics et immobilier
+    "NEE": ("NextEra Energy", "NextEra"),
+    "DUK": ("Duke Energy",),
+    "SO": ("Southern Company",),
+    "AMT": ("American Tower",),
+    "PLD": ("Prologis",),
+    "SPG": ("Simon Property",),
+    # Europe (Euronext Paris)
+    "MC.PA": ("LVMH", "Louis Vuitton"),
+    "OR.PA": ("L'Oréal", "Loreal"),
+    "TTE.PA": ("TotalEnergies",),
+    "AIR.PA": ("Airbus",),
+    "SAN.PA": ("Sanofi",),
+    "BNP.PA": ("BNP Paribas", "BNP"),
+    "RMS.PA": ("Hermès", "Hermes"),
+    "KER.PA": ("Kering",),
+    "SU.PA": ("Schneider Electric", "Schneider"),
+    "AI.PA": ("Air Liquide",),
+    "SAF.PA": ("Safran",),
+    "DG.PA": ("Vinci",),
+    "BN.PA": ("Danone",),
+    "CAP.PA": ("Capgemini",),
+    "RNO.PA": ("Renault",),
+    "STLAP.PA": ("Stellantis",),
+    "ACA.PA": ("Crédit Agricole",),
+    "GLE.PA": ("Société Générale",),
+    "EL.PA": ("EssilorLuxottica", "Essilor"),
+    "DSY.PA": ("Dassault Systèmes",),
+}
+
+# Noms qui sont aussi des mots courants : reconnus dans une phrase
+# seulement s'ils commencent par une majuscule
+AMBIGUOUS_NAMES = {"apple", "meta", "visa", "citi", "coke", "ford", "lilly", "oracle", "amazon"}
+
+# Formes juridiques ignorées lors de la comparaison des noms
+_LEGAL_SUFFIXES = {"inc", "corp", "corporation", "co", "company", "sa", "se", "plc", "ltd", "group", "holdings", "the"}
+
+# Mots capitalisés fréquents en début de phrase, jamais comparés à la table
+_STOPWORDS = {
+    "quel", "quelle", "quels", "quelles", "compare", "comparer", "donne", "donnez",
+    "calcule", "calculer", "analyse", "analyser", "prix", "cours", "action", "actions",
+    "historique", "actualites", "recherche", "entre", "avec", "pour", "dans", "what",
+    "show", "price", "stock", "stocks", "news", "about", "with", "and",
+}
+
+_WORD_RE = re.compile(r"\$?[\w&'.\-]+")
+_TICKER_RE = re.compile(r"^[A-Z0-9][A-Z0-9.\-^=]{0,9}$")
+# Élision française : "d'Apple", "l'action", "qu'Amazon"
+_ELISION_RE = re.compile(r"^(?:[dlnsjmtc]|qu|jusqu|lorsqu|puisqu)['’]", re.I)
+
+
+def normalize_text(text: str) -> str:
+    """Minuscules sans accents, pour des comparaisons tolérantes."""
+    decomposed = unicodedata.normalize('NFKD', text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+
+
+def normalize_name(name: str) -> str:
+    """Nom d'entreprise comparable : sans accents, ponctuation ni forme juridique."""
+    words = re.split(r"[^a-z0-9&]+", normalize_text(name).replace("'", ""))
+    return " ".join(w for w in words if w and w not in _LEGAL_SUFFIXES)
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=4096)
+def _name_key(name: str) -> Tuple[str, frozenset]:
+    """Nom normalisé et ses trigrammes (mis en cache : indépendant de la table)."""
+    key = normalize_name(name)
+    return key, frozenset(_trigrams(key))
+
+
+class SymbolResolver:
+    """Table de symboles indexée par nom exact et par trigrammes."""
+
+    def __init__(self, companies: Optional[Dict[str, tuple]] = None):
+        self._names: Dict[str, str] = {}          # nom normalisé -> symbole
+        self._grams: Dict[str, Set[str]] = {}     # trigramme -> noms normalisés
+        self._sizes: Dict[str, int] = {}          # nom normalisé -> nombre de trigrammes
+        self.symbols: Set[str] = set()
+        self.max_words = 1
+        self._lock = threading.Lock()
+        for symbol, names in (COMPANIES if companies is None else companies).items():
+            self.add(symbol, *names)
+
+    def add(self, symbol: str, *names: str):
+        """Ajoute un symbole et ses noms usuels à la table."""
+        symbol = symbol.strip().upper()
+        with self._lock:
+            self.symbols.add(symbol)
+            for name in names:
+                key = normalize_name(name)
+                if not key:
+                    continue
+                self._names[key] = symbol
+                grams = _trigrams(key)
+                self._sizes[key] = len(grams)
+                for gram in grams:
+                    self._grams.setdefault(gram, set()).add(key)
+                self.max_words = max(self.max_words, len(key.split()))
+
+    def match_name(
+        self, name: str, fuzzy: bool = True, min_similarity: float = MIN_SIMILARITY
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Cherche un nom d'entreprise dans la table.
+
+        Args:
+            name: Nom recherché
+            fuzzy: Accepte les correspondances approchées (fautes de frappe)
+            min_similarity: Score minimal d'une correspondance approchée
+
+        Returns:
+            (symbole, score) avec un score de 1.0 pour une correspondance exacte,
+            ou None si aucun nom n'est assez proche
+        """
+        key, grams = _name_key(name)
+        if not key:
+            return None
+        if key in self._names:
+            return self._names[key], 1.0
+        if not fuzzy or len(key) < 4:
+            return None
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        best, best_score = None, 0.0
+        for candidate, count in shared.items():
+            score = 2 * count / (len(grams) + self._sizes[candidate])
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is None or best_score < min_similarity:
+            return None
+        return self._names[best], best_score
+
+    def resolve(self, text: str) -> str:
+        """
+        Convertit un symbole ou un nom d'entreprise en symbole boursier.
+
+        Les symboles connus et les saisies en majuscules sont conservés tels
+        quels ; les noms ("Apple", "microsoft", "L'Oréal") sont recherchés dans
+        la table. À défaut, la saisie est retournée en majuscules.
+        """
+        text = text.strip().lstrip('$')
+        if text.upper() in self.symbols:
+            return text.upper()
+        match = self.match_name(text, fuzzy=False)
+        if match:
+            return match[0]
+        if _TICKER_RE.match(text):
+            return text
+        match = self.match_name(text)
+        return match[0] if match else text.upper()
+
+    def find_mentions(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Repère les entreprises citées dans une phrase.
+
+        Returns:
+            Liste de (symbole, texte reconnu) dans l'ordre d'apparition, sans doublon
+        """
+        words = []
+        for word in _WORD_RE.findall(text):
+            # "d'Apple" -> "Apple", sauf si le mot entier est un nom ("L'Oréal")
+            elision = _ELISION_RE.match(word)
+            if elision and self.match_name(word.strip(".'-"), fuzzy=False) is None:
+                word = word[elision.end():]
+            words.append(word)
+        mentions, seen = [], set()
+
+        def found(symbol, matched):
+            if symbol not in seen:
+                seen.add(symbol)
+                mentions.append((symbol, matched))
+
+        i = 0
+        while i < len(words):
+            word = words[i].strip(".'-")
+            # Symbole explicite : "$TSLA", ou symbole connu écrit en majuscules
+            if word.startswith('$') and word[1:2].isalpha():
+                found(word[1:].upper(), word)
+                i += 1
+                continue
+            if len(word) > 1 and word in self.symbols:
+                found(word, word)
+                i += 1
+                continue
+
+            # Noms exacts sur plusieurs mots, du plus long au plus court
+            for size in range(min(self.max_words, len(words) - i), 0, -1):
+                phrase = " ".join(w.strip(".'-") for w in words[i:i + size])
+                match = self.match_name(phrase, fuzzy=False)
+                if match and (size > 1 or normalize_name(phrase) not in AMBIGUOUS_NAMES or phrase[:1].isupper()):
+                    found(match[0], phrase)
+                    i += size
+                    break
+            else:
+                # Faute de frappe probable sur un nom propre ; sans mot de contexte
+                # boursier juste avant, seule une correspondance très proche est retenue
+                if word[:1].isupper() and len(word) >= 4 and normalize_text(word) not in _STOPWORDS:
+                    context = {normalize_text(w.strip(".'-")) for w in words[max(i - 2, 0):i]}
+                    threshold = MIN_SIMILARITY if context & _COMPANY_CONTEXT else MENTION_SIMILARITY
+                    match = self.match_name(word, min_similarity=threshold)
+                    if match:
+                        found(match[0], word)
+                i += 1
+        return mentions
+
+    def extract(self, text: str) -> List[str]:
+        """Symboles des entreprises citées dans une phrase."""
+        return [symbol for symbol, _ in self.find_mentions(text)]
+
+
+# Table partagée par les tools et les agents
+symbol_resolver = SymbolResolver()
+
+
+def resolve_symbol(text: str) -> str:
+    """Raccourci vers la table partagée des symboles."""
+    return symbol_resolver.resolve(text)
+
+
+def extract_symbols(text: str) -> List[str]:
+    """Raccourci vers la table partagée des symboles."""
+    return symbol_resolver.extract(text)
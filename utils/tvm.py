@@ -0,0 +1,237 @@
+"""
+Valeur temps de l'argent : VAN, TRI/XTRI, amortissement, capitalisation, DCF.
+
+Les flux sont manipulés sous forme de tableaux (scénarios × périodes) : une
+grille de taux ou de scénarios est évaluée en un seul produit matriciel.
+Les TRI sont résolus par un solveur de racines vectorisé (Newton protégé
+par bissection) qui traite tous les scénarios à la fois.
+"""
+from datetime import date
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+
+# Bornes de recherche des taux (par période) pour le TRI
+RATE_MIN = -0.9999
+RATE_MAX = 10.0
+
+# Grille utilisée pour trouver un intervalle où la VAN change de signe
+_BRACKET_GRID = np.concatenate([
+    np.linspace(RATE_MIN, -0.5, 20, endpoint=False),
+    np.linspace(-0.5, 1.0, 151, endpoint=False),
+    np.geomspace(1.0, RATE_MAX, 30),
+])
+
+
+def discount_factors(rates: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Facteurs d'actualisation (taux × dates) : (1 + r) ** -t."""
+    return (1.0 + np.asarray(rates, dtype='f8')[..., None]) ** -np.asarray(times, dtype='f8')
+
+
+def npv(rates, cashflows, times=None) -> np.ndarray:
+    """
+    Valeur actuelle nette, le premier flux étant à la date 0.
+
+    Args:
+        rates: Taux par période (scalaire ou tableau de k taux)
+        cashflows: Flux (n,) ou scénarios × flux (s, n)
+        times: Dates des flux en périodes (0, 1, 2... par défaut)
+
+    Returns:
+        VAN de forme (k,) pour un seul scénario, (s, k) sinon
+    """
+    cashflows = np.asarray(cashflows, dtype='f8')
+    times = np.arange(cashflows.shape[-1]) if times is None else np.asarray(times, dtype='f8')
+    rates = np.atleast_1d(np.asarray(rates, dtype='f8'))
+    return cashflows @ discount_factors(rates, times).T
+
+
+def solve_rates(
+    f: Callable[[np.ndarray], np.ndarray],
+    df: Callable[[np.ndarray], np.ndarray],
+    lo: np.ndarray,
+    hi: np.ndarray,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> np.ndarray:
+    """
+    Racines de plusieurs fonctions à la fois, chacune encadrée dans [lo, hi].
+
+    Chaque itération tente un pas de Newton ; s'il sort de l'intervalle,
+    une bissection est faite à la place. L'intervalle est resserré à chaque
+    pas, la convergence est donc garantie.
+
+    Args:
+        f: Valeurs des fonctions pour un vecteur de taux (un taux par fonction)
+        df: Dérivées correspondantes
+        lo, hi: Bornes, avec f(lo) et f(hi) de signes opposés (NaN : pas de racine)
+
+    Returns:
+        Racines (NaN là où il n'y a pas d'encadrement)
+    """
+    lo, hi = np.array(lo, dtype='f8'), np.array(hi, dtype='f8')
+    active = ~(np.isnan(lo) | np.isnan(hi))
+    x = np.where(active, (lo + hi) / 2, np.nan)
+    f_lo = np.where(active, f(np.where(active, lo, 0.0)), np.nan)
+
+    for _ in range(max_iter):
+        fx, dfx = f(np.where(active, x, 0.0)), df(np.where(active, x, 0.0))
+        # Resserrement de l'encadrement autour de la racine
+        same_side = np.sign(fx) == np.sign(f_lo)
+        lo = np.where(active & same_side, x, lo)
+        f_lo = np.where(active & same_side, fx, f_lo)
+        hi = np.where(active & ~same_side, x, hi)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - fx / dfx
+        inside = (newton >= np.minimum(lo, hi)) & (newton <= np.maximum(lo, hi))
+        step = np.where(inside, newton, (lo + hi) / 2)
+        step = np.where(fx == 0, x, step)
+
+        converged = (np.abs(step - x) < tol) | (np.abs(hi - lo) < tol)
+        x = np.where(active, step, x)
+        active &= ~converged
+        if not active.any():
+            break
+    return x
+
+
+def _bracket(f_grid: np.ndarray, grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Premier changement de signe de chaque ligne de `f_grid` (valeurs sur `grid`)."""
+    signs = np.sign(f_grid)
+    change = signs[:, :-1] * signs[:, 1:] <= 0
+    found = change.any(axis=1)
+    first = np.argmax(change, axis=1)
+    lo = np.where(found, grid[first], np.nan)
+    hi = np.where(found, grid[np.minimum(first + 1, len(grid) - 1)], np.nan)
+    return lo, hi
+
+
+def irr(cashflows, times=None) -> np.ndarray:
+    """
+    Taux de rendement interne de un ou plusieurs scénarios de flux.
+
+    Args:
+        cashflows: Flux (n,) ou scénarios × flux (s, n)
+        times: Dates des flux en périodes (régulières par défaut)
+
+    Returns:
+        TRI par période de chaque scénario (NaN si la VAN ne change pas de signe)
+    """
+    cashflows = np.atleast_2d(np.asarray(cashflows, dtype='f8'))
+    times = np.arange(cashflows.shape[1], dtype='f8') if times is None else np.asarray(times, dtype='f8')
+
+    def f(rates):
+        return (cashflows * (1.0 + rates[:, None]) ** -times).sum(axis=1)
+
+    def df(rates):
+        return (-times * cashflows * (1.0 + rates[:, None]) ** (-times - 1)).sum(axis=1)
+
+    lo, hi = _bracket(npv(_BRACKET_GRID, cashflows, times), _BRACKET_GRID)
+    return solve_rates(f, df, lo, hi)
+
+
+def year_fractions(dates: Sequence[date]) -> np.ndarray:
+    """Écart en années de chaque date à la première (convention exact/365)."""
+    return np.array([(d - dates[0]).days for d in dates], dtype='f8') / 365.0
+
+
+def xirr(cashflows, dates: Sequence[date]) -> np.ndarray:
+    """TRI annuel de flux à dates irrégulières."""
+    return irr(cashflows, year_fractions(dates))
+
+
+def payment(principal, rate, periods) -> np.ndarray:
+    """Échéance constante d'un prêt (taux par période ; vectorisé)."""
+    principal, rate, periods = (np.asarray(v, dtype='f8') for v in (principal, rate, periods))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(rate == 0, principal / periods, principal * rate / (1 - (1 + rate) ** -periods))
+    return annuity
+
+
+def amortization(principal: float, rate: float, periods: int) -> Dict[str, np.ndarray]:
+    """
+    Tableau d'amortissement d'un prêt à échéances constantes.
+
+    Args:
+        principal: Capital emprunté
+        rate: Taux par période
+        periods: Nombre d'échéances
+
+    Returns:
+        Colonnes par échéance : payment, interest, principal, balance (capital restant dû)
+    """
+    pmt = float(payment(principal, rate, periods))
+    k = np.arange(periods + 1, dtype='f8')
+    growth = (1 + rate) ** k
+    if rate == 0:
+        balance = principal - pmt * k
+    else:
+        balance = principal * growth - pmt * (growth - 1) / rate
+    balance[-1] = 0.0
+    interest = balance[:-1] * rate
+    return {
+        'payment': np.full(periods, pmt),
+        'interest': interest,
+        'principal': pmt - interest,
+        'balance': balance[1:],
+    }
+
+
+def future_value(initial, rates, years, contribution=0.0, periods_per_year: int = 12) -> np.ndarray:
+    """
+    Valeur future avec capitalisation et versements périodiques (fin de période).
+
+    Args:
+        initial: Capital de départ
+        rates: Taux annuels (scalaire ou tableau)
+        years: Durées en années (scalaire ou tableau, diffusé contre `rates`)
+        contribution: Versement à chaque période
+        periods_per_year: Fréquence de capitalisation et de versement
+
+    Returns:
+        Valeurs futures (diffusion de rates × years)
+    """
+    rate = np.asarray(rates, dtype='f8') / periods_per_year
+    n = np.asarray(years, dtype='f8') * periods_per_year
+    growth = (1 + rate) ** n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(rate == 0, n, (growth - 1) / np.where(rate == 0, 1, rate))
+    return initial * growth + contribution * annuity
+
+
+def dcf(
+    free_cash_flow: float,
+    growth_rate: float,
+    discount_rates,
+    terminal_growth_rates,
+    years: int = 5,
+) -> Dict[str, np.ndarray]:
+    """
+    Valeur d'entreprise par actualisation des flux de trésorerie disponibles.
+
+    Les flux croissent de `growth_rate` par an pendant `years` ans, puis une
+    valeur terminale de Gordon-Shapiro est ajoutée. Le calcul est fait pour
+    chaque combinaison (taux d'actualisation × croissance terminale).
+
+    Returns:
+        enterprise_value et terminal_share (part de la valeur terminale),
+        tableaux (taux d'actualisation × croissances terminales) ; NaN si
+        la croissance terminale atteint le taux d'actualisation
+    """
+    discount = np.asarray(discount_rates, dtype='f8')[:, None]
+    terminal = np.asarray(terminal_growth_rates, dtype='f8')[None, :]
+    t = np.arange(1, years + 1, dtype='f8')
+    flows = free_cash_flow * (1 + growth_rate) ** t
+
+    explicit = npv(discount.ravel(), np.concatenate([[0.0], flows]))[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terminal_value = flows[-1] * (1 + terminal) / (discount - terminal)
+    terminal_pv = terminal_value / (1 + discount) ** years
+    valid = discount > terminal
+    enterprise_value = np.where(valid, explicit + terminal_pv, np.nan)
+    return {
+        'enterprise_value': enterprise_value,
+        'terminal_share': np.where(valid, terminal_pv / enterprise_value, np.nan),
+    }